@@ -0,0 +1,133 @@
+"""Operational admin endpoints (v1), guarded by the admin API token."""
+
+import asyncio
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse, Response
+
+from app.core.config import settings
+from app.core.profiling import StackSampler, render_collapsed, render_pstats
+from app.schemas.incident_stats import IncidentStatsReconcileResponse
+from app.services.enrichment_service import llm_usage
+from app.services.incident_service import IncidentService
+
+router = APIRouter()
+
+incident_service = IncidentService()
+
+
+def require_admin_token(x_admin_token: str | None = Header(default=None)) -> None:
+    """Reject the request unless it carries the configured admin token."""
+    if not settings.ADMIN_API_TOKEN:
+        # Admin surface is disabled entirely when no token is configured.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(
+        x_admin_token, settings.ADMIN_API_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+        )
+
+
+@router.get(
+    "/admin/profile",
+    summary="Capture a CPU profile from this worker",
+    dependencies=[Depends(require_admin_token)],
+)
+async def capture_profile(
+    seconds: float = Query(10.0, gt=0),
+    format: str = Query("collapsed", pattern="^(collapsed|pstats)$"),  # noqa: A002
+):
+    """
+    Sample all threads of the serving worker for `seconds` and return the
+    result as collapsed stacks (text) or a pstats dump (binary).
+    """
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiling is disabled",
+        )
+    if seconds > settings.PROFILING_MAX_CAPTURE_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"seconds must be <= {settings.PROFILING_MAX_CAPTURE_SECONDS}",
+        )
+
+    interval_s = settings.PROFILING_SAMPLE_INTERVAL_MS / 1000.0
+    sampler = StackSampler(interval_s=interval_s)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    stacks = sampler.samples()
+
+    if format == "pstats":
+        return Response(
+            content=render_pstats(stacks, interval_s),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+        )
+    return PlainTextResponse(render_collapsed(stacks))
+
+
+@router.get(
+    "/admin/admission",
+    summary="Admission control counters for this worker",
+    dependencies=[Depends(require_admin_token)],
+)
+async def admission_stats(request: Request):
+    """Return in-flight, queue and shed counters from the admission controller."""
+    controller = getattr(request.app.state, "admission_controller", None)
+    if controller is None:
+        return {"enabled": False}
+    return {"enabled": True, **controller.snapshot()}
+
+
+@router.get(
+    "/admin/llm-usage",
+    summary="Enrichment LLM token and latency counters for this worker",
+    dependencies=[Depends(require_admin_token)],
+)
+async def llm_usage_stats():
+    """Return call, token and latency totals since the worker started."""
+    return llm_usage.snapshot()
+
+
+@router.get(
+    "/admin/sla",
+    summary="SLA escalation scheduler state for this worker",
+    dependencies=[Depends(require_admin_token)],
+)
+async def sla_scheduler_state(request: Request):
+    """Return leadership, tracked deadlines and escalation count."""
+    scheduler = getattr(request.app.state, "sla_scheduler", None)
+    if scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **scheduler.snapshot()}
+
+
+@router.get(
+    "/admin/similarity-index",
+    summary="Related-incident index state for this worker",
+    dependencies=[Depends(require_admin_token)],
+)
+async def similarity_index_state(request: Request):
+    """Return readiness, size per ERP module and the sync watermark."""
+    index = getattr(request.app.state, "similarity_index", None)
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **index.snapshot()}
+
+
+@router.post(
+    "/admin/stats/reconcile",
+    response_model=IncidentStatsReconcileResponse,
+    summary="Check the incident stats rollup against a full recount",
+    dependencies=[Depends(require_admin_token)],
+)
+def reconcile_stats(repair: bool = False):
+    """Report rollup drift; with `repair=true`, rebuild the rollup from scratch."""
+    return incident_service.reconcile_stats(repair=repair)
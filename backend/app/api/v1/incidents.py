@@ -3,17 +3,30 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
 
 from app.schemas.incident import (
     ERPModule,
+    IncidentBulkStatusUpdateRequest,
+    IncidentBulkStatusUpdateResponse,
     IncidentCreateRequest,
     IncidentStatus,
     IncidentResponse,
+    IncidentSearchResponse,
     IncidentStatusUpdateRequest,
+    RelatedIncident,
     Severity,
 )
-from app.services.incident_service import IncidentService
+from app.schemas.incident_stats import IncidentStatsResponse
+from app.services.idempotency_service import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+)
+from app.services.incident_service import (
+    IncidentService,
+    InvalidStatusTransition,
+    RelatedIncidentsUnavailable,
+)
 
 router = APIRouter()
 
@@ -26,12 +39,42 @@ incident_service = IncidentService()
     status_code=status.HTTP_201_CREATED,
     summary="Create a new ERP incident",
 )
-def create_incident(payload: IncidentCreateRequest):
+def create_incident(
+    payload: IncidentCreateRequest,
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=255),
+):
     """
     Creates a new incident and enriches it with severity, category,
     and optional AI-generated metadata.
+
+    With an `Idempotency-Key` header, retries of the same request return the
+    first response (marked `Idempotent-Replayed: true`) instead of creating
+    another incident.
     """
-    return incident_service.create_incident(payload)
+    if idempotency_key is None:
+        return incident_service.create_incident(payload)
+
+    try:
+        body, replayed = incident_service.create_incident_idempotent(
+            payload, idempotency_key
+        )
+    except IdempotencyKeyReused:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request body",
+        )
+    except IdempotencyKeyInProgress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+            headers={"Retry-After": "1"},
+        )
+    return Response(
+        content=body,
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true" if replayed else "false"},
+    )
 
 
 @router.get(
@@ -43,17 +86,89 @@ def list_incidents(
     severity: Severity | None = None,
     erp_module: ERPModule | None = None,
     status: IncidentStatus | None = None,
+    include_archived: bool = False,
 ):
     """
     Returns all incidents with optional filters.
+
+    Archived (long-closed) incidents are only included when
+    `include_archived=true`. Rows are serialized straight to JSON bytes;
+    `response_model` only documents the shape.
+    """
+    body = incident_service.list_incidents_json(
+        severity=severity,
+        erp_module=erp_module,
+        status=status,
+        include_archived=include_archived,
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/incidents/search",
+    response_model=IncidentSearchResponse,
+    summary="Search incidents",
+)
+def search_incidents(
+    q: str = Query(..., min_length=2, max_length=200),
+    severity: Severity | None = None,
+    erp_module: ERPModule | None = None,
+    status: IncidentStatus | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10_000),
+):
+    """
+    Full-text search over title, description, and AI summary.
+
+    `q` accepts web-search syntax ("quoted phrases", `or`, `-exclude`).
+    Results are ranked by relevance and combine with the usual filters;
+    `title_highlight` and `snippet` are HTML-escaped with matched terms
+    wrapped in `<mark>` tags. Only the `SEARCH_MAX_CANDIDATES` most recent
+    matches are ranked: paging stops at that window, and `truncated` is true
+    when older matches were left out (narrow the query or add filters).
     """
-    return incident_service.list_incidents(
+    return incident_service.search_incidents(
+        q=q,
         severity=severity,
         erp_module=erp_module,
         status=status,
+        limit=limit,
+        offset=offset,
     )
 
 
+@router.get(
+    "/incidents/stats",
+    response_model=IncidentStatsResponse,
+    summary="Incident statistics",
+)
+def get_incident_stats(days: int = Query(30, ge=1, le=366)):
+    """
+    Returns incident counts by severity, ERP module, and status, plus daily
+    creation counts for the last `days` days, served from the stats rollup.
+    """
+    return incident_service.get_stats(days=days)
+
+
+@router.post(
+    "/incidents/bulk/status",
+    response_model=IncidentBulkStatusUpdateResponse,
+    summary="Update the status of many incidents",
+)
+def bulk_update_incident_status(payload: IncidentBulkStatusUpdateRequest):
+    """
+    Moves incidents listed in `ids`, or matching `filter`, to `status` in one
+    database round-trip.
+
+    Each incident gets an outcome: `UPDATED`, `UNCHANGED` (already in that
+    status), `INVALID_TRANSITION` (the lifecycle forbids the move, e.g. out of
+    CLOSED) or `NOT_FOUND`. Filter requests only match incidents that can be
+    moved, at most `BULK_STATUS_MAX_INCIDENTS` per call; repeat while
+    `has_more` is true.
+    """
+    return incident_service.bulk_update_status(payload)
+
+
 @router.get(
     "/incidents/{incident_id}",
     response_model=IncidentResponse,
@@ -61,13 +176,42 @@ def list_incidents(
 )
 def get_incident(incident_id: UUID):
     """Fetch a single incident by its ID."""
-    incident = incident_service.get_incident_by_id(str(incident_id))
-    if not incident:
+    body = incident_service.get_incident_json(str(incident_id))
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Incident not found",
         )
-    return incident
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/incidents/{incident_id}/related",
+    response_model=List[RelatedIncident],
+    summary="Find related incidents",
+)
+def get_related_incidents(incident_id: UUID, limit: int = Query(5, ge=1, le=20)):
+    """
+    Returns past incidents from the same ERP module whose title and
+    description are most similar to this one (cosine `score`, best first),
+    including how they were resolved (`suggested_action`, `status`).
+
+    Returns 503 when the index is disabled or this worker has not loaded it
+    yet.
+    """
+    try:
+        related = incident_service.get_related_incidents(str(incident_id), limit=limit)
+    except RelatedIncidentsUnavailable as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        )
+    if related is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Incident not found",
+        )
+    return related
 
 
 @router.patch(
@@ -79,11 +223,19 @@ def update_incident_status(
     incident_id: UUID,
     payload: IncidentStatusUpdateRequest,
 ):
-    """Update the status of an incident."""
-    incident = incident_service.update_incident_status(
-        incident_id=str(incident_id),
-        status=payload.status,
-    )
+    """
+    Update the status of an incident.
+
+    Returns 409 when the lifecycle forbids the change (e.g. out of CLOSED);
+    the allowed moves are the same as for the bulk endpoint.
+    """
+    try:
+        incident = incident_service.update_incident_status(
+            incident_id=str(incident_id),
+            status=payload.status,
+        )
+    except InvalidStatusTransition as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
     if not incident:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
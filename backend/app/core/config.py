@@ -33,10 +33,84 @@ class Settings(BaseSettings):
     DATABASE_URL: str = (
         "postgresql+psycopg2://<username>:<password>@localhost:5432/erp_incidents"
     )
+    # Optional read replicas (comma-separated URLs) for list/detail/stats reads
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_RETRY_AFTER_S: float = 30.0
+    DATABASE_READ_CONNECT_TIMEOUT_S: int = 2
 
     # OpenAI (optional / stub-friendly)
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL: str = "gpt-4.1-mini"
+    OPENAI_BASE_URL: str | None = None  # e.g. the local stub in benchmarks/
+    OPENAI_MAX_OUTPUT_TOKENS: int = 400
+    OPENAI_TIMEOUT_S: float = 30.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_PROMPT_CACHE_KEY: str = "incident-enrichment-v1"
+    # Token budget for the (deduplicated) description sent to the model
+    ENRICH_MAX_DESCRIPTION_TOKENS: int = 1500
+
+    # Full-text search: only the N most recent matches are ranked
+    SEARCH_MAX_CANDIDATES: int = 2000
+
+    # SLA escalation (deadline for leaving OPEN; TEST targets are multiplied)
+    SLA_P1_MINUTES: int = 60
+    SLA_P2_MINUTES: int = 240
+    SLA_P3_MINUTES: int = 1440
+    SLA_NON_PROD_FACTOR: int = 4
+    SLA_SCHEDULER_ENABLED: bool = False
+    SLA_REFRESH_INTERVAL_S: float = 60.0
+    SLA_LEADER_RETRY_S: float = 30.0
+    SLA_BATCH_SIZE: int = 500
+
+    # Related incidents: local hashed n-gram index, off unless SIMILARITY_INDEX_DIR
+    # points at the files app.jobs.build_similarity_index writes
+    SIMILARITY_INDEX_ENABLED: bool = False
+    SIMILARITY_INDEX_DIR: str | None = None  # memory-mapped .npy files shared by workers
+    SIMILARITY_DIM: int = 256
+    SIMILARITY_REFRESH_INTERVAL_S: float = 30.0
+    SIMILARITY_SYNC_LOOKBACK_S: float = 300.0
+    SIMILARITY_MIN_SCORE: float = 0.1
+
+    # Bulk status changes: max incidents a filter-based request touches
+    BULK_STATUS_MAX_INCIDENTS: int = 5000
+
+    # Idempotency-Key handling for POST /incidents
+    IDEMPOTENCY_KEY_TTL_S: int = 86400
+    # Must exceed the slowest create: OPENAI_TIMEOUT_S * (OPENAI_MAX_RETRIES + 1)
+    IDEMPOTENCY_LOCK_TIMEOUT_S: int = 120
+    IDEMPOTENCY_WAIT_TIMEOUT_S: float = 30.0
+    IDEMPOTENCY_MAX_WAITERS: int = 8  # per worker; each holds a threadpool thread
+
+    # Partitioning / archival (see app.jobs.archive_incidents)
+    ARCHIVE_RETENTION_DAYS: int = 180
+    ARCHIVE_BATCH_SIZE: int = 1000
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_ENSURE_ON_STARTUP: bool = True  # also app.jobs.ensure_partitions
+
+    # Admission control / load shedding (per worker, off by default)
+    ADMISSION_CONTROL_ENABLED: bool = False
+    ADMISSION_MAX_IN_FLIGHT: int = 32
+    ADMISSION_LOW_PRIORITY_MAX_IN_FLIGHT: int = 16
+    ADMISSION_MAX_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT_MS: float = 2000.0
+    ADMISSION_RETRY_AFTER_S: int = 1
+
+    # Admin endpoints (disabled unless a token is configured)
+    ADMIN_API_TOKEN: str | None = None
+
+    # Profiling (optional, off by default)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_CAPTURE_SECONDS: int = 60
+    SLOW_REQUEST_PROFILING_ENABLED: bool = False
+    SLOW_REQUEST_THRESHOLD_MS: float = 1000.0
+    SLOW_REQUEST_PROFILE_WINDOW_S: float = 30.0
+    SLOW_REQUEST_PROFILE_DIR: str = "/tmp/erp-incident-profiles"
+
+    @property
+    def similarity_index_enabled(self) -> bool:
+        """Workers only serve a prebuilt index; they never build one each."""
+        return self.SIMILARITY_INDEX_ENABLED and bool(self.SIMILARITY_INDEX_DIR)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,54 @@
+"""Time-ordered identifier generation (UUIDv7, RFC 9562)."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+
+def _build(unix_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    value = (unix_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand_a & _COUNTER_MAX) << 64
+    value |= 0b10 << 62  # RFC 4122/9562 variant
+    value |= rand_b & ((1 << 62) - 1)
+    return uuid.UUID(int=value)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Return a new UUIDv7.
+
+    The top 48 bits are the Unix time in milliseconds, so IDs sort (and land in
+    the primary-key B-tree) in creation order. Within one millisecond the
+    12-bit `rand_a` field is used as a counter (RFC 9562 method 1), keeping IDs
+    generated by this process strictly increasing.
+    """
+    global _last_ms, _counter
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Random start leaves headroom for the counter within this ms.
+            _counter = int.from_bytes(os.urandom(2), "big") & (_COUNTER_MAX >> 1)
+        else:
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                # Counter exhausted (or clock went backwards): borrow the next ms.
+                _last_ms += 1
+                _counter = 0
+        unix_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big")
+    return _build(unix_ms, counter, rand_b)
+
@@ -0,0 +1,257 @@
+"""Low-overhead stack sampling profiler for running workers.
+
+Provides:
+- A background sampler that snapshots every thread's stack via sys._current_frames()
+- Collapsed-stack (flamegraph) and pstats renderers for captured samples
+- A slow-request profiler that keeps a rolling window of samples and dumps the
+  slice covering a slow request to disk, so the request log can reference it
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+# (filename, first line, function name) - the same key shape pstats uses.
+FrameKey = tuple[str, int, str]
+# Frames ordered root -> leaf.
+Stack = tuple[FrameKey, ...]
+
+# Threads whose innermost Python frame lives in one of these files are parked
+# (lock wait, selector poll, idle threadpool worker) and are not burning CPU.
+_IDLE_LEAF_FILES = ("threading.py", "selectors.py", "queue.py")
+# Event-loop threads: with uvloop (or any C loop) the poll happens below the
+# last Python frame, which is then the loop entry point itself. Callbacks and
+# coroutines the loop runs push their own frames on top of these.
+_IDLE_LEAF_FUNCTIONS = frozenset(
+    {
+        ("base_events.py", "run_forever"),
+        ("base_events.py", "run_until_complete"),
+        ("runners.py", "run"),
+    }
+)
+_IDLE_LEAF_PACKAGES = (f"{os.sep}uvloop{os.sep}",)
+# Distinct stacks remembered for sharing before the table is pruned to those
+# still referenced by the ring.
+_MIN_INTERNED_STACKS = 4096
+
+
+def _walk_stack(frame, frame_keys: dict[CodeType, FrameKey]) -> Stack:
+    """Return `frame`'s stack, reusing one `FrameKey` per code object."""
+    keys: list[FrameKey] = []
+    while frame is not None:
+        code = frame.f_code
+        key = frame_keys.get(code)
+        if key is None:
+            key = frame_keys[code] = (code.co_filename, code.co_firstlineno, code.co_name)
+        keys.append(key)
+        frame = frame.f_back
+    keys.reverse()
+    return tuple(keys)
+
+
+def _is_idle(stack: Stack) -> bool:
+    filename, _, funcname = stack[-1]
+    return (
+        filename.endswith(_IDLE_LEAF_FILES)
+        or (os.path.basename(filename), funcname) in _IDLE_LEAF_FUNCTIONS
+        or any(package in filename for package in _IDLE_LEAF_PACKAGES)
+    )
+
+
+def _frame_label(key: FrameKey) -> str:
+    filename, lineno, funcname = key
+    return f"{funcname} ({os.path.basename(filename)}:{lineno})"
+
+
+class StackSampler:
+    """
+    Periodically samples the stacks of all threads in the process.
+
+    Samples are kept in memory as `(perf_counter timestamp, stack)` pairs; pass
+    `max_samples` to turn the buffer into a rolling window. Busy threads repeat
+    the same few stacks, so each distinct stack (and frame key) is stored once
+    and samples share it: a sample costs ~100 bytes however deep its stack.
+    """
+
+    def __init__(self, interval_s: float, max_samples: int | None = None) -> None:
+        self.interval_s = interval_s
+        self._samples: collections.deque[tuple[float, Stack]] = collections.deque(
+            maxlen=max_samples
+        )
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Only touched by the sampling thread.
+        self._frame_keys: dict[CodeType, FrameKey] = {}
+        self._stacks: dict[Stack, Stack] = {}
+        self._max_stacks = _MIN_INTERNED_STACKS
+
+    def start(self) -> None:
+        """Start the sampling thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread and wait for it to exit."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def samples(
+        self, since: float | None = None, until: float | None = None
+    ) -> list[Stack]:
+        """Return sampled stacks, optionally restricted to a perf_counter window."""
+        with self._lock:
+            snapshot = list(self._samples)
+        return [
+            stack
+            for ts, stack in snapshot
+            if (since is None or ts >= since) and (until is None or ts <= until)
+        ]
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            now = time.perf_counter()
+            self._record(
+                (now, frame)
+                for thread_id, frame in sys._current_frames().items()
+                if thread_id != own_ident
+            )
+
+    def _record(self, frames: Iterable[tuple[float, object]]) -> None:
+        """Add one sample per busy `(timestamp, frame)` pair."""
+        batch: list[tuple[float, Stack]] = []
+        for ts, frame in frames:
+            stack = _walk_stack(frame, self._frame_keys)
+            if stack and not _is_idle(stack):
+                batch.append((ts, self._stacks.setdefault(stack, stack)))
+        if not batch:
+            return
+        with self._lock:
+            self._samples.extend(batch)
+            if len(self._stacks) > self._max_stacks:
+                # Keep only stacks the ring still holds; code objects seen
+                # since (e.g. generated code) are forgotten with them.
+                self._stacks = {stack: stack for _, stack in self._samples}
+                self._frame_keys = {}
+                self._max_stacks = max(_MIN_INTERNED_STACKS, 2 * len(self._stacks))
+
+
+def render_collapsed(stacks: Iterable[Stack]) -> str:
+    """Render stacks in Brendan Gregg's collapsed format (`a;b;c <count>`)."""
+    counts = Counter(stacks)
+    lines = [
+        ";".join(_frame_label(key) for key in stack) + f" {count}"
+        for stack, count in counts.most_common()
+    ]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def render_pstats(stacks: Iterable[Stack], interval_s: float) -> bytes:
+    """
+    Render stacks as a marshalled pstats dump.
+
+    Call counts are sample counts and times are estimated as
+    `samples * interval`, so the output loads in `pstats`/snakeviz as usual.
+    """
+    totals: dict[FrameKey, list] = {}
+    callers: dict[FrameKey, Counter] = collections.defaultdict(Counter)
+
+    for stack, count in Counter(stacks).items():
+        elapsed = count * interval_s
+        seen: set[FrameKey] = set()
+        for depth, key in enumerate(stack):
+            entry = totals.setdefault(key, [0, 0, 0.0, 0.0])
+            if key not in seen:
+                # Count inclusive time once per sample even under recursion.
+                seen.add(key)
+                entry[0] += count
+                entry[1] += count
+                entry[3] += elapsed
+            if depth:
+                callers[key][stack[depth - 1]] += count
+        totals[stack[-1]][2] += elapsed
+
+    stats = {
+        key: (cc, nc, tt, ct, dict(callers.get(key, {})))
+        for key, (cc, nc, tt, ct) in totals.items()
+    }
+    return marshal.dumps(stats)
+
+
+class SlowRequestProfiler:
+    """
+    Keeps a rolling window of process-wide stack samples and, for requests that
+    exceed `threshold_ms`, writes the samples taken during the request to disk.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_ms: float,
+        interval_ms: float,
+        window_s: float,
+        output_dir: str,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.output_dir = output_dir
+        interval_s = interval_ms / 1000.0
+        # Size the ring for `window_s` worth of samples across ~8 busy threads.
+        self.sampler = StackSampler(
+            interval_s=interval_s,
+            max_samples=max(1, int(window_s / interval_s)) * 8,
+        )
+
+    def start(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.sampler.start()
+
+    def stop(self) -> None:
+        self.sampler.stop()
+
+    def should_record(self, latency_ms: float) -> bool:
+        return latency_ms >= self.threshold_ms
+
+    def record(self, request_id: str, start: float, end: float) -> str | None:
+        """
+        Dump the collapsed stacks sampled between `start` and `end`.
+
+        Returns the written file path, or `None` if nothing was sampled.
+        """
+        stacks = self.sampler.samples(since=start, until=end)
+        if not stacks:
+            return None
+
+        safe_id = "".join(c for c in request_id if c.isalnum() or c in "-_")[:64]
+        path = os.path.join(
+            self.output_dir, f"{int(time.time())}-{safe_id or 'request'}.collapsed"
+        )
+        try:
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(render_collapsed(stacks))
+        except OSError:
+            logger.exception(
+                "slow_request_profile_write_failed",
+                extra={"event": "slow_request_profile_write_failed"},
+            )
+            return None
+        return path
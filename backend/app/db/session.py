@@ -1,33 +1,171 @@
-"""Database engine, session factory, and session context manager."""
+"""Database engines, session factory, and session context managers.
 
+Writes always go to the primary (`DATABASE_URL`). When `DATABASE_READ_URL`
+lists one or more replicas, read-only paths use `run_read()`, which picks a
+replica round-robin, skips replicas that recently failed, and falls back to
+the primary when none is usable or the replica fails mid-read. Once a request
+has committed a write, its later reads stay on the primary so it sees its own
+changes.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
 from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, TypeVar
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-)
+T = TypeVar("T")
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """
+    Lazily create the shared engine on first use.
+
+    Building it at import time pulled in the DB driver and pool setup on every
+    worker start, even for processes that never touch the database.
+    """
+    return create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+    )
+
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine,
 )
 
 
+class _RoutingScope:
+    """Per-request routing state; mutable so thread-pool copies share it."""
+
+    __slots__ = ("wrote",)
+
+    def __init__(self) -> None:
+        self.wrote = False
+
+
+_routing_scope_var: contextvars.ContextVar[_RoutingScope | None] = (
+    contextvars.ContextVar("db_routing_scope", default=None)
+)
+
+
+def set_db_routing_scope() -> contextvars.Token[_RoutingScope | None]:
+    """Start a fresh read-your-writes scope (one per request)."""
+    return _routing_scope_var.set(_RoutingScope())
+
+
+def reset_db_routing_scope(token: contextvars.Token[_RoutingScope | None]) -> None:
+    _routing_scope_var.reset(token)
+
+
+def _wrote_in_scope() -> bool:
+    scope = _routing_scope_var.get()
+    return scope is not None and scope.wrote
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_write(session) -> None:
+    """Pin the rest of the request to the primary after a commit there."""
+    scope = _routing_scope_var.get()
+    if scope is not None and session.bind is get_engine():
+        scope.wrote = True
+
+
+class ReplicaRouter:
+    """
+    Round-robin over replica engines with a simple circuit breaker.
+
+    A replica that fails to hand out a connection, or is reported by
+    `mark_down()` after failing a query, is skipped for `retry_after_s`
+    seconds; `connect()` then tries the next one and returns `None` when
+    every replica is unavailable.
+    """
+
+    def __init__(self, engines: list[Engine], retry_after_s: float) -> None:
+        self.engines = engines
+        self.retry_after_s = retry_after_s
+        self._next = itertools.cycle(range(len(engines)))
+        self._down_until = [0.0] * len(engines)
+        self._lock = threading.Lock()
+
+    def connect(self) -> Connection | None:
+        """Return a connection to a healthy replica, or `None`."""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._next)
+                if self._down_until[index] > time.monotonic():
+                    continue
+            try:
+                return self.engines[index].connect()
+            except DBAPIError as exc:
+                self._mark_down(index, exc)
+        return None
+
+    def mark_down(self, engine: Engine, exc: DBAPIError) -> None:
+        """Skip `engine`'s replica for a while after it failed a query."""
+        self._mark_down(self.engines.index(engine), exc)
+
+    def _mark_down(self, index: int, exc: DBAPIError) -> None:
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_after_s
+        logger.warning(
+            "db_replica_unavailable",
+            extra={
+                "event": "db_replica_unavailable",
+                "replica": self.engines[index].url.render_as_string(
+                    hide_password=True
+                ),
+                "retry_after_s": self.retry_after_s,
+                "error": str(exc.orig),
+            },
+        )
+
+
+@lru_cache
+def get_replica_router() -> ReplicaRouter | None:
+    """Build the replica router from `DATABASE_READ_URL`, if configured."""
+    urls = [
+        url.strip()
+        for url in (settings.DATABASE_READ_URL or "").split(",")
+        if url.strip()
+    ]
+    if not urls:
+        return None
+    engines = [
+        create_engine(
+            url,
+            pool_pre_ping=True,
+            connect_args={"connect_timeout": settings.DATABASE_READ_CONNECT_TIMEOUT_S},
+        )
+        for url in urls
+    ]
+    return ReplicaRouter(engines, retry_after_s=settings.DATABASE_READ_RETRY_AFTER_S)
+
+
 @contextmanager
 def get_db():
     """
     Provides a transactional scope around a series of operations.
     """
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         try:
             yield db
@@ -36,3 +174,34 @@ def get_db():
             raise
     finally:
         db.close()
+
+
+def run_read(read: Callable[[Session], T]) -> T:
+    """
+    Run read-only work, `read(session)`, where a replica may serve it.
+
+    Uses the primary when no replica is configured or reachable, or when the
+    current request has already written. If the replica fails with an
+    `OperationalError` (dropped connection, recovery conflict, ...), it is
+    marked down and `read` is run once more on the primary, so `read` must be
+    safe to repeat.
+    """
+    router = get_replica_router()
+    connection = None
+    if router is not None and not _wrote_in_scope():
+        connection = router.connect()
+    if connection is not None:
+        db = SessionLocal(bind=connection)
+        try:
+            return read(db)
+        except OperationalError as exc:
+            router.mark_down(connection.engine, exc)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+            connection.close()
+
+    with get_db() as db:
+        return read(db)
@@ -0,0 +1 @@
+"""Standalone maintenance jobs, run via `python -m app.jobs.<name>`."""
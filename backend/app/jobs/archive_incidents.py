@@ -0,0 +1,62 @@
+"""Maintain incident partitions and archive old CLOSED incidents.
+
+Intended for a daily cron / scheduled task:
+
+    python -m app.jobs.archive_incidents [--retention-days N] [--dry-run]
+
+Creates the next monthly `incidents` partitions, moves CLOSED incidents older
+than the retention window into `incidents_archive` in batches, then drops
+monthly partitions that are left empty. Archived incidents stay readable
+through the API (detail lookups and `include_archived=true` listings).
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.incident_service import IncidentService
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Archive old closed incidents")
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=settings.ARCHIVE_RETENTION_DAYS,
+        help="archive CLOSED incidents created more than N days ago",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.PARTITION_MONTHS_AHEAD,
+        help="create monthly partitions this far into the future",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would be archived"
+    )
+    args = parser.parse_args()
+
+    setup_logging(settings)
+    result = IncidentService().archive_closed_incidents(
+        retention_days=args.retention_days,
+        batch_size=args.batch_size,
+        months_ahead=args.months_ahead,
+        dry_run=args.dry_run,
+    )
+
+    logger.info(
+        "incidents_archived",
+        extra={"event": "incidents_archived", **result},
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Build or refresh the on-disk related-incident index.
+
+Intended for a cron / scheduled task (hourly is plenty):
+
+    python -m app.jobs.build_similarity_index [--full]
+
+Loads the index from SIMILARITY_INDEX_DIR, embeds incidents created since it
+was written (or every live and archived incident with `--full`, or when no
+index exists yet), and writes it back as a new version directory. API workers
+memory-map the current version at startup and only have to catch up on what
+was created afterwards.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.similarity_index import SimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the related-incident index")
+    parser.add_argument(
+        "--full", action="store_true", help="re-embed everything instead of catching up"
+    )
+    args = parser.parse_args()
+
+    setup_logging(settings)
+    if not settings.SIMILARITY_INDEX_DIR:
+        logger.error(
+            "similarity_index_dir_unset",
+            extra={"event": "similarity_index_dir_unset"},
+        )
+        return 2
+
+    start = time.perf_counter()
+    index = SimilarityIndex(
+        dim=settings.SIMILARITY_DIM,
+        path=None if args.full else settings.SIMILARITY_INDEX_DIR,
+        refresh_interval_s=0.0,
+        lookback_s=settings.SIMILARITY_SYNC_LOOKBACK_S,
+    )
+    added = index.sync()
+    index.save(settings.SIMILARITY_INDEX_DIR)
+
+    logger.info(
+        "similarity_index_built",
+        extra={
+            "event": "similarity_index_built",
+            "added": added,
+            "size": index.size(),
+            "full": args.full,
+            "duration_s": round(time.perf_counter() - start, 2),
+        },
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Create upcoming monthly incident partitions.
+
+Intended for a daily cron / scheduled task, independent of archiving:
+
+    python -m app.jobs.ensure_partitions [--months-ahead N]
+
+API workers also do this at startup (PARTITION_ENSURE_ON_STARTUP), and
+app.jobs.archive_incidents does it before archiving. Incidents that landed in
+the default partition because this did not run in time are moved into their
+month's partition.
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.incident_service import IncidentService
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Create monthly incident partitions")
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.PARTITION_MONTHS_AHEAD,
+        help="create monthly partitions this far into the future",
+    )
+    args = parser.parse_args()
+
+    setup_logging(settings)
+    created = IncidentService().ensure_partitions(args.months_ahead)
+
+    logger.info(
+        "partitions_ensured",
+        extra={
+            "event": "partitions_ensured",
+            "partitions_created": created,
+            "months_ahead": args.months_ahead,
+        },
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""Delete expired idempotency keys.
+
+Intended for cron / scheduled tasks (hourly is plenty):
+
+    python -m app.jobs.purge_idempotency_keys
+"""
+
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.idempotency_service import IdempotencyService
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    setup_logging(settings)
+    deleted = IdempotencyService().purge_expired()
+    logger.info(
+        "idempotency_keys_purged",
+        extra={"event": "idempotency_keys_purged", "deleted": deleted},
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
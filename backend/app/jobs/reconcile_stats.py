@@ -0,0 +1,49 @@
+"""Detect (and optionally repair) drift in the incident stats rollup.
+
+Intended for cron / scheduled tasks:
+
+    python -m app.jobs.reconcile_stats [--repair]
+
+Exits with status 1 when drift is found and not repaired, so schedulers can
+alert on it.
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.incident_service import IncidentService
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reconcile incident stats rollup")
+    parser.add_argument(
+        "--repair", action="store_true", help="rebuild the rollup if drift is found"
+    )
+    args = parser.parse_args()
+
+    setup_logging(settings)
+    result = IncidentService().reconcile_stats(repair=args.repair)
+
+    for row in result.drift:
+        logger.warning(
+            "incident_stats_drift",
+            extra={"event": "incident_stats_drift", **row.model_dump(mode="json")},
+        )
+    logger.info(
+        "incident_stats_reconciled",
+        extra={
+            "event": "incident_stats_reconciled",
+            "drift_buckets": len(result.drift),
+            "repaired": result.repaired,
+        },
+    )
+    return 1 if result.drift and not result.repaired else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
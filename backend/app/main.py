@@ -7,10 +7,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.api.v1 import incidents, health
+from app.api.v1 import admin, incidents, health
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.profiling import SlowRequestProfiler
+from app.middleware.admission_control import (
+    AdmissionControlMiddleware,
+    AdmissionController,
+)
 from app.middleware.request_context import RequestContextMiddleware
+from app.services.sla_scheduler import SlaEscalationScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +53,23 @@ def create_app() -> FastAPI:
             content={"detail": "Internal server error"},
         )
 
+    # Admission control sits innermost so shed responses still get CORS
+    # headers and the structured request log line.
+    admission_controller = None
+    if settings.ADMISSION_CONTROL_ENABLED:
+        admission_controller = AdmissionController(
+            max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+            low_priority_max_in_flight=settings.ADMISSION_LOW_PRIORITY_MAX_IN_FLIGHT,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            queue_timeout_ms=settings.ADMISSION_QUEUE_TIMEOUT_MS,
+        )
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            controller=admission_controller,
+            retry_after_s=settings.ADMISSION_RETRY_AFTER_S,
+        )
+    app.state.admission_controller = admission_controller
+
     # CORS (frontend separated)
     app.add_middleware(
         CORSMiddleware,
@@ -56,14 +79,61 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    app.add_middleware(RequestContextMiddleware)
+    slow_request_profiler = None
+    if settings.SLOW_REQUEST_PROFILING_ENABLED:
+        slow_request_profiler = SlowRequestProfiler(
+            threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+            interval_ms=settings.PROFILING_SAMPLE_INTERVAL_MS,
+            window_s=settings.SLOW_REQUEST_PROFILE_WINDOW_S,
+            output_dir=settings.SLOW_REQUEST_PROFILE_DIR,
+        )
+    app.state.slow_request_profiler = slow_request_profiler
+
+    app.add_middleware(
+        RequestContextMiddleware, slow_request_profiler=slow_request_profiler
+    )
+
+    sla_scheduler = None
+    if settings.SLA_SCHEDULER_ENABLED:
+        sla_scheduler = SlaEscalationScheduler(
+            refresh_interval_s=settings.SLA_REFRESH_INTERVAL_S,
+            leader_retry_s=settings.SLA_LEADER_RETRY_S,
+            batch_size=settings.SLA_BATCH_SIZE,
+        )
+    app.state.sla_scheduler = sla_scheduler
+
+    similarity_index = None
+    if settings.similarity_index_enabled:
+        # Imported here so workers without the index never load NumPy.
+        from app.services.similarity_index import get_similarity_index
+
+        similarity_index = get_similarity_index()
+    app.state.similarity_index = similarity_index
 
     # Register routers
     app.include_router(health.router, prefix="/api/v1", tags=["Health"])
     app.include_router(incidents.router, prefix="/api/v1", tags=["Incidents"])
+    app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
+
+    @app.on_event("startup")
+    async def on_startup() -> None:
+        if settings.PARTITION_ENSURE_ON_STARTUP:
+            _ensure_partitions()
+        if slow_request_profiler is not None:
+            slow_request_profiler.start()
+        if sla_scheduler is not None:
+            sla_scheduler.start()
+        if similarity_index is not None:
+            similarity_index.start()
 
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
+        if slow_request_profiler is not None:
+            slow_request_profiler.stop()
+        if sla_scheduler is not None:
+            sla_scheduler.stop()
+        if similarity_index is not None:
+            similarity_index.stop()
         handler = getattr(app.state, "cloudwatch_handler", None)
         if handler is not None:
             try:
@@ -75,4 +145,24 @@ def create_app() -> FastAPI:
     return app
 
 
+def _ensure_partitions() -> None:
+    """Create upcoming partitions; best effort, the cron jobs retry it."""
+    try:
+        created = incidents.incident_service.ensure_partitions(
+            settings.PARTITION_MONTHS_AHEAD
+        )
+    except SQLAlchemyError:
+        logger.warning(
+            "partition_maintenance_failed",
+            extra={"event": "partition_maintenance_failed"},
+            exc_info=True,
+        )
+        return
+    if created:
+        logger.info(
+            "partitions_created",
+            extra={"event": "partitions_created", "partitions_created": created},
+        )
+
+
 app = create_app()
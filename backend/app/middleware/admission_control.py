@@ -0,0 +1,246 @@
+"""Admission control middleware (in-flight limits, priority queueing, load shedding)."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+INCIDENTS_PATH = "/api/v1/incidents"
+HEALTH_PATH = "/api/v1/health"
+# Dashboard-style incident reads; sheddable like the list.
+LOW_PRIORITY_READ_PATHS = frozenset(
+    {INCIDENTS_PATH, f"{INCIDENTS_PATH}/stats", f"{INCIDENTS_PATH}/search"}
+)
+
+# Submissions larger than this are not inspected for their environment.
+_MAX_PEEK_BYTES = 64 * 1024
+
+
+class Priority(IntEnum):
+    """Admission classes; lower values are admitted first."""
+
+    CRITICAL = 0  # POST /incidents for PROD
+    HIGH = 1  # other incident submissions
+    NORMAL = 2  # detail reads, status updates, admin
+    LOW = 3  # list, search, stats and health polling
+
+
+@dataclass
+class AdmissionStats:
+    admitted: dict[str, int] = field(default_factory=lambda: _zeroed())
+    shed: dict[str, int] = field(default_factory=lambda: _zeroed())
+    queue_timeouts: dict[str, int] = field(default_factory=lambda: _zeroed())
+    queue_wait_ms_total: float = 0.0
+    queue_wait_ms_max: float = 0.0
+    queued_total: int = 0
+
+
+def _zeroed() -> dict[str, int]:
+    return {p.name: 0 for p in Priority}
+
+
+class AdmissionController:
+    """
+    Per-worker admission controller.
+
+    Requests hold one of `max_in_flight` slots while they run. LOW priority
+    traffic is only admitted while fewer than `low_priority_max_in_flight`
+    slots are busy and nobody is waiting; otherwise it is shed immediately.
+    Other classes wait in a priority queue (bounded by `max_queue` and
+    `queue_timeout_ms`), and freed slots go to the most important waiter.
+    All state lives on the worker's event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int,
+        low_priority_max_in_flight: int,
+        max_queue: int,
+        queue_timeout_ms: float,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.low_priority_max_in_flight = min(low_priority_max_in_flight, max_in_flight)
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_ms / 1000.0
+        self.in_flight = 0
+        self.stats = AdmissionStats()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: Priority) -> bool:
+        """Wait for a slot; returns `False` if the request should be shed."""
+        if priority is Priority.LOW:
+            if self.in_flight < self.low_priority_max_in_flight and not self.queued:
+                self._admit(priority)
+                return True
+            self.stats.shed[priority.name] += 1
+            return False
+
+        if self.in_flight < self.max_in_flight and not self.queued:
+            self._admit(priority)
+            return True
+
+        if self.queued >= self.max_queue:
+            self.stats.shed[priority.name] += 1
+            return False
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just as the timeout fired; give it back.
+                self.release()
+            else:
+                future.cancel()
+            self.stats.queue_timeouts[priority.name] += 1
+            self.stats.shed[priority.name] += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot we may hold.
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+        wait_ms = (time.perf_counter() - start) * 1000.0
+        self.stats.queued_total += 1
+        self.stats.queue_wait_ms_total += wait_ms
+        self.stats.queue_wait_ms_max = max(self.stats.queue_wait_ms_max, wait_ms)
+        # `release` already counted the slot for us.
+        self.stats.admitted[priority.name] += 1
+        return True
+
+    def release(self) -> None:
+        """Free a slot, handing it directly to the best waiter if any."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _admit(self, priority: Priority) -> None:
+        self.in_flight += 1
+        self.stats.admitted[priority.name] += 1
+
+    def snapshot(self) -> dict:
+        """Current counters, suitable for a metrics endpoint."""
+        stats = self.stats
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "low_priority_max_in_flight": self.low_priority_max_in_flight,
+            "admitted": dict(stats.admitted),
+            "shed": dict(stats.shed),
+            "queue_timeouts": dict(stats.queue_timeouts),
+            "queue_wait_ms_avg": round(
+                stats.queue_wait_ms_total / stats.queued_total, 2
+            )
+            if stats.queued_total
+            else 0.0,
+            "queue_wait_ms_max": round(stats.queue_wait_ms_max, 2),
+        }
+
+
+def classify(method: str, path: str, body: bytes | None = None) -> Priority:
+    """Map a request to its admission priority."""
+    path = path.rstrip("/")
+    if path == INCIDENTS_PATH and method == "POST":
+        return Priority.CRITICAL if _is_prod(body) else Priority.HIGH
+    if path in LOW_PRIORITY_READ_PATHS and method == "GET":
+        return Priority.LOW
+    if path == HEALTH_PATH:
+        return Priority.LOW
+    return Priority.NORMAL
+
+
+def _is_prod(body: bytes | None) -> bool:
+    if not body:
+        return False
+    try:
+        return json.loads(body).get("environment") == "PROD"
+    except (ValueError, AttributeError):
+        return False
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware enforcing `AdmissionController` decisions."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        retry_after_s: int = 1,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.retry_after_s = retry_after_s
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        body = None
+        if method == "POST" and scope["path"].rstrip("/") == INCIDENTS_PATH:
+            body, receive = await _peek_body(receive)
+
+        priority = classify(method, scope["path"], body)
+        if not await self.controller.acquire(priority):
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Service overloaded, retry later"},
+                headers={"Retry-After": str(self.retry_after_s)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+async def _peek_body(receive: Receive) -> tuple[bytes | None, Receive]:
+    """
+    Read the request body (up to `_MAX_PEEK_BYTES`) and return it together
+    with a `receive` callable that replays the consumed messages.
+    """
+    messages: list[Message] = []
+    body = b""
+    complete = False
+    while len(body) <= _MAX_PEEK_BYTES:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            complete = True
+            break
+
+    async def replay() -> Message:
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return (body if complete else None), replay
@@ -6,21 +6,30 @@ import logging
 import time
 from uuid import uuid4
 
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.types import ASGIApp
 
 from app.core.logging import reset_request_id, set_request_id
+from app.core.profiling import SlowRequestProfiler
+from app.db.session import reset_db_routing_scope, set_db_routing_scope
 
 
 class RequestContextMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_profiler: SlowRequestProfiler | None = None,
+    ) -> None:
         super().__init__(app)
         self._logger = logging.getLogger(__name__)
+        self._slow_request_profiler = slow_request_profiler
 
     async def dispatch(self, request: Request, call_next):
         request_id = request.headers.get("x-request-id") or str(uuid4())
         token = set_request_id(request_id)
+        routing_token = set_db_routing_scope()
 
         start = time.perf_counter()
         response = None
@@ -33,23 +42,31 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             raised = exc
             raise
         finally:
-            latency_ms = round((time.perf_counter() - start) * 1000.0, 2)
+            end = time.perf_counter()
+            latency_ms = round((end - start) * 1000.0, 2)
             status_code = getattr(response, "status_code", 500)
 
             # Attach request id to response when possible.
             if response is not None:
                 response.headers["X-Request-ID"] = request_id
 
-            self._logger.info(
-                "http_request",
-                extra={
-                    "event": "http_request",
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": status_code,
-                    "latency_ms": latency_ms,
-                    "unhandled_exception": raised is not None,
-                },
-            )
+            extra = {
+                "event": "http_request",
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": status_code,
+                "latency_ms": latency_ms,
+                "unhandled_exception": raised is not None,
+            }
 
+            profiler = self._slow_request_profiler
+            if profiler is not None and profiler.should_record(latency_ms):
+                # Reference the dump by path; the stacks are too large to inline.
+                extra["profile_ref"] = await run_in_threadpool(
+                    profiler.record, request_id, start, end
+                )
+
+            self._logger.info("http_request", extra=extra)
+
+            reset_db_routing_scope(routing_token)
             reset_request_id(token)
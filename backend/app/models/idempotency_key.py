@@ -0,0 +1,28 @@
+"""SQLAlchemy model for stored idempotent responses."""
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.db.base import Base
+
+
+class IdempotencyKeyModel(Base):
+    """
+    One `Idempotency-Key` seen on a write endpoint.
+
+    While the first request runs, the row is a lock (`status_code` is NULL
+    until `locked_until`) owned by the request holding `claim_id`; once it
+    finishes, the row holds the response to replay until `expires_at`.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    claim_id = Column(String(32), nullable=True)
+
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+
+    locked_until = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False)
@@ -2,20 +2,21 @@
 
 from sqlalchemy import (
     Column,
+    Computed,
     String,
     DateTime,
+    Integer,
     Text,
     Index,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
+from sqlalchemy.orm import declared_attr, deferred
 
 from app.db.base import Base
 
 
-class IncidentModel(Base):
-    """Database model representing an ERP incident."""
-
-    __tablename__ = "incidents"
+class IncidentColumns:
+    """Columns shared by live incidents and their archive."""
 
     id = Column(UUID(as_uuid=False), primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -33,9 +34,70 @@ class IncidentModel(Base):
 
     status = Column(String(20), nullable=False, index=True)
 
+    sla_due_at = Column(DateTime, nullable=True)
+    escalated_at = Column(DateTime, nullable=True)
+
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime, nullable=False)
 
+    @declared_attr
+    def search_vector(cls):
+        """
+        Generated by Postgres for full-text search; deferred so normal reads
+        don't fetch it. Must match db/init/01_init_schema.sql.
+        """
+        return deferred(
+            Column(
+                TSVECTOR,
+                Computed(
+                    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                    "setweight(to_tsvector('english', coalesce(auto_summary, '')), 'B') || "
+                    "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                    persisted=True,
+                ),
+            )
+        )
+
+
+class IncidentModel(IncidentColumns, Base):
+    """
+    Database model representing an ERP incident.
+
+    The table is range-partitioned by month on `created_at`, so its database
+    primary key is `(id, created_at)`; `id` alone is still unique in practice
+    (UUIDv7) and is what the ORM keys on.
+    """
+
+    __tablename__ = "incidents"
+
+    # Hashes of adjacent lexeme pairs in `search_vector`; lets phrase searches
+    # use an index, since the GIN index on `search_vector` can't check word
+    # order. Must match db/init/01_init_schema.sql.
+    search_pairs = deferred(
+        Column(
+            ARRAY(Integer),
+            Computed(
+                "incident_word_pairs("
+                "to_tsvector('english', coalesce(title, '')) || "
+                "to_tsvector('english', coalesce(auto_summary, '')) || "
+                "to_tsvector('english', coalesce(description, '')))",
+                persisted=True,
+            ),
+        )
+    )
+
+
+class IncidentArchiveModel(IncidentColumns, Base):
+    """
+    Cold storage for CLOSED incidents past the retention window.
+
+    Rows are moved here by `app.jobs.archive_incidents` and are read-only.
+    """
+
+    __tablename__ = "incidents_archive"
+
+    archived_at = Column(DateTime, nullable=False)
+
 
 # Helpful composite indexes for common queries
 Index(
@@ -43,3 +105,41 @@ Index(
     IncidentModel.severity,
     IncidentModel.erp_module,
 )
+
+# Newest-first listing; `id` (UUIDv7) is the tie-breaker for equal timestamps.
+Index(
+    "idx_incidents_created_at_id",
+    IncidentModel.created_at,
+    IncidentModel.id,
+)
+
+# SLA due-queue read by the escalation scheduler.
+Index(
+    "idx_incidents_sla_due",
+    IncidentModel.sla_due_at,
+    postgresql_where=(
+        (IncidentModel.status == "OPEN")
+        & IncidentModel.escalated_at.is_(None)
+        & IncidentModel.sla_due_at.isnot(None)
+    ),
+)
+
+Index(
+    "idx_incidents_search_vector",
+    IncidentModel.search_vector,
+    postgresql_using="gin",
+)
+
+# Module-filtered search (needs the btree_gin extension).
+Index(
+    "idx_incidents_module_search",
+    IncidentModel.erp_module,
+    IncidentModel.search_vector,
+    postgresql_using="gin",
+)
+
+Index(
+    "idx_incidents_search_pairs",
+    IncidentModel.search_pairs,
+    postgresql_using="gin",
+)
@@ -0,0 +1,23 @@
+"""SQLAlchemy model for the incrementally maintained incident rollup."""
+
+from sqlalchemy import BigInteger, Column, Date, String
+
+from app.db.base import Base
+
+
+class IncidentStatsDailyModel(Base):
+    """
+    Incident counts per UTC creation day, severity, ERP module, and status.
+
+    Kept in step with `incidents` inside the same transaction as each insert
+    or status change, so dashboard stats never scan the incidents table.
+    """
+
+    __tablename__ = "incident_stats_daily"
+
+    day = Column(Date, primary_key=True)
+    severity = Column(String(5), primary_key=True)
+    erp_module = Column(String(50), primary_key=True)
+    status = Column(String(20), primary_key=True)
+
+    incident_count = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,113 @@
+"""Database access layer for idempotency keys."""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKeyModel
+
+# Takes the key when it is new, expired, or abandoned by a crashed request.
+_CLAIM_SQL = """
+    INSERT INTO idempotency_keys
+        (key, request_hash, claim_id, locked_until, expires_at, created_at)
+    VALUES (
+        :key,
+        :request_hash,
+        :claim_id,
+        now() + make_interval(secs => :lock_s),
+        now() + make_interval(secs => :ttl_s),
+        now()
+    )
+    ON CONFLICT (key) DO UPDATE
+    SET request_hash = EXCLUDED.request_hash,
+        claim_id = EXCLUDED.claim_id,
+        status_code = NULL,
+        response_body = NULL,
+        locked_until = EXCLUDED.locked_until,
+        expires_at = EXCLUDED.expires_at,
+        created_at = EXCLUDED.created_at
+    WHERE idempotency_keys.expires_at < now()
+       OR (idempotency_keys.status_code IS NULL
+           AND idempotency_keys.locked_until < now())
+    RETURNING key
+"""
+
+
+class IdempotencyRepository:
+    """
+    Handles claiming, completing, and reading idempotency keys.
+
+    Only `claim`, `release` and `purge_expired` commit; `complete` joins the
+    caller's transaction so the stored response commits with the write it
+    describes. `complete` and `release` only act while the row still carries
+    the caller's claim ID: once a claim has expired and a retry has taken the
+    key over, the original request can no longer touch it.
+    """
+
+    def __init__(self, db: Session):
+        """Create a repository bound to the provided SQLAlchemy session."""
+        self.db = db
+
+    def claim(
+        self, key: str, request_hash: str, lock_s: float, ttl_s: float
+    ) -> Optional[str]:
+        """Try to take ownership of `key`; returns the claim ID if this caller owns it."""
+        claim_id = uuid.uuid4().hex
+        row = self.db.execute(
+            text(_CLAIM_SQL),
+            {
+                "key": key,
+                "request_hash": request_hash,
+                "claim_id": claim_id,
+                "lock_s": lock_s,
+                "ttl_s": ttl_s,
+            },
+        ).first()
+        self.db.commit()
+        return claim_id if row is not None else None
+
+    def get(self, key: str) -> Optional[IdempotencyKeyModel]:
+        """Return the stored key, or `None` if it does not exist."""
+        # Bypass the identity map so polling always sees the latest row.
+        return (
+            self.db.query(IdempotencyKeyModel)
+            .populate_existing()
+            .filter(IdempotencyKeyModel.key == key)
+            .first()
+        )
+
+    def complete(self, key: str, claim_id: str, status_code: int, body: bytes) -> bool:
+        """
+        Record the response for `key` (no commit); returns `False` if
+        `claim_id` no longer owns the key.
+        """
+        updated = self.db.execute(
+            text(
+                "UPDATE idempotency_keys "
+                "SET status_code = :status_code, response_body = :body "
+                "WHERE key = :key AND claim_id = :claim_id AND status_code IS NULL"
+            ),
+            {"key": key, "claim_id": claim_id, "status_code": status_code, "body": body},
+        ).rowcount
+        return updated == 1
+
+    def release(self, key: str, claim_id: str) -> None:
+        """Drop an unfinished claim so the next retry runs the request again."""
+        self.db.execute(
+            text(
+                "DELETE FROM idempotency_keys "
+                "WHERE key = :key AND claim_id = :claim_id AND status_code IS NULL"
+            ),
+            {"key": key, "claim_id": claim_id},
+        )
+        self.db.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired keys; returns how many were removed."""
+        deleted = self.db.execute(
+            text("DELETE FROM idempotency_keys WHERE expires_at < now()")
+        ).rowcount
+        self.db.commit()
+        return deleted
@@ -0,0 +1,116 @@
+"""Database access layer for incident partitions and the incident archive."""
+
+import re
+from datetime import date, datetime
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Columns copied into the archive; `search_vector` is generated on both sides.
+_ARCHIVE_COLUMNS = (
+    "id, title, description, erp_module, environment, business_unit, severity, "
+    "category, auto_summary, suggested_action, status, sla_due_at, escalated_at, "
+    "created_by_id, created_at, updated_at"
+)
+_RETURNING_COLUMNS = ", ".join(f"i.{c}" for c in _ARCHIVE_COLUMNS.split(", "))
+
+_ARCHIVABLE = "status = 'CLOSED' AND created_at < :cutoff"
+
+_PARTITION_NAME = re.compile(r"^incidents_y(\d{4})m(\d{2})$")
+
+
+class IncidentArchiveRepository:
+    """
+    Maintains the monthly `incidents` partitions and moves old CLOSED
+    incidents into `incidents_archive`.
+
+    Nothing here commits; callers decide the transaction boundaries.
+    """
+
+    def __init__(self, db: Session):
+        """Create a repository bound to the provided SQLAlchemy session."""
+        self.db = db
+
+    def ensure_partitions(self, months_ahead: int) -> int:
+        """
+        Create missing monthly partitions up to `months_ahead`, and for months
+        whose rows landed in the default partition; returns how many.
+        """
+        return self.db.execute(
+            text("SELECT ensure_incident_partitions(months_ahead => :months_ahead)"),
+            {"months_ahead": months_ahead},
+        ).scalar_one()
+
+    def count_archivable(self, cutoff: datetime) -> int:
+        """Count CLOSED incidents created before `cutoff`."""
+        return self.db.execute(
+            text(f"SELECT count(*) FROM incidents WHERE {_ARCHIVABLE}"),
+            {"cutoff": cutoff},
+        ).scalar_one()
+
+    def archive_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move up to `batch_size` CLOSED incidents created before `cutoff` into
+        the archive in one statement; returns the number of rows moved.
+
+        Rows locked by concurrent status updates are skipped and picked up by
+        a later batch.
+        """
+        return self.db.execute(
+            text(
+                f"""
+                WITH batch AS (
+                    SELECT id, created_at FROM incidents
+                    WHERE {_ARCHIVABLE}
+                    ORDER BY created_at
+                    LIMIT :batch_size
+                    FOR UPDATE SKIP LOCKED
+                ), moved AS (
+                    DELETE FROM incidents AS i
+                    USING batch
+                    WHERE i.id = batch.id AND i.created_at = batch.created_at
+                    RETURNING {_RETURNING_COLUMNS}
+                )
+                INSERT INTO incidents_archive ({_ARCHIVE_COLUMNS})
+                SELECT {_ARCHIVE_COLUMNS} FROM moved
+                """
+            ),
+            {"cutoff": cutoff, "batch_size": batch_size},
+        ).rowcount
+
+    def droppable_partitions(self, cutoff: datetime) -> List[str]:
+        """
+        Return monthly partitions that end on or before `cutoff` and hold no
+        rows (everything in them was archived).
+        """
+        names = self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits AS i "
+                "JOIN pg_class AS c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'incidents'::regclass"
+            )
+        ).scalars()
+
+        droppable = []
+        for name in sorted(names):
+            match = _PARTITION_NAME.match(name)
+            if not match:
+                continue
+            year, month = int(match.group(1)), int(match.group(2))
+            month_end = date(year + month // 12, month % 12 + 1, 1)
+            if month_end > cutoff.date():
+                continue
+            empty = self.db.execute(
+                text(f'SELECT NOT EXISTS (SELECT 1 FROM "{name}")')
+            ).scalar_one()
+            if empty:
+                droppable.append(name)
+        return droppable
+
+    def drop_partition(self, name: str) -> None:
+        """Detach and drop one (empty) monthly partition."""
+        if not _PARTITION_NAME.match(name):
+            raise ValueError(f"not an incidents partition: {name}")
+        self.db.execute(text(f'ALTER TABLE incidents DETACH PARTITION "{name}"'))
+        self.db.execute(text(f'DROP TABLE "{name}"'))
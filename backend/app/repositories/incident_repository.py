@@ -1,9 +1,126 @@
 """Database access layer for incident persistence."""
 
-from typing import List, Optional
+import html
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional
+from sqlalchemy import func, select, text, union_all, update
 from sqlalchemy.orm import Session
 
-from app.models.incident import IncidentModel
+from app.models.incident import IncidentArchiveModel, IncidentModel
+from app.schemas.incident import INCIDENT_RECORD_FIELDS, IncidentRecord
+
+_RECORD_COLUMNS = [getattr(IncidentModel, name) for name in INCIDENT_RECORD_FIELDS]
+_ARCHIVE_RECORD_COLUMNS = [
+    getattr(IncidentArchiveModel, name) for name in INCIDENT_RECORD_FIELDS
+]
+
+# IDs are UUIDv7, so `id` breaks `created_at` ties in insertion order.
+_NEWEST_FIRST = (IncidentModel.created_at.desc(), IncidentModel.id.desc())
+
+# OPEN incidents still waiting on their SLA (matches idx_incidents_sla_due).
+_SLA_PENDING = (
+    IncidentModel.status == "OPEN",
+    IncidentModel.escalated_at.is_(None),
+    IncidentModel.sla_due_at.isnot(None),
+)
+
+# Text search configuration; must match the `search_vector` generated column.
+_TS_CONFIG = "english"
+# ts_headline marks matches with control-character sentinels (stripped from
+# the source text first); `render_highlight` HTML-escapes the result and only
+# then turns the sentinels into <mark> tags, so user text can never inject
+# markup.
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, MaxWords=35, MinWords=15, "
+    "MaxFragments=2, FragmentDelimiter=\" ... \""
+)
+# Quoted phrases in `websearch_to_tsquery` syntax, and its OR keyword.
+_QUOTED_PHRASE = re.compile(r'"([^"]*)"')
+_OR_KEYWORD = re.compile(r"\bor\b", re.IGNORECASE)
+
+# Bulk status change in one statement: lock the targets in a stable order,
+# update those whose current status may move to :status, and move their stats
+# rollup buckets along with them. {selector} picks the targets.
+_BULK_STATUS_SQL = """
+    WITH target AS (
+        SELECT id, created_at, status, severity, erp_module
+        FROM incidents
+        WHERE {selector}
+        ORDER BY id
+        LIMIT :limit
+        FOR UPDATE
+    ),
+    changed AS (
+        UPDATE incidents AS i
+        SET status = CAST(:status AS incident_status),
+            updated_at = now(),
+            -- Reopening starts a fresh SLA clock (mirrors sla_deadline()).
+            sla_due_at = CASE WHEN :status = 'OPEN' THEN
+                now() + make_interval(mins => (CASE i.severity
+                    WHEN 'P1' THEN :sla_p1 WHEN 'P2' THEN :sla_p2 ELSE :sla_p3
+                END) * (CASE WHEN i.environment = 'PROD' THEN 1
+                        ELSE :sla_non_prod_factor END))
+                ELSE i.sla_due_at END,
+            escalated_at = CASE WHEN :status = 'OPEN' THEN NULL
+                ELSE i.escalated_at END
+        FROM target AS t
+        WHERE i.id = t.id
+          AND i.created_at = t.created_at
+          AND t.status = ANY(CAST(:allowed_from AS incident_status[]))
+        RETURNING i.id
+    ),
+    rollup AS (
+        INSERT INTO incident_stats_daily AS s
+            (day, severity, erp_module, status, incident_count)
+        SELECT (t.created_at AT TIME ZONE 'UTC')::date,
+               t.severity, t.erp_module, bucket.status, sum(bucket.delta)
+        FROM target AS t
+        JOIN changed AS c ON c.id = t.id
+        CROSS JOIN LATERAL (
+            VALUES (t.status, -1), (CAST(:status AS incident_status), 1)
+        ) AS bucket (status, delta)
+        GROUP BY 1, 2, 3, 4
+        -- Fixed row order (status by name, as in update_incident_status) so
+        -- concurrent status changes lock rollup rows in the same order.
+        ORDER BY 1, 2, 3, bucket.status::text COLLATE "C"
+        ON CONFLICT (day, severity, erp_module, status) DO UPDATE
+        SET incident_count = s.incident_count + EXCLUDED.incident_count
+    )
+    SELECT t.id, t.status AS previous_status, c.id IS NOT NULL AS updated
+    FROM target AS t
+    LEFT JOIN changed AS c ON c.id = t.id
+    ORDER BY t.id
+"""
+_BULK_FILTER_COLUMNS = ("erp_module", "severity", "environment", "status")
+
+
+def render_highlight(headline: str) -> str:
+    """Turn a sentinel-marked `ts_headline` result into escaped HTML with <mark> tags."""
+    return (
+        html.escape(headline, quote=True)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_STOP, "</mark>")
+    )
+
+
+def _without_sentinels(column):
+    return func.translate(column, _MARK_START + _MARK_STOP, "")
+
+
+def _required_phrases(q: str) -> List[str]:
+    """
+    Quoted phrases every match of `q` must contain: none when `q` uses OR,
+    and negated (`-"..."`) phrases are skipped.
+    """
+    if _OR_KEYWORD.search(_QUOTED_PHRASE.sub(" ", q)):
+        return []
+    return [
+        match.group(1)
+        for match in _QUOTED_PHRASE.finditer(q)
+        if not q[: match.start()].rstrip().endswith("-")
+    ]
 
 
 class IncidentRepository:
@@ -22,31 +139,221 @@ class IncidentRepository:
         self.db.refresh(incident)
         return incident
 
-    def get_by_id(self, incident_id: str) -> Optional[IncidentModel]:
-        """Return an incident by ID, or `None` if not found."""
-        return (
-            self.db.query(IncidentModel)
+    def get_by_id(
+        self, incident_id: str, for_update: bool = False
+    ) -> Optional[IncidentModel]:
+        """
+        Return an incident by ID, or `None` if not found.
+
+        With `for_update=True` the row is locked until the transaction ends.
+        """
+        query = self.db.query(IncidentModel).filter(IncidentModel.id == incident_id)
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
+
+    def get_record_by_id(
+        self, incident_id: str, include_archived: bool = False
+    ) -> Optional[IncidentRecord]:
+        """
+        Return an incident by ID as a plain record, or `None` if not found.
+
+        With `include_archived=True`, falls back to the archive when the
+        incident is no longer in the live table.
+        """
+        row = (
+            self.db.query(*_RECORD_COLUMNS)
             .filter(IncidentModel.id == incident_id)
             .first()
         )
+        if row is None and include_archived:
+            row = (
+                self.db.query(*_ARCHIVE_RECORD_COLUMNS)
+                .filter(IncidentArchiveModel.id == incident_id)
+                .first()
+            )
+        return dict(zip(INCIDENT_RECORD_FIELDS, row)) if row else None
+
+    def list_records(
+        self,
+        severity: Optional[str] = None,
+        erp_module: Optional[str] = None,
+        status: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[IncidentRecord]:
+        """
+        List incidents as plain records (no ORM identity map or per-row
+        objects), newest first, optionally filtered by severity, module, and
+        status.
 
-    def list(
+        Only live incidents are read unless `include_archived=True`, in which
+        case archived ones are merged in by the same ordering.
+        """
+        if not include_archived:
+            query = self._filter(
+                self.db.query(*_RECORD_COLUMNS), severity, erp_module, status
+            )
+            rows = query.order_by(*_NEWEST_FIRST).all()
+        else:
+            merged = union_all(
+                self._filter(
+                    select(*_RECORD_COLUMNS), severity, erp_module, status
+                ),
+                self._filter(
+                    select(*_ARCHIVE_RECORD_COLUMNS),
+                    severity,
+                    erp_module,
+                    status,
+                    model=IncidentArchiveModel,
+                ),
+            ).subquery()
+            rows = self.db.execute(
+                select(merged).order_by(
+                    merged.c.created_at.desc(), merged.c.id.desc()
+                )
+            ).all()
+        return [dict(zip(INCIDENT_RECORD_FIELDS, row)) for row in rows]
+
+    def search(
         self,
+        q: str,
         severity: Optional[str] = None,
         erp_module: Optional[str] = None,
         status: Optional[str] = None,
-    ) -> List[IncidentModel]:
-        """List incidents, optionally filtered by severity, module, and status."""
-        query = self.db.query(IncidentModel)
+        limit: int = 20,
+        offset: int = 0,
+        max_candidates: int = 2000,
+    ) -> List[dict]:
+        """
+        Full-text search over title, AI summary, and description.
+
+        Only the `max_candidates` most recent matches are ranked (by
+        `ts_rank_cd`, newest first on ties). This bounds the cost of broad
+        terms that match a large share of the table: Postgres can then walk
+        the `(created_at, id)` index and stop early instead of ranking every
+        match, while selective terms still go through the GIN index.
+        Callers must keep `offset + limit` within `max_candidates`; each hit
+        carries `matched`, the size of the candidate window, which is
+        `max_candidates + 1` when older matches were left out of the ranking.
+        Quoted phrases are first narrowed through the `search_pairs` index,
+        as the GIN index on `search_vector` can't check word order.
+        Highlights are only computed for the requested page, since
+        `ts_headline` re-parses each document, and are HTML-escaped. Returns
+        up to `limit + 1` records so callers can tell whether more exist.
+        """
+        ts_query = func.websearch_to_tsquery(_TS_CONFIG, q)
+        pairs = self._phrase_pairs(q)
+        if pairs:
+            # The function form keeps the planner from also scanning the
+            # `search_vector` index, which can't narrow a phrase any further.
+            match = IncidentModel.search_pairs.contains(pairs) & func.ts_match_vq(
+                IncidentModel.search_vector, ts_query
+            )
+        else:
+            match = IncidentModel.search_vector.op("@@")(ts_query)
 
+        candidates = (
+            self._filter(
+                self.db.query(
+                    IncidentModel.id,
+                    IncidentModel.created_at,
+                    IncidentModel.search_vector,
+                    func.row_number().over(order_by=_NEWEST_FIRST).label("recency"),
+                ),
+                severity,
+                erp_module,
+                status,
+            )
+            .filter(match)
+            .order_by(*_NEWEST_FIRST)
+            # One extra row only to detect that the window is truncated; it
+            # sorts after every ranked candidate.
+            .limit(max_candidates + 1)
+            .subquery()
+        )
+        rank = func.ts_rank_cd(candidates.c.search_vector, ts_query).label("rank")
+        page = (
+            self.db.query(
+                candidates.c.id,
+                rank,
+                (candidates.c.recency > max_candidates).label("overflow"),
+                func.count().over().label("matched"),
+            )
+            .order_by(
+                candidates.c.recency > max_candidates,
+                rank.desc(),
+                candidates.c.created_at.desc(),
+                candidates.c.id.desc(),
+            )
+            .limit(limit + 1)
+            .offset(offset)
+            .subquery()
+        )
+
+        rows = (
+            self.db.query(
+                *_RECORD_COLUMNS,
+                page.c.rank,
+                func.ts_headline(
+                    _TS_CONFIG,
+                    _without_sentinels(IncidentModel.title),
+                    ts_query,
+                    _HEADLINE_OPTIONS + ", HighlightAll=true",
+                ),
+                func.ts_headline(
+                    _TS_CONFIG,
+                    _without_sentinels(
+                        func.concat_ws(
+                            " ", IncidentModel.description, IncidentModel.auto_summary
+                        )
+                    ),
+                    ts_query,
+                    _HEADLINE_OPTIONS,
+                ),
+                page.c.matched,
+            )
+            .join(page, page.c.id == IncidentModel.id)
+            .order_by(page.c.overflow, page.c.rank.desc(), *_NEWEST_FIRST)
+            .all()
+        )
+
+        n = len(INCIDENT_RECORD_FIELDS)
+        return [
+            {
+                **dict(zip(INCIDENT_RECORD_FIELDS, row[:n])),
+                "rank": row[n],
+                "title_highlight": render_highlight(row[n + 1]),
+                "snippet": render_highlight(row[n + 2]),
+                "matched": row[n + 3],
+            }
+            for row in rows
+        ]
+
+    def _phrase_pairs(self, q: str) -> List[int]:
+        """Word-pair hashes (see `search_pairs`) of the phrases `q` requires."""
+        phrases = _required_phrases(q)
+        if not phrases:
+            return []
+        row = self.db.execute(
+            select(
+                *(
+                    func.incident_word_pairs(func.to_tsvector(_TS_CONFIG, phrase))
+                    for phrase in phrases
+                )
+            )
+        ).one()
+        return sorted({pair for pairs in row for pair in pairs})
+
+    @staticmethod
+    def _filter(query, severity, erp_module, status, model=IncidentModel):
+        """Apply the optional severity, module, and status filters."""
         if severity:
-            query = query.filter(IncidentModel.severity == severity)
+            query = query.filter(model.severity == severity)
         if erp_module:
-            query = query.filter(IncidentModel.erp_module == erp_module)
+            query = query.filter(model.erp_module == erp_module)
         if status:
-            query = query.filter(IncidentModel.status == status)
-
-        return query.order_by(IncidentModel.created_at.desc()).all()
+            query = query.filter(model.status == status)
+        return query
 
     def update_status(
         self, incident: IncidentModel, status: str
@@ -56,3 +363,159 @@ class IncidentRepository:
         self.db.commit()
         self.db.refresh(incident)
         return incident
+
+    def upcoming_sla_deadlines(
+        self, until: datetime, limit: int
+    ) -> List[tuple[datetime, str]]:
+        """
+        Return `(sla_due_at, id)` for OPEN, unescalated incidents due by
+        `until`, earliest first. Reads only the partial `idx_incidents_sla_due`
+        index range, so cost tracks the number of due incidents.
+        """
+        return (
+            self.db.query(IncidentModel.sla_due_at, IncidentModel.id)
+            .filter(*_SLA_PENDING, IncidentModel.sla_due_at <= until)
+            .order_by(IncidentModel.sla_due_at)
+            .limit(limit)
+            .all()
+        )
+
+    def escalate_overdue(self, limit: int) -> List[dict]:
+        """
+        Mark up to `limit` OPEN incidents whose SLA deadline has passed as
+        escalated and return them. Commits.
+
+        The `escalated_at IS NULL` guard makes each escalation happen once,
+        even if two schedulers briefly overlap.
+        """
+        due = (
+            select(IncidentModel.id, IncidentModel.created_at)
+            .where(*_SLA_PENDING, IncidentModel.sla_due_at <= func.now())
+            .order_by(IncidentModel.sla_due_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .subquery()
+        )
+        rows = self.db.execute(
+            update(IncidentModel)
+            .where(
+                IncidentModel.id == due.c.id,
+                IncidentModel.created_at == due.c.created_at,
+            )
+            .values(escalated_at=func.now())
+            .returning(
+                IncidentModel.id,
+                IncidentModel.severity,
+                IncidentModel.environment,
+                IncidentModel.erp_module,
+                IncidentModel.sla_due_at,
+                IncidentModel.escalated_at,
+            )
+            .execution_options(synchronize_session=False)
+        ).mappings().all()
+        self.db.commit()
+        return [dict(row) for row in rows]
+
+    def bulk_update_status(
+        self,
+        status: str,
+        allowed_from: List[str],
+        limit: int,
+        ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None,
+        sla_minutes: Optional[dict] = None,
+        sla_non_prod_factor: int = 1,
+    ) -> List[dict]:
+        """
+        Move incidents to `status` in a single round-trip and return
+        `{id, previous_status, updated}` for every matched incident. Commits.
+
+        Targets are either the given `ids` or the live incidents matching
+        `filters` (equality on module, severity, environment and status); in
+        the filter case only incidents whose status is in `allowed_from` are
+        matched, so repeating the call makes progress. Only incidents whose
+        current status is in `allowed_from` are updated, and the stats rollup
+        moves with them in the same statement. Incidents moved back to OPEN
+        get a new `sla_due_at` from `sla_minutes` (per severity) and
+        `sla_non_prod_factor`, and lose `escalated_at`.
+        """
+        sla_minutes = sla_minutes or {}
+        params = {
+            "status": status,
+            "allowed_from": allowed_from,
+            "limit": limit,
+            "sla_p1": sla_minutes.get("P1", 0),
+            "sla_p2": sla_minutes.get("P2", 0),
+            "sla_p3": sla_minutes.get("P3", 0),
+            "sla_non_prod_factor": sla_non_prod_factor,
+        }
+        if ids is not None:
+            selector = "id = ANY(CAST(:ids AS uuid[]))"
+            params["ids"] = ids
+        else:
+            clauses = ["status = ANY(CAST(:allowed_from AS incident_status[]))"]
+            for column in _BULK_FILTER_COLUMNS:
+                value = (filters or {}).get(column)
+                if value is not None:
+                    clauses.append(f"{column} = :f_{column}")
+                    params[f"f_{column}"] = value
+            if len(clauses) == 1:
+                raise ValueError("bulk_update_status needs ids or a non-empty filter")
+            selector = " AND ".join(clauses)
+
+        rows = self.db.execute(
+            text(_BULK_STATUS_SQL.format(selector=selector)), params
+        ).mappings().all()
+        self.db.commit()
+        return [dict(row) for row in rows]
+
+    def get_records_by_ids(
+        self, incident_ids: List[str], include_archived: bool = False
+    ) -> List[IncidentRecord]:
+        """
+        Return the incidents with the given IDs as plain records, in no
+        particular order; IDs that do not exist are skipped.
+        """
+        if not incident_ids:
+            return []
+        query = select(*_RECORD_COLUMNS).where(IncidentModel.id.in_(incident_ids))
+        if include_archived:
+            query = union_all(
+                query,
+                select(*_ARCHIVE_RECORD_COLUMNS).where(
+                    IncidentArchiveModel.id.in_(incident_ids)
+                ),
+            )
+        rows = self.db.execute(query).all()
+        return [dict(zip(INCIDENT_RECORD_FIELDS, row)) for row in rows]
+
+    def iter_embedding_sources(
+        self,
+        since: Optional[datetime] = None,
+        include_archived: bool = False,
+        batch_size: int = 2000,
+    ) -> Iterator[tuple]:
+        """
+        Stream `(id, erp_module, title, description, created_at)` for incidents
+        created at or after `since` (all when `None`), oldest first.
+
+        Rows are fetched `batch_size` at a time through a server-side cursor,
+        so a full scan does not load the table into memory.
+        """
+        columns = ("id", "erp_module", "title", "description", "created_at")
+        query = select(*(getattr(IncidentModel, c) for c in columns))
+        if since is not None:
+            query = query.where(IncidentModel.created_at >= since)
+        if include_archived:
+            archived = select(*(getattr(IncidentArchiveModel, c) for c in columns))
+            if since is not None:
+                archived = archived.where(IncidentArchiveModel.created_at >= since)
+            merged = union_all(query, archived).subquery()
+            query = select(merged).order_by(merged.c.created_at, merged.c.id)
+        else:
+            query = query.order_by(IncidentModel.created_at, IncidentModel.id)
+        result = self.db.execute(
+            query.execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for row in result:
+            yield tuple(row)
@@ -0,0 +1,112 @@
+"""Database access layer for the incident stats rollup."""
+
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.incident_stats import IncidentStatsDailyModel
+
+# Full recount from live and archived incidents, bucketed exactly like the rollup.
+_RECOUNT_SQL = """
+    SELECT (created_at AT TIME ZONE 'UTC')::date AS day,
+           severity,
+           erp_module,
+           status,
+           count(*) AS incident_count
+    FROM (
+        SELECT created_at, severity, erp_module, status FROM incidents
+        UNION ALL
+        SELECT created_at, severity, erp_module, status FROM incidents_archive
+    ) AS all_incidents
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+class IncidentStatsRepository:
+    """
+    Handles reads and incremental writes of `incident_stats_daily`.
+
+    Writes never commit; they join the caller's transaction so the rollup
+    changes atomically with the incident row.
+    """
+
+    def __init__(self, db: Session):
+        """Create a repository bound to the provided SQLAlchemy session."""
+        self.db = db
+
+    def apply_delta(
+        self, day: date, severity: str, erp_module: str, status: str, delta: int
+    ) -> None:
+        """Add `delta` to one rollup bucket, creating it if needed."""
+        stmt = insert(IncidentStatsDailyModel).values(
+            day=day,
+            severity=severity,
+            erp_module=erp_module,
+            status=status,
+            incident_count=delta,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "severity", "erp_module", "status"],
+            set_={
+                "incident_count": IncidentStatsDailyModel.incident_count
+                + stmt.excluded.incident_count
+            },
+        )
+        self.db.execute(stmt)
+
+    def totals(self) -> List[tuple[str, str, str, int]]:
+        """Return `(severity, erp_module, status, count)` over all days."""
+        m = IncidentStatsDailyModel
+        return (
+            self.db.query(
+                m.severity, m.erp_module, m.status, func.sum(m.incident_count)
+            )
+            .group_by(m.severity, m.erp_module, m.status)
+            .all()
+        )
+
+    def daily(self, since: Optional[date] = None) -> List[tuple[date, int]]:
+        """Return `(day, count)` per day, optionally from `since` onwards."""
+        m = IncidentStatsDailyModel
+        query = self.db.query(m.day, func.sum(m.incident_count))
+        if since is not None:
+            query = query.filter(m.day >= since)
+        return query.group_by(m.day).order_by(m.day).all()
+
+    def find_drift(self) -> List[dict]:
+        """Compare the rollup with a full recount and return mismatched buckets."""
+        rows = self.db.execute(
+            text(
+                f"""
+                SELECT day, severity, erp_module, status,
+                       coalesce(r.incident_count, 0) AS rollup_count,
+                       coalesce(c.incident_count, 0) AS actual_count
+                FROM incident_stats_daily AS r
+                FULL OUTER JOIN ({_RECOUNT_SQL}) AS c
+                  USING (day, severity, erp_module, status)
+                WHERE coalesce(r.incident_count, 0) <> coalesce(c.incident_count, 0)
+                ORDER BY day, severity, erp_module, status
+                """
+            )
+        ).mappings()
+        return [dict(row) for row in rows]
+
+    def rebuild(self) -> None:
+        """
+        Replace the rollup with a full recount.
+
+        Takes an EXCLUSIVE lock first so in-flight increments finish before the
+        recount and new ones wait until the rebuilt rollup is committed.
+        """
+        self.db.execute(text("LOCK TABLE incident_stats_daily IN EXCLUSIVE MODE"))
+        self.db.execute(text("DELETE FROM incident_stats_daily"))
+        self.db.execute(
+            text(
+                "INSERT INTO incident_stats_daily "
+                "(day, severity, erp_module, status, incident_count) "
+                f"{_RECOUNT_SQL}"
+            )
+        )
@@ -3,8 +3,10 @@
 from datetime import datetime
 from typing import Optional
 from enum import Enum
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
+from typing_extensions import TypedDict
 
 
 class ERPModule(str, Enum):
@@ -68,6 +70,66 @@ class IncidentStatusUpdateRequest(BaseModel):
     status: IncidentStatus
 
 
+class IncidentBulkStatusFilter(BaseModel):
+    """Selects incidents for a bulk status change; at least one field is required."""
+
+    erp_module: Optional[ERPModule] = None
+    severity: Optional[Severity] = None
+    environment: Optional[Environment] = None
+    status: Optional[IncidentStatus] = None
+
+    @model_validator(mode="after")
+    def _not_empty(self):
+        # Explicit nulls count as unset: an all-null filter would match everything.
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("filter needs at least one non-null field")
+        return self
+
+
+class IncidentBulkStatusUpdateRequest(BaseModel):
+    """
+    Request body for changing the status of many incidents at once.
+
+    Exactly one of `ids` or `filter` must be given.
+    """
+
+    status: IncidentStatus
+    ids: Optional[list[UUID]] = Field(default=None, min_length=1, max_length=5000)
+    filter: Optional[IncidentBulkStatusFilter] = None
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of `ids` or `filter`")
+        return self
+
+
+class BulkStatusOutcome(str, Enum):
+    """Per-incident result of a bulk status change."""
+
+    UPDATED = "UPDATED"
+    UNCHANGED = "UNCHANGED"
+    INVALID_TRANSITION = "INVALID_TRANSITION"
+    NOT_FOUND = "NOT_FOUND"
+
+
+class IncidentBulkStatusResult(BaseModel):
+    """Outcome for one incident in a bulk status change."""
+
+    id: str
+    outcome: BulkStatusOutcome
+    previous_status: Optional[IncidentStatus] = None
+
+
+class IncidentBulkStatusUpdateResponse(BaseModel):
+    """Response for a bulk status change."""
+
+    status: IncidentStatus
+    updated: int
+    results: list[IncidentBulkStatusResult]
+    has_more: bool = False
+
+
 class IncidentResponse(BaseModel):
     """Response model for an incident returned by the API."""
 
@@ -82,6 +144,8 @@ class IncidentResponse(BaseModel):
     auto_summary: Optional[str]
     suggested_action: Optional[str]
     status: IncidentStatus
+    sla_due_at: Optional[datetime] = None
+    escalated_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -89,3 +153,66 @@ class IncidentResponse(BaseModel):
         """Pydantic configuration for ORM attribute loading."""
 
         from_attributes = True
+
+
+class IncidentSearchHit(IncidentResponse):
+    """
+    An incident matched by full-text search, with rank and highlights.
+
+    `title_highlight` and `snippet` are HTML-escaped, with matches wrapped in
+    `<mark>` tags.
+    """
+
+    rank: float
+    title_highlight: str
+    snippet: str
+
+
+class RelatedIncident(IncidentResponse):
+    """A past incident similar to the one being viewed."""
+
+    score: float
+
+
+class IncidentSearchResponse(BaseModel):
+    """A page of ranked full-text search results."""
+
+    items: list[IncidentSearchHit]
+    limit: int
+    offset: int
+    has_more: bool
+    # More matches exist than were ranked (only the newest are considered).
+    truncated: bool = False
+
+
+class IncidentRecord(TypedDict):
+    """
+    Plain-row shape of an incident for the fast serialization path.
+
+    Keys mirror `IncidentResponse` in the same order; enum columns are kept as
+    the raw strings stored in the database, which serialize identically.
+    """
+
+    id: str
+    title: str
+    description: str
+    erp_module: str
+    environment: str
+    business_unit: str
+    severity: str
+    category: str
+    auto_summary: Optional[str]
+    suggested_action: Optional[str]
+    status: str
+    sla_due_at: Optional[datetime]
+    escalated_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+
+INCIDENT_RECORD_FIELDS: tuple[str, ...] = tuple(IncidentResponse.model_fields)
+
+# Precompiled pydantic-core serializers: dump rows straight to JSON bytes
+# without building a model per row or running jsonable_encoder.
+incident_record_adapter = TypeAdapter(IncidentRecord)
+incident_record_list_adapter = TypeAdapter(list[IncidentRecord])
@@ -0,0 +1,41 @@
+"""Pydantic schemas for incident statistics and rollup reconciliation."""
+
+from datetime import date
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class DailyIncidentCount(BaseModel):
+    """Number of incidents created on one UTC day."""
+
+    day: date
+    count: int
+
+
+class IncidentStatsResponse(BaseModel):
+    """Aggregate incident counts served from the rollup table."""
+
+    total: int
+    by_severity: Dict[str, int]
+    by_erp_module: Dict[str, int]
+    by_status: Dict[str, int]
+    by_day: List[DailyIncidentCount]
+
+
+class IncidentStatsDrift(BaseModel):
+    """A rollup bucket whose count disagrees with a full recount."""
+
+    day: date
+    severity: str
+    erp_module: str
+    status: str
+    rollup_count: int
+    actual_count: int
+
+
+class IncidentStatsReconcileResponse(BaseModel):
+    """Outcome of comparing (and optionally rebuilding) the rollup."""
+
+    drift: List[IncidentStatsDrift]
+    repaired: bool
@@ -3,13 +3,23 @@
 from __future__ import annotations
 
 import json
-
-from openai import OpenAI
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 from app.schemas.incident import Category, Environment, IncidentCreateRequest, Severity
+from app.services.prompt_budget import prepare_text
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
+logger = logging.getLogger(__name__)
 
+# Instructions and schema never vary between calls, so the request prefix is
+# byte-identical and eligible for provider-side prompt caching; everything
+# incident-specific goes into `input`, after it.
 AI_ENRICH_PROMPT = """You are an ERP incident triage assistant.
 
 Given an incident report, classify it into one of the allowed categories and
@@ -32,6 +42,61 @@ AI_ENRICH_SCHEMA = {
 }
 
 
+class LlmUsageStats:
+    """Process-wide token and latency counters for enrichment calls."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.truncated_inputs = 0
+        self.input_tokens = 0
+        self.cached_input_tokens = 0
+        self.output_tokens = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+
+    def record(
+        self,
+        *,
+        latency_ms: float,
+        ok: bool,
+        truncated: bool,
+        input_tokens: int = 0,
+        cached_input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        with self._lock:
+            self.calls += 1
+            self.failures += 0 if ok else 1
+            self.truncated_inputs += 1 if truncated else 0
+            self.input_tokens += input_tokens
+            self.cached_input_tokens += cached_input_tokens
+            self.output_tokens += output_tokens
+            self.latency_ms_total += latency_ms
+            self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+
+    def snapshot(self) -> dict:
+        """Current counters, suitable for a metrics endpoint."""
+        with self._lock:
+            calls = self.calls
+            return {
+                "calls": calls,
+                "failures": self.failures,
+                "truncated_inputs": self.truncated_inputs,
+                "input_tokens": self.input_tokens,
+                "cached_input_tokens": self.cached_input_tokens,
+                "output_tokens": self.output_tokens,
+                "avg_input_tokens": round(self.input_tokens / calls, 1) if calls else 0.0,
+                "avg_output_tokens": round(self.output_tokens / calls, 1) if calls else 0.0,
+                "latency_ms_avg": round(self.latency_ms_total / calls, 2) if calls else 0.0,
+                "latency_ms_max": round(self.latency_ms_max, 2),
+            }
+
+
+llm_usage = LlmUsageStats()
+
+
 class EnrichmentService:
     """
     Handles incident enrichment using rule-based logic
@@ -39,13 +104,34 @@ class EnrichmentService:
     """
 
     def __init__(self) -> None:
-        """Initialize the enrichment service and optional OpenAI client."""
+        """Initialize the enrichment service; the OpenAI client is built lazily."""
         self._client: OpenAI | None = None
-        if settings.OPENAI_API_KEY:
-            self._client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self._client_lock = threading.Lock()
 
         self._analysis_cache: dict[str, dict | None] = {}
 
+    def _get_client(self) -> OpenAI | None:
+        """
+        Return the OpenAI client, importing the SDK on first use.
+
+        The SDK takes hundreds of milliseconds to import, so it is kept off the
+        worker startup path and never loaded when no API key is configured.
+        """
+        if self._client is None and settings.OPENAI_API_KEY:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI(
+                        api_key=settings.OPENAI_API_KEY,
+                        base_url=settings.OPENAI_BASE_URL or None,
+                        # Bounded well below IDEMPOTENCY_LOCK_TIMEOUT_S so an
+                        # idempotent create finishes while it still owns its key.
+                        timeout=settings.OPENAI_TIMEOUT_S,
+                        max_retries=settings.OPENAI_MAX_RETRIES,
+                    )
+        return self._client
+
     def enrich(self, payload: IncidentCreateRequest) -> dict:
         """Enrich an incident payload with severity, category, and metadata."""
         severity = self._determine_severity(payload)
@@ -57,7 +143,7 @@ class EnrichmentService:
             summary = openai_analysis.get("auto_summary")
             suggested_action = openai_analysis.get("suggested_action")
         else:
-            category = self._determine_category(payload)
+            category = self._determine_category(payload, analysis=None)
             summary = "NA"
             suggested_action = "NA"
 
@@ -80,9 +166,13 @@ class EnrichmentService:
             return Severity.P2
         return Severity.P3
 
-    def _determine_category(self, payload: IncidentCreateRequest) -> Category:
-        """Infer a category, preferring OpenAI classification when available."""
-        analysis = self._openai_analyze(payload)
+    def _determine_category(
+        self, payload: IncidentCreateRequest, analysis: dict | None = None
+    ) -> Category:
+        """
+        Infer a category, preferring an OpenAI classification when one is
+        passed in (this never calls the model itself).
+        """
         if analysis and "category" in analysis:
             try:
                 return Category(analysis["category"])
@@ -121,21 +211,30 @@ class EnrichmentService:
 
     def _openai_analyze(self, payload: IncidentCreateRequest) -> dict | None:
         """Return OpenAI-derived category, summary, and suggested action."""
-        if not self._client:
+        client = self._get_client()
+        if not client:
             return None
 
+        # Pasted logs can be huge: drop repeated lines and cap the size,
+        # keeping the start, the end and anything that looks like an error.
+        description = prepare_text(
+            payload.description, settings.ENRICH_MAX_DESCRIPTION_TOKENS
+        )
         input_text = "\n".join(
             [
                 f"Title: {payload.title}",
-                f"Description: {payload.description}",
                 f"ERP module: {payload.erp_module}",
                 f"Environment: {payload.environment}",
                 f"Business unit: {payload.business_unit}",
+                f"Description:\n{description.text}",
             ]
         )
 
+        start = time.perf_counter()
+        response = None
+        error = None
         try:
-            response = self._client.responses.create(
+            response = client.responses.create(
                 model=settings.OPENAI_MODEL,
                 instructions=AI_ENRICH_PROMPT,
                 input=input_text,
@@ -149,9 +248,45 @@ class EnrichmentService:
                     }
                 },
                 temperature=0.2,
+                max_output_tokens=settings.OPENAI_MAX_OUTPUT_TOKENS,
+                prompt_cache_key=settings.OPENAI_PROMPT_CACHE_KEY,
             )
             analysis = json.loads(response.output_text)
-        except Exception:
+        except Exception as exc:
             analysis = None
+            error = exc
+        latency_ms = (time.perf_counter() - start) * 1000.0
 
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        details = getattr(usage, "input_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        llm_usage.record(
+            latency_ms=latency_ms,
+            ok=error is None,
+            truncated=description.truncated,
+            input_tokens=input_tokens,
+            cached_input_tokens=cached_tokens,
+            output_tokens=output_tokens,
+        )
+        logger.log(
+            logging.WARNING if error is not None else logging.INFO,
+            "llm_call",
+            extra={
+                "event": "llm_call",
+                "model": settings.OPENAI_MODEL,
+                "ok": error is None,
+                "error": type(error).__name__ if error is not None else None,
+                "latency_ms": round(latency_ms, 2),
+                "input_tokens": input_tokens,
+                "cached_input_tokens": cached_tokens,
+                "output_tokens": output_tokens,
+                "description_tokens": description.original_tokens,
+                "description_tokens_sent": description.tokens,
+                "repeated_lines_dropped": description.repeated_lines,
+                "lines_omitted": description.omitted_lines,
+                "lines_clipped": description.clipped_lines,
+            },
+        )
         return analysis
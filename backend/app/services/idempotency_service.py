@@ -0,0 +1,143 @@
+"""Idempotency-Key handling for write endpoints."""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a request with a different body."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The first request with this key is still running after the wait timeout."""
+
+
+class IdempotencyClaimLost(IdempotencyKeyInProgress):
+    """The claim expired and a retry with the same key took it over."""
+
+
+def request_fingerprint(body: bytes) -> str:
+    """Hash a canonical request body so reused keys can be detected."""
+    return hashlib.sha256(body).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Lets the first request with a given key do the work and makes every other
+    request with that key wait for, then replay, its stored response.
+
+    Ownership is decided in Postgres, so it holds across workers. Waiters in
+    the same process are woken as soon as the owner finishes; waiters in other
+    processes notice on their next poll. Each waiter holds a threadpool
+    thread, so at most `IDEMPOTENCY_MAX_WAITERS` wait per process; beyond
+    that, retries are told the key is still in progress straight away.
+    """
+
+    _POLL_MIN_S = 0.05
+    _POLL_MAX_S = 0.5
+
+    def __init__(self):
+        """Initialize the in-process wake-up registry."""
+        self._events: dict[str, threading.Event] = {}
+        self._events_lock = threading.Lock()
+        self._waiters = threading.BoundedSemaphore(settings.IDEMPOTENCY_MAX_WAITERS)
+
+    def begin(
+        self, key: str, request_hash: str
+    ) -> tuple[Optional[str], Optional[tuple[int, bytes]]]:
+        """
+        Claim `key` for this request, or wait for its owner to finish.
+
+        Returns `(claim_id, None)` when the caller owns the key and must run
+        the request (then call `complete` with `claim_id` in its transaction,
+        or `release` on failure). Otherwise returns `(None, (status_code,
+        body))`, the stored response to replay.
+        """
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT_S
+        poll_s = self._POLL_MIN_S
+        waiting = False
+        with get_db() as db:
+            repo = IdempotencyRepository(db)
+            try:
+                while True:
+                    claim_id = repo.claim(
+                        key,
+                        request_hash,
+                        lock_s=settings.IDEMPOTENCY_LOCK_TIMEOUT_S,
+                        ttl_s=settings.IDEMPOTENCY_KEY_TTL_S,
+                    )
+                    if claim_id is not None:
+                        with self._events_lock:
+                            self._events.setdefault(key, threading.Event())
+                        return claim_id, None
+
+                    stored = repo.get(key)
+                    if stored is not None:
+                        if stored.request_hash != request_hash:
+                            raise IdempotencyKeyReused(key)
+                        if stored.status_code is not None:
+                            return None, (stored.status_code, stored.response_body)
+                    db.rollback()
+
+                    if not waiting:
+                        if not self._waiters.acquire(blocking=False):
+                            raise IdempotencyKeyInProgress(key)
+                        waiting = True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise IdempotencyKeyInProgress(key)
+                    with self._events_lock:
+                        event = self._events.get(key)
+                    if event is not None:
+                        event.wait(min(poll_s, remaining))
+                    else:
+                        time.sleep(min(poll_s, remaining))
+                    poll_s = min(poll_s * 2, self._POLL_MAX_S)
+            finally:
+                if waiting:
+                    self._waiters.release()
+
+    def complete(
+        self, db: Session, key: str, claim_id: str, status_code: int, body: bytes
+    ) -> None:
+        """
+        Store the response in the caller's transaction (commit, then `finish`).
+
+        Raises `IdempotencyClaimLost` if the claim expired and another request
+        took the key over; the caller must roll back its write.
+        """
+        if not IdempotencyRepository(db).complete(key, claim_id, status_code, body):
+            logger.warning(
+                "idempotency_claim_lost",
+                extra={"event": "idempotency_claim_lost", "idempotency_key": key},
+            )
+            raise IdempotencyClaimLost(key)
+
+    def release(self, key: str, claim_id: str) -> None:
+        """Give up ownership after a failure so a retry can run the request."""
+        with get_db() as db:
+            IdempotencyRepository(db).release(key, claim_id)
+        self.finish(key)
+
+    def finish(self, key: str) -> None:
+        """Wake waiters in this process."""
+        with self._events_lock:
+            event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def purge_expired(self) -> int:
+        """Delete keys past their TTL; returns how many were removed."""
+        with get_db() as db:
+            return IdempotencyRepository(db).purge_expired()
@@ -1,16 +1,99 @@
-"""Domain service for incident creation, listing, and status updates."""
+"""Domain service for incident creation, listing, status updates and archival."""
 
-import uuid
-from datetime import datetime
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
 
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.ids import uuid7
 from app.schemas.incident import (
+    BulkStatusOutcome,
+    Environment,
+    ERPModule,
+    IncidentBulkStatusResult,
+    IncidentBulkStatusUpdateRequest,
+    IncidentBulkStatusUpdateResponse,
     IncidentCreateRequest,
+    IncidentResponse,
+    IncidentSearchResponse,
     IncidentStatus,
+    RelatedIncident,
+    Severity,
+    incident_record_adapter,
+    incident_record_list_adapter,
+)
+from app.schemas.incident_stats import (
+    DailyIncidentCount,
+    IncidentStatsDrift,
+    IncidentStatsReconcileResponse,
+    IncidentStatsResponse,
 )
 from app.services.enrichment_service import EnrichmentService
+from app.services.idempotency_service import IdempotencyService, request_fingerprint
+from app.repositories.incident_archive_repository import IncidentArchiveRepository
 from app.repositories.incident_repository import IncidentRepository
+from app.repositories.incident_stats_repository import IncidentStatsRepository
 from app.models.incident import IncidentModel
-from app.db.session import get_db
+from app.db.session import get_db, get_replica_router, run_read
+
+logger = logging.getLogger(__name__)
+
+# Lifecycle: which statuses each status may move to. CLOSED is final.
+STATUS_TRANSITIONS: dict[IncidentStatus, frozenset[IncidentStatus]] = {
+    IncidentStatus.OPEN: frozenset(
+        {IncidentStatus.IN_PROGRESS, IncidentStatus.RESOLVED, IncidentStatus.CLOSED}
+    ),
+    IncidentStatus.IN_PROGRESS: frozenset(
+        {IncidentStatus.OPEN, IncidentStatus.RESOLVED, IncidentStatus.CLOSED}
+    ),
+    IncidentStatus.RESOLVED: frozenset(
+        {IncidentStatus.IN_PROGRESS, IncidentStatus.CLOSED}
+    ),
+    IncidentStatus.CLOSED: frozenset(),
+}
+
+
+class InvalidStatusTransition(Exception):
+    """The lifecycle (`STATUS_TRANSITIONS`) does not allow this status change."""
+
+    def __init__(self, current: str, requested: str) -> None:
+        super().__init__(f"Cannot move an incident from {current} to {requested}")
+        self.current = current
+        self.requested = requested
+
+
+class RelatedIncidentsUnavailable(Exception):
+    """The related-incident index is disabled or has not been loaded yet."""
+
+
+def _value(member) -> str:
+    """Return the raw string for an enum member (or pass a string through)."""
+    return getattr(member, "value", member)
+
+
+def _utc_day(value: datetime) -> date:
+    """Bucket a timestamp into its UTC day (naive values are already UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _sla_minutes() -> dict[str, int]:
+    return {
+        Severity.P1.value: settings.SLA_P1_MINUTES,
+        Severity.P2.value: settings.SLA_P2_MINUTES,
+        Severity.P3.value: settings.SLA_P3_MINUTES,
+    }
+
+
+def sla_deadline(severity, environment, created_at: datetime) -> datetime:
+    """Return when an incident must have left OPEN, per the SLA_* settings."""
+    minutes = _sla_minutes()[_value(severity)]
+    if _value(environment) != Environment.PROD.value:
+        minutes *= settings.SLA_NON_PROD_FACTOR
+    return created_at + timedelta(minutes=minutes)
 
 
 class IncidentService:
@@ -21,51 +104,480 @@ class IncidentService:
     def __init__(self):
         """Initialize the service and its dependencies."""
         self.enrichment_service = EnrichmentService()
+        self.idempotency_service = IdempotencyService()
 
     def create_incident(self, payload: IncidentCreateRequest):
         """Create, enrich, and persist a new incident."""
         with get_db() as db:
-            repo = IncidentRepository(db)
+            incident = self._stage_incident(db, payload)
+            incident = IncidentRepository(db).create(incident)
+        self._index_incident(incident)
+        return incident
+
+    def create_incident_idempotent(
+        self, payload: IncidentCreateRequest, idempotency_key: str
+    ) -> tuple[bytes, bool]:
+        """
+        Create an incident at most once per `idempotency_key`.
 
-            enrichment = self.enrichment_service.enrich(payload)
-
-            incident = IncidentModel(
-                id=str(uuid.uuid4()),
-                title=payload.title,
-                description=payload.description,
-                erp_module=payload.erp_module,
-                environment=payload.environment,
-                business_unit=payload.business_unit,
-                severity=enrichment["severity"],
-                category=enrichment["category"],
-                auto_summary=enrichment["auto_summary"],
-                suggested_action=enrichment["suggested_action"],
-                status=IncidentStatus.OPEN,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
+        Returns the JSON response body and whether it was replayed. Retries
+        (including concurrent ones) wait for the first request and get its
+        stored response, so enrichment and the insert run only once. The
+        response is stored in the same transaction as the insert.
+        """
+        request_hash = request_fingerprint(payload.model_dump_json().encode())
+        claim_id, stored = self.idempotency_service.begin(idempotency_key, request_hash)
+        if stored is not None:
+            return stored[1], True
+
+        try:
+            with get_db() as db:
+                incident = self._stage_incident(db, payload)
+                db.flush()
+                db.refresh(incident)
+                body = IncidentResponse.model_validate(incident).model_dump_json()
+                body = body.encode()
+                self.idempotency_service.complete(
+                    db, idempotency_key, claim_id, 201, body
+                )
+                db.commit()
+        except Exception:
+            self.idempotency_service.release(idempotency_key, claim_id)
+            raise
+        self.idempotency_service.finish(idempotency_key)
+        self._index_incident(incident)
+        return body, False
+
+    @staticmethod
+    def _index_incident(incident: IncidentModel) -> None:
+        """Make a new incident findable as related without waiting for a sync."""
+        if not settings.similarity_index_enabled:
+            return
+        # Imported lazily: the index needs NumPy, which most workers never load.
+        from app.services.similarity_index import get_similarity_index
+
+        index = get_similarity_index()
+        if index is not None:
+            index.add(
+                incident.id,
+                _value(incident.erp_module),
+                incident.title,
+                incident.description,
+                incident.created_at,
             )
 
-            return repo.create(incident)
+    def _stage_incident(self, db, payload: IncidentCreateRequest) -> IncidentModel:
+        """
+        Enrich `payload` and add the new incident and its stats delta to the
+        session's transaction, without committing.
+        """
+        stats_repo = IncidentStatsRepository(db)
 
-    def list_incidents(self, severity=None, erp_module=None, status=None):
-        """Return incidents matching the optional filter parameters."""
-        with get_db() as db:
-            repo = IncidentRepository(db)
-            return repo.list(severity, erp_module, status)
+        enrichment = self.enrichment_service.enrich(payload)
+        now = datetime.utcnow()
 
-    def get_incident_by_id(self, incident_id: str):
-        """Return an incident by ID, or `None` if it does not exist."""
-        with get_db() as db:
-            repo = IncidentRepository(db)
-            return repo.get_by_id(incident_id)
+        incident = IncidentModel(
+            id=str(uuid7()),
+            title=payload.title,
+            description=payload.description,
+            erp_module=payload.erp_module,
+            environment=payload.environment,
+            business_unit=payload.business_unit,
+            severity=enrichment["severity"],
+            category=enrichment["category"],
+            auto_summary=enrichment["auto_summary"],
+            suggested_action=enrichment["suggested_action"],
+            status=IncidentStatus.OPEN,
+            sla_due_at=sla_deadline(
+                enrichment["severity"], payload.environment, now
+            ),
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(incident)
+
+        stats_repo.apply_delta(
+            day=_utc_day(now),
+            severity=_value(enrichment["severity"]),
+            erp_module=_value(payload.erp_module),
+            status=IncidentStatus.OPEN.value,
+            delta=1,
+        )
+        return incident
+
+    def list_incidents_json(
+        self, severity=None, erp_module=None, status=None, include_archived=False
+    ) -> bytes:
+        """Return matching incidents already serialized as a JSON array."""
+        records = run_read(
+            lambda db: IncidentRepository(db).list_records(
+                severity, erp_module, status, include_archived=include_archived
+            )
+        )
+        return incident_record_list_adapter.dump_json(records)
+
+    def search_incidents(
+        self,
+        q: str,
+        severity=None,
+        erp_module=None,
+        status=None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> IncidentSearchResponse:
+        """
+        Return a ranked page of incidents matching the search text.
+
+        Only the `SEARCH_MAX_CANDIDATES` most recent matches are ranked, so
+        pages are cut off at that window: `has_more` turns false at its end
+        and `truncated` reports that older matches exist but were not ranked.
+        """
+        max_candidates = settings.SEARCH_MAX_CANDIDATES
+        page_limit = max(0, min(limit, max_candidates - offset))
+        hits = run_read(
+            lambda db: IncidentRepository(db).search(
+                q,
+                severity,
+                erp_module,
+                status,
+                limit=page_limit,
+                offset=min(offset, max_candidates),
+                max_candidates=max_candidates,
+            )
+        )
+        matched = hits[0]["matched"] if hits else 0
+        return IncidentSearchResponse(
+            items=hits[:page_limit],
+            limit=limit,
+            offset=offset,
+            has_more=len(hits) > page_limit and offset + page_limit < max_candidates,
+            truncated=matched > max_candidates,
+        )
+
+    def get_incident_json(self, incident_id: str) -> bytes | None:
+        """
+        Return an incident serialized as JSON, or `None` if it does not exist.
+
+        Archived incidents are still returned, so existing links keep working.
+        Misses on a replica are retried on the primary, which may be ahead.
+        """
+        record = run_read(
+            lambda db: IncidentRepository(db).get_record_by_id(
+                incident_id, include_archived=True
+            )
+        )
+        if record is None and get_replica_router() is not None:
+            with get_db() as db:
+                repo = IncidentRepository(db)
+                record = repo.get_record_by_id(incident_id, include_archived=True)
+        if record is None:
+            return None
+        return incident_record_adapter.dump_json(record)
+
+    def get_related_incidents(
+        self, incident_id: str, limit: int = 5
+    ) -> list[RelatedIncident] | None:
+        """
+        Return up to `limit` incidents from the same ERP module most similar
+        to the given one (archived ones included), best first, or `None` if
+        the incident does not exist. Raises `RelatedIncidentsUnavailable`
+        when the similarity index is disabled or still loading.
+        """
+        if not settings.similarity_index_enabled:
+            raise RelatedIncidentsUnavailable("Related-incident search is disabled")
+        from app.services.similarity_index import get_similarity_index
+
+        index = get_similarity_index()
+        if not index.ready:
+            raise RelatedIncidentsUnavailable("Related-incident index is still loading")
+
+        record = run_read(
+            lambda db: IncidentRepository(db).get_record_by_id(
+                incident_id, include_archived=True
+            )
+        )
+        if record is None and get_replica_router() is not None:
+            with get_db() as db:
+                record = IncidentRepository(db).get_record_by_id(
+                    incident_id, include_archived=True
+                )
+        if record is None:
+            return None
+
+        hits = [
+            (hit_id, score)
+            for hit_id, score in index.related(
+                incident_id,
+                record["erp_module"],
+                record["title"],
+                record["description"],
+                k=limit,
+            )
+            if score >= settings.SIMILARITY_MIN_SCORE
+        ]
+        records = run_read(
+            lambda db: IncidentRepository(db).get_records_by_ids(
+                [hit_id for hit_id, _ in hits], include_archived=True
+            )
+        )
+        by_id = {str(r["id"]): r for r in records}
+        return [
+            RelatedIncident(**by_id[hit_id], score=round(score, 4))
+            for hit_id, score in hits
+            if hit_id in by_id
+        ]
 
     def update_incident_status(self, incident_id: str, status: IncidentStatus):
-        """Update the status for an existing incident and persist the change."""
+        """
+        Update the status for an existing incident and persist the change.
+
+        Raises `InvalidStatusTransition` when `STATUS_TRANSITIONS` forbids the
+        move; setting the current status again is a no-op.
+        """
         with get_db() as db:
             repo = IncidentRepository(db)
-            incident = repo.get_by_id(incident_id)
+            # Row lock keeps concurrent transitions from double-counting stats.
+            incident = repo.get_by_id(incident_id, for_update=True)
             if not incident:
                 return None
 
-            incident.updated_at = datetime.utcnow()
+            old_status, new_status = _value(incident.status), _value(status)
+            if old_status == new_status:
+                return incident
+            if IncidentStatus(new_status) not in STATUS_TRANSITIONS[
+                IncidentStatus(old_status)
+            ]:
+                raise InvalidStatusTransition(old_status, new_status)
+
+            stats_repo = IncidentStatsRepository(db)
+            day = _utc_day(incident.created_at)
+            # Touch the two rollup rows in status order, like the bulk
+            # statement, so opposite moves in one bucket cannot deadlock.
+            for bucket_status, delta in sorted(((old_status, -1), (new_status, 1))):
+                stats_repo.apply_delta(
+                    day=day,
+                    severity=incident.severity,
+                    erp_module=incident.erp_module,
+                    status=bucket_status,
+                    delta=delta,
+                )
+
+            now = datetime.utcnow()
+            if new_status == IncidentStatus.OPEN.value:
+                # Reopened: start a fresh SLA clock instead of escalating on
+                # the original (probably long past) deadline.
+                incident.sla_due_at = sla_deadline(
+                    incident.severity, incident.environment, now
+                )
+                incident.escalated_at = None
+            incident.updated_at = now
             return repo.update_status(incident, status)
+
+    def bulk_update_status(
+        self, request: IncidentBulkStatusUpdateRequest
+    ) -> IncidentBulkStatusUpdateResponse:
+        """
+        Move many incidents to one status in a single UPDATE and report the
+        outcome per incident.
+
+        Transitions are checked against `STATUS_TRANSITIONS` inside the
+        statement. Filter-based requests only match incidents that can make
+        the transition and are capped at `BULK_STATUS_MAX_INCIDENTS`;
+        `has_more` tells the caller to repeat the request.
+        """
+        target = request.status
+        allowed_from = [
+            source.value
+            for source, targets in STATUS_TRANSITIONS.items()
+            if target in targets
+        ]
+        ids = [str(i) for i in dict.fromkeys(request.ids)] if request.ids else None
+        limit = len(ids) if ids is not None else settings.BULK_STATUS_MAX_INCIDENTS
+        filters = (
+            {k: _value(v) for k, v in request.filter.model_dump().items()}
+            if request.filter is not None
+            else None
+        )
+
+        with get_db() as db:
+            rows = IncidentRepository(db).bulk_update_status(
+                status=target.value,
+                allowed_from=allowed_from,
+                limit=limit,
+                ids=ids,
+                filters=filters,
+                sla_minutes=_sla_minutes(),
+                sla_non_prod_factor=settings.SLA_NON_PROD_FACTOR,
+            )
+
+        found = {str(row["id"]): row for row in rows}
+        results = []
+        for incident_id in ids if ids is not None else list(found):
+            row = found.get(incident_id)
+            if row is None:
+                outcome, previous = BulkStatusOutcome.NOT_FOUND, None
+            else:
+                previous = _value(row["previous_status"])
+                if row["updated"]:
+                    outcome = BulkStatusOutcome.UPDATED
+                elif previous == target.value:
+                    outcome = BulkStatusOutcome.UNCHANGED
+                else:
+                    outcome = BulkStatusOutcome.INVALID_TRANSITION
+            results.append(
+                IncidentBulkStatusResult(
+                    id=incident_id, outcome=outcome, previous_status=previous
+                )
+            )
+
+        updated = [r for r in results if r.outcome is BulkStatusOutcome.UPDATED]
+        if updated:
+            logger.info(
+                "incident_status_changed",
+                extra={
+                    "event": "incident_status_changed",
+                    "status": target.value,
+                    "count": len(updated),
+                    "from_status": dict(
+                        Counter(_value(r.previous_status) for r in updated)
+                    ),
+                    "incident_ids": [r.id for r in updated],
+                },
+            )
+        return IncidentBulkStatusUpdateResponse(
+            status=target,
+            updated=len(updated),
+            results=results,
+            has_more=ids is None and len(rows) >= limit,
+        )
+
+    def upcoming_sla_deadlines(
+        self, until: datetime, limit: int
+    ) -> list[tuple[datetime, str]]:
+        """Return `(sla_due_at, id)` for OPEN incidents due by `until`."""
+        with get_db() as db:
+            return IncidentRepository(db).upcoming_sla_deadlines(until, limit)
+
+    def escalate_overdue_incidents(self, limit: int) -> list[dict]:
+        """Mark OPEN incidents past their SLA deadline as escalated."""
+        with get_db() as db:
+            return IncidentRepository(db).escalate_overdue(limit)
+
+    def get_stats(self, days: int = 30) -> IncidentStatsResponse:
+        """
+        Return incident counts by severity, module, status, and day.
+
+        Reads only the rollup, so cost depends on the number of buckets
+        (days x severities x modules x statuses), not on the incident count.
+        """
+        since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+
+        def read(db):
+            stats_repo = IncidentStatsRepository(db)
+            return stats_repo.totals(), stats_repo.daily(since=since)
+
+        totals, daily = run_read(read)
+
+        by_severity = {s.value: 0 for s in Severity}
+        by_erp_module = {m.value: 0 for m in ERPModule}
+        by_status = {s.value: 0 for s in IncidentStatus}
+        for severity, erp_module, status, count in totals:
+            by_severity[severity] = by_severity.get(severity, 0) + count
+            by_erp_module[erp_module] = by_erp_module.get(erp_module, 0) + count
+            by_status[status] = by_status.get(status, 0) + count
+
+        return IncidentStatsResponse(
+            total=sum(by_status.values()),
+            by_severity=by_severity,
+            by_erp_module=by_erp_module,
+            by_status=by_status,
+            by_day=[DailyIncidentCount(day=day, count=count) for day, count in daily],
+        )
+
+    def reconcile_stats(self, repair: bool = False) -> IncidentStatsReconcileResponse:
+        """
+        Compare the rollup against a full recount of `incidents`.
+
+        With `repair=True` and drift present, the rollup is rebuilt from the
+        recount in one transaction.
+        """
+        with get_db() as db:
+            stats_repo = IncidentStatsRepository(db)
+            drift = stats_repo.find_drift()
+            repaired = False
+            if drift and repair:
+                stats_repo.rebuild()
+                db.commit()
+                repaired = True
+
+        return IncidentStatsReconcileResponse(
+            drift=[IncidentStatsDrift(**row) for row in drift],
+            repaired=repaired,
+        )
+
+    def ensure_partitions(self, months_ahead: int) -> int:
+        """
+        Create the monthly partitions through `months_ahead` months from now,
+        moving rows that landed in the default partition into theirs; returns
+        how many partitions were created.
+        """
+        with get_db() as db:
+            created = IncidentArchiveRepository(db).ensure_partitions(months_ahead)
+            db.commit()
+        return created
+
+    def archive_closed_incidents(
+        self,
+        retention_days: int,
+        batch_size: int,
+        months_ahead: int,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Pre-create upcoming monthly partitions, move CLOSED incidents older
+        than `retention_days` into the archive, and drop monthly partitions
+        that are left empty.
+
+        Each batch commits on its own so locks stay short. The stats rollup
+        counts live and archived incidents alike, so it needs no adjustment.
+        With `dry_run=True` nothing is changed; the counts are what would be
+        archived and dropped.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        partitions_created = 0
+        if not dry_run:
+            try:
+                partitions_created = self.ensure_partitions(months_ahead)
+            except SQLAlchemyError:
+                # Archiving does not depend on new partitions; keep going.
+                logger.exception(
+                    "partition_maintenance_failed",
+                    extra={"event": "partition_maintenance_failed"},
+                )
+        with get_db() as db:
+            repo = IncidentArchiveRepository(db)
+            if dry_run:
+                archived = repo.count_archivable(cutoff)
+                # Partitions would only be dropped once their rows are archived.
+                dropped = []
+            else:
+                archived = 0
+                while True:
+                    moved = repo.archive_batch(cutoff, batch_size)
+                    db.commit()
+                    archived += moved
+                    if moved < batch_size:
+                        break
+
+                dropped = repo.droppable_partitions(cutoff)
+                for name in dropped:
+                    repo.drop_partition(name)
+                    db.commit()
+
+        return {
+            "cutoff": cutoff.isoformat(),
+            "archived": archived,
+            "partitions_created": partitions_created,
+            "partitions_dropped": dropped,
+            "dry_run": dry_run,
+        }
@@ -0,0 +1,216 @@
+"""Input preprocessing for LLM enrichment: log-line dedup and token budgeting."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+# Volatile fragments masked out when deciding whether two log lines repeat.
+_VOLATILE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ][\d:.,]+(?:Z|[+-]\d{2}:?\d{2})?"  # timestamps
+    r"|\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"  # UUIDs
+    r"|\b0x[0-9a-f]+\b"  # addresses
+    r"|\d+",
+    re.IGNORECASE,
+)
+_ERROR_LINE = re.compile(
+    r"error|exception|fail|fatal|traceback|caused by|denied|timeout|"
+    r"\bORA-\d+|SQLSTATE|\bE\d{4,}\b",
+    re.IGNORECASE,
+)
+# Rough BPE approximation: words, numbers and single punctuation marks.
+# Deliberately local and dependency-free (no tokenizer vocabulary to fetch);
+# it tracks OpenAI's o200k/cl100k counts closely enough for budgeting, and
+# the provider-reported usage is what gets logged.
+_TOKEN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_CLIP_MARKER = " [...]"
+
+# Share of the budget spent on the start and end of the text; error lines
+# from the middle fill what is left.
+_HEAD_SHARE = 0.4
+_TAIL_SHARE = 0.25
+
+
+@dataclass
+class PreparedText:
+    """Result of `prepare_text`, with counters for usage logging."""
+
+    text: str
+    original_tokens: int
+    tokens: int
+    repeated_lines: int
+    omitted_lines: int
+    clipped_lines: int = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.omitted_lines > 0 or self.clipped_lines > 0
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate model tokens in `text` with a regex approximation of BPE: each
+    word, number or punctuation mark is one token, and long alphabetic runs
+    count one token per ~4 characters.
+    """
+    return sum(max(1, len(t) // 4) for t in _TOKEN.findall(text))
+
+
+def dedupe_lines(text: str) -> tuple[list[str], int]:
+    """
+    Normalize whitespace and drop repeated log lines.
+
+    Lines that differ only in timestamps, IDs or numbers count as repeats:
+    a run of them collapses to its first line plus a count, and later
+    recurrences are dropped. Returns the kept lines and how many were dropped.
+    """
+    kept: list[str] = []
+    seen: set[str] = set()
+    repeated = 0
+    # Current run of similar lines: (key, extra occurrences, first line kept).
+    run_key, run_extra, run_kept = None, 0, False
+
+    def close_run() -> None:
+        if run_kept and run_extra:
+            kept.append(f"  [previous line repeated {run_extra} more times]")
+
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line.strip():
+            if kept and kept[-1] and run_key is not None:
+                close_run()
+                run_key, run_extra, run_kept = None, 0, False
+                kept.append("")
+            continue
+
+        key = _VOLATILE.sub("#", line.strip())
+        if key == run_key:
+            run_extra += 1
+            repeated += 1
+            continue
+        close_run()
+        run_key, run_extra, run_kept = key, 0, key not in seen
+        if run_kept:
+            seen.add(key)
+            kept.append(line)
+        else:
+            repeated += 1
+    close_run()
+    while kept and not kept[-1]:
+        kept.pop()
+    return kept, repeated
+
+
+def fit_lines(lines: list[str], max_tokens: int) -> tuple[list[str], int, int]:
+    """
+    Keep lines within `max_tokens`: the head, the tail, and error-looking
+    lines from the middle, in original order with markers for the gaps.
+    Returns the kept lines, the number omitted, and the number clipped
+    (kept only in part because the line alone exceeds its share).
+    """
+    costs = [count_tokens(line) + 1 for line in lines]
+    if sum(costs) <= max_tokens:
+        return lines, 0, 0
+    if len(lines) == 1:
+        return [_truncate_line(lines[0], max_tokens)], 0, 1
+
+    lines = list(lines)
+    clipped = 0
+    head_budget = int(max_tokens * _HEAD_SHARE)
+    if costs[0] > head_budget:
+        # Keep at least the start of the first line, usually the headline.
+        lines[0] = _truncate_line(lines[0], head_budget - 1)
+        costs[0] = count_tokens(lines[0]) + 1
+        clipped = 1
+
+    keep = [False] * len(lines)
+    budget = head_budget
+    head_end = 0
+    while head_end < len(lines) and costs[head_end] <= budget:
+        budget -= costs[head_end]
+        keep[head_end] = True
+        head_end += 1
+
+    budget = int(max_tokens * _TAIL_SHARE)
+    tail_start = len(lines)
+    while tail_start > head_end and costs[tail_start - 1] <= budget:
+        tail_start -= 1
+        budget -= costs[tail_start]
+        keep[tail_start] = True
+
+    spent = sum(c for c, k in zip(costs, keep) if k)
+    budget = max_tokens - spent
+    middle = []
+    for i in range(head_end, tail_start):
+        if _ERROR_LINE.search(lines[i]) and costs[i] <= budget:
+            keep[i] = True
+            budget -= costs[i]
+            middle.append(i)
+
+    # Gap markers cost tokens too; drop the least useful kept lines (middle
+    # errors, then the tail, then the head) until the result fits.
+    droppable = (
+        middle[::-1]
+        + list(range(tail_start, len(lines)))
+        + list(range(head_end - 1, -1, -1))
+    )
+    while True:
+        out, omitted = _join_kept(lines, keep)
+        if count_tokens("\n".join(out)) <= max_tokens:
+            return out, omitted, clipped
+        if not droppable:
+            # Not even the gap marker fits (budgets of a few tokens).
+            return [], len(lines), clipped
+        keep[droppable.pop(0)] = False
+
+
+def _join_kept(lines: list[str], keep: list[bool]) -> tuple[list[str], int]:
+    out: list[str] = []
+    omitted = gap = 0
+    for line, kept in zip(lines, keep):
+        if kept:
+            if gap:
+                out.append(f"[... {gap} lines omitted ...]")
+                gap = 0
+            out.append(line)
+        else:
+            gap += 1
+            omitted += 1
+    if gap:
+        out.append(f"[... {gap} lines omitted ...]")
+    return out, omitted
+
+
+def _truncate_line(line: str, max_tokens: int) -> str:
+    """Return the longest prefix of `line` that, with the clip marker, fits."""
+    budget = max_tokens - count_tokens(_CLIP_MARKER)
+    if budget <= 0:
+        return ""
+    lo, hi = 0, len(line)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(line[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    # Cutting inside a word can merge tokens differently; back off until the
+    # marked result is within budget.
+    while lo and count_tokens(line[:lo] + _CLIP_MARKER) > max_tokens:
+        lo -= 1
+    return line[:lo] + _CLIP_MARKER
+
+
+def prepare_text(text: str, max_tokens: int) -> PreparedText:
+    """Dedupe repeated log lines, then fit `text` into `max_tokens`."""
+    original_tokens = count_tokens(text)
+    lines, repeated = dedupe_lines(text)
+    lines, omitted, clipped = fit_lines(lines, max_tokens)
+    result = "\n".join(lines)
+    return PreparedText(
+        text=result,
+        original_tokens=original_tokens,
+        tokens=count_tokens(result),
+        repeated_lines=repeated,
+        omitted_lines=omitted,
+        clipped_lines=clipped,
+    )
@@ -0,0 +1,432 @@
+"""Related-incident lookup: hashed n-gram embeddings in per-module NumPy indexes."""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.incident_repository import IncidentRepository
+from app.services.prompt_budget import dedupe_lines
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Long pasted logs add noise, not meaning; only the start is embedded.
+_MAX_CHARS = 4000
+_SYNC_BATCH = 2000
+_META_FILE = "meta.json"
+# Names the version directory `load` reads; replaced atomically by `save`.
+_CURRENT_FILE = "CURRENT"
+# Versions kept on disk, so a worker that just read CURRENT can still open
+# the files it points to while a newer build is being switched in.
+_KEEP_VERSIONS = 2
+
+
+def embed_text(title: str, description: str) -> str:
+    """Text an incident is embedded from: title plus deduplicated description."""
+    lines, _ = dedupe_lines(description[: _MAX_CHARS * 2])
+    return f"{title}\n" + "\n".join(lines)[:_MAX_CHARS]
+
+
+def embed(text: str, dim: int) -> np.ndarray:
+    """
+    Return an L2-normalized `dim`-wide float32 vector for `text`.
+
+    Word unigrams, word bigrams and character trigrams are hashed (crc32) into
+    buckets with a hash-derived sign, so collisions cancel out on average;
+    counts are log-damped so one repeated word cannot dominate.
+    """
+    words = _WORD.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    features += [f"#{w[i:i + 3]}" for w in words if len(w) > 3 for i in range(len(w) - 2)]
+    vec = np.zeros(dim, dtype=np.float32)
+    if not features:
+        return vec
+    hashes = np.fromiter(
+        (zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features)
+    )
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    np.add.at(vec, hashes % dim, signs)
+    vec = np.sign(vec) * np.log1p(np.abs(vec))
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+class _ModuleIndex:
+    """
+    Vectors and incident IDs for one ERP module.
+
+    `base_*` come from disk and may be read-only memory maps shared by every
+    worker through the page cache; incidents added since are appended to
+    in-memory `tail_*` arrays that grow by doubling.
+    """
+
+    def __init__(self, dim: int, base_vectors=None, base_ids=None) -> None:
+        self.dim = dim
+        self.base_vectors = (
+            base_vectors if base_vectors is not None else np.empty((0, dim), np.float32)
+        )
+        self.base_ids = base_ids if base_ids is not None else np.empty(0, "S36")
+        self.tail_vectors = np.empty((64, dim), np.float32)
+        self.tail_ids = np.empty(64, "S36")
+        self.tail_count = 0
+
+    def __len__(self) -> int:
+        return len(self.base_ids) + self.tail_count
+
+    def add(self, incident_id: str, vector: np.ndarray) -> None:
+        if self.tail_count == len(self.tail_ids):
+            size = 2 * len(self.tail_ids)
+            self.tail_vectors = np.resize(self.tail_vectors, (size, self.dim))
+            self.tail_ids = np.resize(self.tail_ids, size)
+        self.tail_vectors[self.tail_count] = vector
+        self.tail_ids[self.tail_count] = incident_id.encode()
+        self.tail_count += 1
+
+    def view(self) -> _ModuleIndex:
+        """
+        A copy sharing this index's arrays, frozen at its current size.
+
+        Safe to query without the lock: `add` only writes rows past
+        `tail_count` or swaps in freshly allocated arrays, and the base
+        arrays are never written.
+        """
+        return copy.copy(self)
+
+    def top_k(self, vector: np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Return up to `k` `(id, cosine)` pairs, best first."""
+        scores = np.concatenate(
+            (
+                self.base_vectors @ vector,
+                self.tail_vectors[: self.tail_count] @ vector,
+            )
+        )
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        base_n = len(self.base_ids)
+        return [
+            (
+                (self.base_ids[i] if i < base_n else self.tail_ids[i - base_n]).decode(),
+                float(scores[i]),
+            )
+            for i in best
+        ]
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """All vectors and IDs, base then tail (copies)."""
+        n = self.tail_count
+        return (
+            np.concatenate((self.base_vectors, self.tail_vectors[:n])),
+            np.concatenate((self.base_ids, self.tail_ids[:n])),
+        )
+
+
+class SimilarityIndex:
+    """
+    In-process nearest-neighbour index over all incidents, one matrix per
+    ERP module, answering top-k cosine queries with a single mat-vec.
+
+    The index is loaded from `path` (written by `app.jobs.build_similarity_index`)
+    when present, then caught up from the database: incidents created after
+    the newest one seen are embedded and appended. In API workers a background
+    thread (`start`) does both, catching up every `refresh_interval_s`, so
+    requests never wait on the database; until the first load succeeds the
+    index is not `ready`. Incidents a worker creates itself are added
+    immediately. The sync re-reads a `lookback_s` window so rows committed out
+    of `created_at` order are not missed; IDs seen in that window are skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        dim: int,
+        path: str | None,
+        refresh_interval_s: float,
+        lookback_s: float,
+    ) -> None:
+        self.dim = dim
+        self.path = Path(path) if path else None
+        self.refresh_interval_s = refresh_interval_s
+        self.lookback = timedelta(seconds=lookback_s)
+        self._modules: dict[str, _ModuleIndex] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._ready = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Newest (created_at, id) seen, and IDs indexed within the lookback.
+        self._watermark: tuple[datetime, str] | None = None
+        self._recent: dict[str, datetime] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Whether an index has been loaded and can answer queries."""
+        return self._ready
+
+    def start(self) -> None:
+        """Start the background load/sync thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="similarity-index-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._refresh()
+            except Exception:
+                # Keep serving the index we have; the next round retries.
+                logger.exception(
+                    "similarity_index_sync_failed",
+                    extra={"event": "similarity_index_sync_failed"},
+                )
+            self._stop.wait(self.refresh_interval_s)
+
+    def _refresh(self) -> None:
+        # Workers only serve what the build job wrote; embedding the whole
+        # history is that job's work, not every worker's.
+        if not self._ready and not self.load():
+            logger.warning(
+                "similarity_index_missing",
+                extra={"event": "similarity_index_missing", "path": str(self.path)},
+            )
+            return
+        self.sync()
+
+    def add(
+        self, incident_id: str, erp_module: str, title: str, description: str,
+        created_at: datetime,
+    ) -> None:
+        """Index a just-created incident."""
+        vector = embed(embed_text(title, description), self.dim)
+        with self._lock:
+            self._add(incident_id, erp_module, vector, _aware(created_at))
+
+    def related(
+        self, incident_id: str, erp_module: str, title: str, description: str, k: int
+    ) -> list[tuple[str, float]]:
+        """
+        Return up to `k` `(id, score)` pairs similar to the given incident,
+        from the index as it is (never touches the database).
+        """
+        vector = embed(embed_text(title, description), self.dim)
+        with self._lock:
+            module = self._modules.get(erp_module)
+            view = module.view() if module is not None else None
+        if view is None:
+            return []
+        # The mat-vec runs outside the lock so queries do not stall indexing.
+        # An incident can be indexed twice (saved and re-synced, say), so ask
+        # for more until `k` distinct IDs are found or the module runs out.
+        want = k + 1
+        while True:
+            hits = view.top_k(vector, want)
+            seen = {incident_id}
+            related = []
+            for hit_id, score in hits:
+                if hit_id not in seen:
+                    seen.add(hit_id)
+                    related.append((hit_id, score))
+            if len(related) >= k or len(hits) < want:
+                return related[:k]
+            want *= 2
+
+    def sync(self) -> int:
+        """Load from disk on first use, then index new incidents; returns how many."""
+        with self._sync_lock:
+            return self._sync_locked()
+
+    def _sync_locked(self) -> int:
+        if not self._ready and self.path is not None:
+            self.load()
+        since = None
+        if self._watermark is not None:
+            since = self._watermark[0] - self.lookback
+        added = 0
+        with get_db() as db:
+            rows = IncidentRepository(db).iter_embedding_sources(
+                since=since, include_archived=not self._ready, batch_size=_SYNC_BATCH
+            )
+            for incident_id, erp_module, title, description, created_at in rows:
+                incident_id = str(incident_id)
+                if incident_id in self._recent:
+                    continue
+                vector = embed(embed_text(title, description), self.dim)
+                with self._lock:
+                    self._add(incident_id, _value(erp_module), vector, created_at)
+                added += 1
+        with self._lock:
+            if self._watermark is not None:
+                cutoff = self._watermark[0] - self.lookback
+                self._recent = {i: c for i, c in self._recent.items() if c >= cutoff}
+        self._ready = True
+        if added:
+            logger.info(
+                "similarity_index_synced",
+                extra={"event": "similarity_index_synced", "added": added, "size": self.size()},
+            )
+        return added
+
+    def _add(
+        self, incident_id: str, erp_module: str, vector: np.ndarray, created_at: datetime
+    ) -> None:
+        module = self._modules.get(erp_module)
+        if module is None:
+            module = self._modules[erp_module] = _ModuleIndex(self.dim)
+        module.add(incident_id, vector)
+        key = (created_at, incident_id)
+        if self._watermark is None or key > self._watermark:
+            self._watermark = key
+        self._recent[incident_id] = created_at
+
+    def size(self) -> int:
+        return sum(len(m) for m in self._modules.values())
+
+    def snapshot(self) -> dict:
+        """Current state, suitable for a metrics endpoint."""
+        with self._lock:
+            return {
+                "ready": self._ready,
+                "dim": self.dim,
+                "size": self.size(),
+                "by_erp_module": {name: len(m) for name, m in self._modules.items()},
+                "memory_mapped": sum(
+                    len(m.base_ids) for m in self._modules.values()
+                    if isinstance(m.base_vectors, np.memmap)
+                ),
+                "watermark": self._watermark[0].isoformat() if self._watermark else None,
+            }
+
+    def load(self) -> bool:
+        """
+        Memory-map the saved index version named by CURRENT; returns False
+        (and changes nothing) if it is missing or inconsistent.
+        """
+        try:
+            version = self.path / (self.path / _CURRENT_FILE).read_text().strip()
+            meta = json.loads((version / _META_FILE).read_text())
+        except (OSError, ValueError):
+            return False
+        if meta.get("dim") != self.dim:
+            logger.warning(
+                "similarity_index_dim_mismatch",
+                extra={"event": "similarity_index_dim_mismatch", "saved_dim": meta.get("dim")},
+            )
+            return False
+        modules = {}
+        for name in meta.get("modules", []):
+            try:
+                vectors = np.load(version / f"{name}.vectors.npy", mmap_mode="r")
+                ids = np.load(version / f"{name}.ids.npy", mmap_mode="r")
+            except (OSError, ValueError):
+                return False
+            if vectors.shape != (len(ids), self.dim):
+                return False
+            modules[name] = _ModuleIndex(self.dim, vectors, ids)
+        with self._lock:
+            self._modules = modules
+            created_at, incident_id = meta["watermark"] or (None, None)
+            if created_at is not None:
+                self._watermark = (datetime.fromisoformat(created_at), incident_id)
+            self._recent = {
+                i: datetime.fromisoformat(c) for i, c in meta.get("recent", {}).items()
+            }
+        # The saved index covers the archive; afterwards only live rows are read.
+        self._ready = True
+        return True
+
+    def save(self, path: str | None = None) -> None:
+        """
+        Write the index to `path` (default: the one it was loaded from) as
+        `.npy` files that `load` can memory-map.
+
+        Each save writes a new version directory and then switches the
+        CURRENT pointer to it with one rename, so readers see either the old
+        index or the new one, never a mix. Older versions beyond
+        `_KEEP_VERSIONS` are removed; workers that mapped them keep their
+        mappings.
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("SIMILARITY_INDEX_DIR is not set")
+        target.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            arrays = {name: m.arrays() for name, m in self._modules.items()}
+            watermark = self._watermark
+            recent = {i: c.isoformat() for i, c in self._recent.items()}
+        name = f"v{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        version = target / name
+        version.mkdir()
+        for module, (vectors, ids) in arrays.items():
+            np.save(version / f"{module}.vectors.npy", vectors)
+            np.save(version / f"{module}.ids.npy", ids)
+        meta = {
+            "dim": self.dim,
+            "modules": sorted(arrays),
+            "watermark": [watermark[0].isoformat(), watermark[1]] if watermark else None,
+            "recent": recent,
+        }
+        (version / _META_FILE).write_text(json.dumps(meta))
+        tmp = target / f".{_CURRENT_FILE}.tmp"
+        tmp.write_text(name)
+        os.replace(tmp, target / _CURRENT_FILE)
+        self._prune_versions(target, keep=name)
+
+    @staticmethod
+    def _prune_versions(target: Path, keep: str) -> None:
+        others = sorted(
+            p for p in target.iterdir()
+            if p.is_dir() and p.name.startswith("v") and p.name != keep
+        )
+        for old in others[: max(0, len(others) - (_KEEP_VERSIONS - 1))]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+@lru_cache
+def get_similarity_index() -> SimilarityIndex | None:
+    """Build the process-wide index from the SIMILARITY_* settings, if enabled."""
+    if not settings.similarity_index_enabled:
+        return None
+    return SimilarityIndex(
+        dim=settings.SIMILARITY_DIM,
+        path=settings.SIMILARITY_INDEX_DIR,
+        refresh_interval_s=settings.SIMILARITY_REFRESH_INTERVAL_S,
+        lookback_s=settings.SIMILARITY_SYNC_LOOKBACK_S,
+    )
+
+
+def _aware(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC, like the rest of the service."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _value(member) -> str:
+    return getattr(member, "value", member)
@@ -0,0 +1,202 @@
+"""In-process SLA escalation scheduler (one leader across all workers)."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.db.session import get_engine
+from app.services.incident_service import IncidentService
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock key held by the leading scheduler ("SLA" in ASCII).
+_LEADER_LOCK_ID = 0x534C41
+
+
+class SlaEscalationScheduler:
+    """
+    Escalates OPEN incidents the moment their SLA deadline passes.
+
+    Every worker starts one, but only the worker holding a session-level
+    Postgres advisory lock does any work; the others retry the lock every
+    `leader_retry_s` and take over if the leader's connection goes away.
+
+    The leader keeps a heap of deadlines due within the next
+    `refresh_interval_s` (read from the partial `idx_incidents_sla_due`
+    index), sleeps until the earliest one, then escalates everything overdue
+    in one indexed UPDATE. Work per wake-up is proportional to the number of
+    due incidents, never to the size of the incidents table.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_interval_s: float,
+        leader_retry_s: float,
+        batch_size: int,
+        incident_service: IncidentService | None = None,
+    ) -> None:
+        self.refresh_interval_s = refresh_interval_s
+        self.leader_retry_s = leader_retry_s
+        self.batch_size = batch_size
+        self.incident_service = incident_service or IncidentService()
+        self.is_leader = False
+        self.escalated_total = 0
+        self._heap: list[tuple[float, str]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the scheduler thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sla-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread, releasing leadership."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def snapshot(self) -> dict:
+        """Current state, suitable for a metrics endpoint."""
+        heap = self._heap
+        next_due = (
+            datetime.fromtimestamp(heap[0][0], timezone.utc).isoformat()
+            if heap
+            else None
+        )
+        return {
+            "leader": self.is_leader,
+            "tracked": len(heap),
+            "next_due_at": next_due,
+            "escalated_total": self.escalated_total,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._try_lead()
+                if conn is not None:
+                    self._lead(conn)
+            except DBAPIError as exc:
+                logger.warning(
+                    "sla_scheduler_error",
+                    extra={"event": "sla_scheduler_error", "error": str(exc.orig)},
+                )
+            except Exception:
+                # Anything else (pool timeouts, bugs) must not end the thread
+                # for good; log it and retry like a lost connection.
+                logger.exception(
+                    "sla_scheduler_error", extra={"event": "sla_scheduler_error"}
+                )
+            finally:
+                if conn is not None:
+                    self._step_down(conn)
+            self._stop.wait(self.leader_retry_s)
+
+    def _try_lead(self) -> Connection | None:
+        """Return a connection holding the leader lock, or `None`."""
+        conn = get_engine().connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _LEADER_LOCK_ID}
+            ).scalar_one()
+        except DBAPIError:
+            conn.invalidate()
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return None
+        self.is_leader = True
+        logger.info("sla_scheduler_leader", extra={"event": "sla_scheduler_leader"})
+        return conn
+
+    def _step_down(self, conn: Connection) -> None:
+        self.is_leader = False
+        self._heap = []
+        # Session-level locks survive a return to the pool; drop the connection
+        # so the lock is released even if the unlock cannot be sent.
+        conn.invalidate()
+        conn.close()
+
+    def _lead(self, conn: Connection) -> None:
+        next_refresh = 0.0
+        while not self._stop.is_set():
+            now = time.time()
+            if now >= next_refresh:
+                # Also proves the lock-holding session is still alive.
+                conn.execute(text("SELECT 1"))
+                next_refresh = now + self.refresh_interval_s
+                self._heap = self._load(until=next_refresh)
+                if len(self._heap) >= self.batch_size:
+                    # Truncated window: reload once the loaded part is due.
+                    next_refresh = min(next_refresh, max(d for d, _ in self._heap))
+
+            heap = self._heap
+            if heap and heap[0][0] <= now:
+                self._escalate()
+                while heap and heap[0][0] <= time.time():
+                    heapq.heappop(heap)
+                continue
+
+            wake_at = min(heap[0][0], next_refresh) if heap else next_refresh
+            self._stop.wait(max(0.0, wake_at - time.time()))
+
+    def _load(self, until: float) -> list[tuple[float, str]]:
+        until_dt = datetime.fromtimestamp(until, timezone.utc)
+        rows = self.incident_service.upcoming_sla_deadlines(
+            until=until_dt, limit=self.batch_size
+        )
+        heap = [(_epoch(due_at), incident_id) for due_at, incident_id in rows]
+        heapq.heapify(heap)
+        return heap
+
+    def _escalate(self) -> None:
+        while True:
+            escalated = self.incident_service.escalate_overdue_incidents(
+                limit=self.batch_size
+            )
+            now = datetime.now(timezone.utc)
+            for row in escalated:
+                due_at = _aware(row["sla_due_at"])
+                logger.warning(
+                    "incident_sla_breached",
+                    extra={
+                        "event": "incident_sla_breached",
+                        "incident_id": row["id"],
+                        "severity": row["severity"],
+                        "environment": row["environment"],
+                        "erp_module": row["erp_module"],
+                        "sla_due_at": due_at.isoformat(),
+                        "overdue_s": round((now - due_at).total_seconds(), 3),
+                    },
+                )
+            self.escalated_total += len(escalated)
+            if len(escalated) < self.batch_size:
+                return
+
+
+def _aware(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC, like the rest of the service."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _epoch(value: datetime) -> float:
+    return _aware(value).timestamp()
@@ -0,0 +1 @@
+"""Standalone performance benchmarks for the backend (not run in CI)."""
@@ -0,0 +1,175 @@
+"""Synthetic incident generator for benchmarks and load tests.
+
+`generate_payloads` yields `POST /incidents` bodies covering every ERP module
+and environment, with descriptions worded so the rule-based enrichment lands
+in every category and severity. Run as a script, it bulk-loads generated
+incidents straight into the database (bypassing the API and the LLM) and
+rebuilds the stats rollup so the tree stays consistent.
+
+Needs a PostgreSQL database with the schema from db/init (or migrations up to
+07_incident_sla_due.sql). Uses DATABASE_URL by default.
+
+Usage (from `backend/`):
+    python -m benchmarks.datagen --rows 100000 --days 180
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from psycopg2.extras import execute_values
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.ids import uuid7
+from app.repositories.incident_stats_repository import IncidentStatsRepository
+from app.schemas.incident import (
+    Category,
+    Environment,
+    ERPModule,
+    IncidentCreateRequest,
+    IncidentStatus,
+)
+from app.services.enrichment_service import EnrichmentService
+from app.services.incident_service import sla_deadline
+
+# Description fragments that steer the rule-based category detection.
+_CATEGORY_PHRASES = {
+    Category.SECURITY: ["users lost access to", "permission denied when opening"],
+    Category.INTEGRATION: ["the bank interface rejected", "integration job stopped for"],
+    Category.DATA: ["duplicate records appeared in", "data mismatch found in"],
+    Category.CONFIGURATION: ["a config change broke", "setup of the new rule for"],
+    Category.UNKNOWN: ["users see odd totals in", "something is off with"],
+}
+# Severity hints: P1 words, P2 words, or neither (P3 outside PROD).
+_SEVERITY_PHRASES = [
+    "The job failed with an error.",
+    "Processing is stuck since this morning.",
+    "Screens are slow and the batch has a delay.",
+    "Noticed during routine review.",
+]
+_OBJECTS = {
+    ERPModule.AP: ["vendor invoices", "payment runs", "supplier accounts"],
+    ERPModule.AR: ["customer receipts", "dunning letters", "credit memos"],
+    ERPModule.GL: ["journal imports", "period close", "ledger balances"],
+    ERPModule.INVENTORY: ["stock transfers", "goods receipts", "cycle counts"],
+    ERPModule.HR: ["employee onboarding", "org assignments", "leave requests"],
+    ERPModule.PAYROLL: ["payroll posting", "tax withholding", "payslip generation"],
+}
+_BUSINESS_UNITS = ["Finance", "Operations", "HR Shared Services", "Retail", "Logistics"]
+
+
+def generate_payloads(count: int, seed: int = 7) -> Iterator[IncidentCreateRequest]:
+    """
+    Yield `count` incident submissions.
+
+    Module, environment and category cycle together so even small samples
+    cover every combination; everything else is drawn from a seeded RNG.
+    """
+    rng = random.Random(seed)
+    combos = itertools.cycle(
+        itertools.product(list(ERPModule), list(Environment), list(Category))
+    )
+    for i in range(count):
+        module, environment, category = next(combos)
+        subject = rng.choice(_OBJECTS[module])
+        description = (
+            f"{rng.choice(_CATEGORY_PHRASES[category]).capitalize()} {subject}. "
+            f"{rng.choice(_SEVERITY_PHRASES)} Reference #{rng.randint(1000, 99999)}."
+        )
+        yield IncidentCreateRequest(
+            title=f"{module.value} {subject} issue #{i}",
+            description=description,
+            erp_module=module,
+            environment=environment,
+            business_unit=rng.choice(_BUSINESS_UNITS),
+        )
+
+
+def _rows(count: int, days: int, seed: int) -> Iterator[tuple]:
+    rng = random.Random(seed)
+    enrichment = EnrichmentService()
+    now = datetime.now(timezone.utc)
+    statuses = list(IncidentStatus)
+    for payload in generate_payloads(count, seed):
+        created = now - timedelta(seconds=rng.randint(0, days * 86400))
+        severity = enrichment._determine_severity(payload)
+        category = enrichment._determine_category(payload)
+        status = rng.choice(statuses)
+        due_at = sla_deadline(severity, payload.environment, created)
+        # Treat OPEN incidents already past their SLA as escalated on time.
+        escalated_at = due_at if status is IncidentStatus.OPEN and due_at < now else None
+        yield (
+            str(uuid7()),
+            payload.title,
+            payload.description,
+            payload.erp_module.value,
+            payload.environment.value,
+            payload.business_unit,
+            severity.value,
+            category.value,
+            f"Issue in {payload.erp_module.value} affecting {payload.business_unit}.",
+            "Review recent changes and validate system logs.",
+            status.value,
+            due_at,
+            escalated_at,
+            created,
+            created,
+        )
+
+
+def seed_database(dsn: str, rows: int, days: int, seed: int, batch: int) -> None:
+    """Bulk-insert `rows` synthetic incidents and rebuild the stats rollup."""
+    engine = create_engine(dsn)
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            oldest = datetime.now(timezone.utc) - timedelta(days=days)
+            cur.execute("SELECT ensure_incident_partitions(%s::date)", (oldest,))
+            generated = _rows(rows, days, seed)
+            while True:
+                chunk = list(itertools.islice(generated, batch))
+                if not chunk:
+                    break
+                execute_values(
+                    cur,
+                    "INSERT INTO incidents (id, title, description, erp_module, "
+                    "environment, business_unit, severity, category, auto_summary, "
+                    "suggested_action, status, sla_due_at, escalated_at, "
+                    "created_at, updated_at) VALUES %s",
+                    chunk,
+                    page_size=batch,
+                )
+                conn.commit()
+            cur.execute("ANALYZE incidents")
+        conn.commit()
+    finally:
+        conn.close()
+
+    with Session(engine) as db:
+        IncidentStatsRepository(db).rebuild()
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=180, help="spread of created_at")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed_database(args.dsn, args.rows, args.days, args.seed, args.batch)
+    print(f"seeded {args.rows} incidents in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
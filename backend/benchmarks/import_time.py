@@ -0,0 +1,94 @@
+"""Report (and optionally cap) the import time of the API entrypoint.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters, keeps
+the fastest run, and prints the total plus the heaviest modules. With
+`--max-ms` it exits non-zero when the total exceeds the budget, so it can be
+used as a startup-time gate in CI.
+
+Usage (from `backend/`):
+    python -m benchmarks.import_time --runs 3 --top 15 --max-ms 800
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def run_importtime(module: str) -> list[ImportRecord]:
+    """Import `module` in a fresh interpreter and parse the importtime report."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records: list[ImportRecord] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        # Nesting is shown as two extra spaces per level after the separator.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(
+            ImportRecord(
+                module=name.strip(),
+                depth=depth,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    best: list[ImportRecord] | None = None
+    best_total = float("inf")
+    for _ in range(args.runs):
+        records = run_importtime(args.module)
+        total = next(r.cumulative_us for r in records if r.module == args.module)
+        if total < best_total:
+            best, best_total = records, total
+
+    assert best is not None
+    print(f"import {args.module}: {best_total / 1000:.1f} ms (best of {args.runs})")
+
+    print("\nHeaviest top-level imports (cumulative):")
+    top_level = [r for r in best if r.depth <= 1 and r.module != args.module]
+    for r in sorted(top_level, key=lambda r: r.cumulative_us, reverse=True)[: args.top]:
+        print(f"  {r.cumulative_us / 1000:8.1f} ms  {r.module}")
+
+    print("\nHeaviest modules (self):")
+    for r in sorted(best, key=lambda r: r.self_us, reverse=True)[: args.top]:
+        print(f"  {r.self_us / 1000:8.1f} ms  {r.module}")
+
+    if args.max_ms is not None and best_total / 1000 > args.max_ms:
+        raise SystemExit(
+            f"import of {args.module} took {best_total / 1000:.1f} ms, "
+            f"over the {args.max_ms:.0f} ms budget"
+        )
+
+
+if __name__ == "__main__":
+    main()
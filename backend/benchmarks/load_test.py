@@ -0,0 +1,390 @@
+"""HTTP load test for the incidents API with a stubbed LLM and baseline check.
+
+Starts the local OpenAI stub (see `benchmarks.openai_stub`) and, unless
+`--base-url` points at an already running server, the API itself under
+uvicorn wired to the stub. Concurrent clients then loop over a weighted mix of
+create, list, detail and status-update requests for `--duration` seconds
+(after `--warmup`). Status updates only request moves `STATUS_TRANSITIONS`
+allows from the last status a client saw, so 409s stay rare. Reports throughput and p50/p95/p99 latency per endpoint,
+optionally writes the results as JSON, and compares them with a stored
+baseline: exits with status 1 when p95 latency or throughput regresses by more
+than `--tolerance`, or the error rate rises by more than one point.
+
+Needs a PostgreSQL database with the current schema; optionally pre-load it
+with `--seed-rows` (see `benchmarks.datagen`). Uses DATABASE_URL by default.
+
+Usage (from `backend/`):
+    python -m benchmarks.load_test --clients 16 --duration 30
+    python -m benchmarks.load_test --write-baseline   # refresh the baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from app.core.config import settings
+from app.schemas.incident import IncidentStatus
+from app.services.incident_service import STATUS_TRANSITIONS
+from benchmarks.datagen import generate_payloads, seed_database
+from benchmarks.openai_stub import StubConfig, start_stub
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "load_test.json"
+
+ENDPOINTS = {
+    "create": "POST /incidents",
+    "list": "GET /incidents",
+    "detail": "GET /incidents/{id}",
+    "status": "PATCH /incidents/{id}/status",
+}
+
+_SEVERITIES = ["P1", "P2", "P3"]
+_MODULES = ["AP", "AR", "GL", "INVENTORY", "HR", "PAYROLL"]
+_STATUSES = ["OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED"]
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown flow: {name}")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Thread-safe latency and error collection per endpoint."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.recording = False
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, latency_ms: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        with self._lock:
+            self.latencies[endpoint].append(latency_ms)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def summary(self, elapsed_s: float) -> dict:
+        endpoints = {}
+        for name in ENDPOINTS.values():
+            values = sorted(self.latencies.get(name, []))
+            if not values:
+                continue
+            endpoints[name] = {
+                "count": len(values),
+                "errors": self.errors.get(name, 0),
+                "rps": round(len(values) / elapsed_s, 2),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+        total = sum(e["count"] for e in endpoints.values())
+        return {"total_rps": round(total / elapsed_s, 2), "endpoints": endpoints}
+
+
+class Client(threading.Thread):
+    """One virtual user looping over the weighted request mix."""
+
+    def __init__(
+        self, base_url, mix, recorder, ids, statuses, ids_lock, payloads, stop, seed
+    ):
+        super().__init__(daemon=True)
+        self.http = httpx.Client(base_url=base_url, timeout=60.0)
+        self.flows = list(mix)
+        self.weights = [mix[f] for f in self.flows]
+        self.recorder = recorder
+        self.ids = ids
+        self.statuses = statuses
+        self.ids_lock = ids_lock
+        self.payloads = payloads
+        self.stop_event = stop
+        self.rng = random.Random(seed)
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            flow = self.rng.choices(self.flows, self.weights)[0]
+            incident_id, incident_status = self._pick_id()
+            if flow in ("detail", "status") and incident_id is None:
+                flow = "create"
+            start = time.perf_counter()
+            try:
+                response = self._request(flow, incident_id, incident_status)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                response, ok = None, False
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            self.recorder.add(ENDPOINTS[flow], latency_ms, ok)
+            if ok and flow == "list":
+                items = response.json()
+                self._remember(self.rng.sample(items, min(5, len(items))))
+            elif ok:
+                self._remember([response.json()])
+        self.http.close()
+
+    def _request(
+        self, flow: str, incident_id: str | None, incident_status: str | None
+    ) -> httpx.Response:
+        if flow == "create":
+            with self.ids_lock:
+                payload = next(self.payloads)
+            return self.http.post("/api/v1/incidents", json=payload.model_dump(mode="json"))
+        if flow == "list":
+            return self.http.get(
+                "/api/v1/incidents",
+                params={
+                    "severity": self.rng.choice(_SEVERITIES),
+                    "erp_module": self.rng.choice(_MODULES),
+                    "status": self.rng.choice(_STATUSES),
+                },
+            )
+        if flow == "detail":
+            return self.http.get(f"/api/v1/incidents/{incident_id}")
+        allowed = sorted(STATUS_TRANSITIONS[IncidentStatus(incident_status)])
+        return self.http.patch(
+            f"/api/v1/incidents/{incident_id}/status",
+            json={"status": self.rng.choice(allowed).value},
+        )
+
+    def _pick_id(self) -> tuple[str | None, str | None]:
+        with self.ids_lock:
+            if not self.ids:
+                return None, None
+            incident_id = self.rng.choice(self.ids)
+            return incident_id, self.statuses[incident_id]
+
+    def _remember(self, incidents: list[dict]) -> None:
+        """Track incidents and their last seen status; CLOSED ones are dropped."""
+        with self.ids_lock:
+            for incident in incidents:
+                incident_id, status = incident["id"], incident["status"]
+                if not STATUS_TRANSITIONS[IncidentStatus(status)]:
+                    if self.statuses.pop(incident_id, None) is not None:
+                        self.ids.remove(incident_id)
+                    continue
+                if incident_id not in self.statuses:
+                    self.ids.append(incident_id)
+                self.statuses[incident_id] = status
+            for incident_id in self.ids[:-5000]:
+                del self.statuses[incident_id]
+            del self.ids[:-5000]
+
+
+def start_server(args, stub_url: str) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": args.dsn,
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": stub_url,
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/v1/health", timeout=1.0).status_code == 200:
+                return server, base_url
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise SystemExit("API server exited during startup")
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("API server did not become healthy within 30s")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regressions of `results` against `baseline`."""
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.1f} ms vs baseline {base['p95_ms']:.1f} ms"
+            )
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['rps']:.1f} req/s vs baseline {base['rps']:.1f} req/s"
+            )
+        error_rate = current["errors"] / current["count"]
+        base_error_rate = base["errors"] / base["count"]
+        if error_rate > base_error_rate + 0.01:
+            regressions.append(
+                f"{name}: error rate {error_rate:.1%} vs baseline {base_error_rate:.1%}"
+            )
+    return regressions
+
+
+def print_report(results: dict, baseline: dict | None) -> None:
+    base_endpoints = (baseline or {}).get("endpoints", {})
+    print(
+        f"{'endpoint':<30} {'count':>7} {'err':>5} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'p95 vs base':>12}"
+    )
+    for name, row in results["endpoints"].items():
+        base = base_endpoints.get(name)
+        delta = (
+            f"{(row['p95_ms'] / base['p95_ms'] - 1) * 100:+11.0f}%"
+            if base and base["p95_ms"]
+            else f"{'-':>12}"
+        )
+        print(
+            f"{name:<30} {row['count']:>7} {row['errors']:>5} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {delta}"
+        )
+    print(f"total: {results['total_rps']:.1f} req/s")
+    if "llm_calls" in results:
+        print(f"LLM stub calls: {results['llm_calls']} ({results['llm_errors']} failed)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=settings.DATABASE_URL)
+    parser.add_argument("--base-url", help="target a running server instead")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=_parse_mix("create=20,list=30,detail=35,status=15"),
+    )
+    parser.add_argument("--stub-latency-ms", type=float, default=300.0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed-rows", type=int, default=0, help="pre-load N incidents")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.seed_rows:
+        seed_database(args.dsn, args.seed_rows, days=180, seed=args.seed, batch=5000)
+
+    stub_config = StubConfig(
+        args.stub_latency_ms, args.stub_jitter_ms, args.stub_error_rate, args.seed
+    )
+    stub = start_stub(stub_config)
+    stub_url = "http://127.0.0.1:%d/v1" % stub.server_address[1]
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server, base_url = start_server(args, stub_url)
+
+    recorder = Recorder()
+    stop = threading.Event()
+    ids: list[str] = []
+    statuses: dict[str, str] = {}
+    ids_lock = threading.Lock()
+    payloads = generate_payloads(10**9, seed=args.seed)
+    clients = [
+        Client(
+            base_url, args.mix, recorder, ids, statuses, ids_lock, payloads, stop,
+            args.seed + i,
+        )
+        for i in range(args.clients)
+    ]
+    try:
+        for client in clients:
+            client.start()
+        time.sleep(args.warmup)
+        calls_before = (stub_config.requests, stub_config.errors)
+        recorder.recording = True
+        started = time.perf_counter()
+        time.sleep(args.duration)
+        recorder.recording = False
+        elapsed = time.perf_counter() - started
+        stop.set()
+        for client in clients:
+            client.join()
+    finally:
+        stop.set()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        stub.shutdown()
+
+    results = recorder.summary(elapsed)
+    results["llm_calls"] = stub_config.requests - calls_before[0]
+    results["llm_errors"] = stub_config.errors - calls_before[1]
+    results["config"] = {
+        "clients": args.clients,
+        "workers": args.workers,
+        "duration_s": args.duration,
+        "mix": args.mix,
+        "stub_latency_ms": args.stub_latency_ms,
+        "stub_jitter_ms": args.stub_jitter_ms,
+        "stub_error_rate": args.stub_error_rate,
+    }
+
+    baseline = None
+    if args.baseline.exists() and not args.write_baseline:
+        baseline = json.loads(args.baseline.read_text())
+    print_report(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.write_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        return 0
+    if baseline.get("config") != results["config"]:
+        print("note: run configuration differs from the baseline's")
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Local stand-in for the OpenAI Responses API used by `EnrichmentService`.
+
+Answers `POST /v1/responses` with a structured-output response that satisfies
+the request's JSON schema (`incident_enrichment`), after a configurable
+latency, and fails a configurable fraction of calls with HTTP 500 so retry and
+fallback paths get exercised. `GET /stats` returns call counters.
+
+Point the API at it with:
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+
+Usage (from `backend/`):
+    python -m benchmarks.openai_stub --port 8765 --latency-ms 800 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConfig:
+    """Tunable behaviour; attributes may be changed while the server runs."""
+
+    def __init__(
+        self,
+        latency_ms: float = 500.0,
+        jitter_ms: float = 100.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def next_call(self) -> tuple[float, bool]:
+        """Return `(delay_s, fail)` for the next request and count it."""
+        with self.lock:
+            self.requests += 1
+            delay_ms = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms))
+            fail = self.rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return delay_ms / 1000.0, fail
+
+
+def _enrichment_output(request: dict, rng: random.Random) -> str:
+    """Build JSON text matching the request's structured-output schema."""
+    schema = request.get("text", {}).get("format", {}).get("schema", {})
+    categories = (
+        schema.get("properties", {}).get("category", {}).get("enum") or ["UNKNOWN"]
+    )
+    return json.dumps(
+        {
+            "category": rng.choice(categories),
+            "auto_summary": "Stubbed summary: the reported job failed for one business unit.",
+            "suggested_action": "Check the job log and re-run the failed step.",
+        }
+    )
+
+
+def _response_body(request: dict, output_text: str) -> dict:
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": request.get("model", "stub"),
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{uuid.uuid4().hex}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [
+                    {"type": "output_text", "text": output_text, "annotations": []}
+                ],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": len(request.get("input", "")) // 4,
+            "output_tokens": len(output_text) // 4,
+            "total_tokens": (len(request.get("input", "")) + len(output_text)) // 4,
+        },
+    }
+
+
+def make_handler(config: StubConfig) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            if self.path.rstrip("/") != "/v1/responses":
+                self._send(404, {"error": {"message": "not found"}})
+                return
+            try:
+                request = json.loads(raw or b"{}")
+            except ValueError:
+                self._send(400, {"error": {"message": "invalid JSON"}})
+                return
+
+            delay_s, fail = config.next_call()
+            time.sleep(delay_s)
+            if fail:
+                self._send(
+                    500, {"error": {"message": "stub failure", "type": "server_error"}}
+                )
+                return
+            with config.lock:
+                output_text = _enrichment_output(request, config.rng)
+            self._send(200, _response_body(request, output_text))
+
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.rstrip("/") != "/stats":
+                self._send(404, {"error": {"message": "not found"}})
+                return
+            with config.lock:
+                stats = {"requests": config.requests, "errors": config.errors}
+            self._send(200, stats)
+
+        def _send(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            pass
+
+    return Handler
+
+
+def start_stub(
+    config: StubConfig, host: str = "127.0.0.1", port: int = 0
+) -> ThreadingHTTPServer:
+    """Serve the stub from a daemon thread; `server.server_address` has the port."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="openai-stub", daemon=True
+    ).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    print(f"OpenAI stub listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
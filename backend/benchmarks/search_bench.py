@@ -0,0 +1,122 @@
+"""Latency benchmark for full-text incident search.
+
+Creates a scratch schema with a copy of `incidents` (same generated
+`search_vector` / `search_pairs` columns and indexes), fills it with `--rows`
+synthetic incidents, and times `IncidentRepository.search` for a set of queries with and
+without filters. The repository code runs unchanged: the session's
+`search_path` points at the scratch schema first.
+
+Needs a PostgreSQL database with the schema from db/init (or migrations up to
+10_incident_search_indexes.sql). Uses DATABASE_URL by default.
+
+Usage (from `backend/`):
+    python -m benchmarks.search_bench --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.incident_repository import IncidentRepository
+
+SCHEMA = "bench_search"
+
+SEED_SQL = """
+WITH words AS (
+  SELECT ARRAY['payroll','posting','invoice','journal','ledger','vendor','batch',
+               'import','timeout','approval','tax','period','close','reconciliation',
+               'interface','mapping','duplicate','missing','locked','permission',
+               'currency','rounding','accrual','receipt','shipment','stock']::text[] AS w
+)
+INSERT INTO {schema}.incidents
+  (id, title, description, erp_module, environment, business_unit, severity,
+   category, auto_summary, suggested_action, status, created_at, updated_at)
+SELECT gen_random_uuid(),
+       initcap(w[1 + floor(random() * 26)::int] || ' ' || w[1 + floor(random() * 26)::int] || ' failure'),
+       'Users report that the ' || w[1 + floor(random() * 26)::int] || ' ' || w[1 + floor(random() * 26)::int]
+         || ' step failed with error ' || (g % 997) || '. '
+         || repeat(w[1 + floor(random() * 26)::int] || ' ', 1 + g % 5),
+       (ARRAY['AP','AR','GL','INVENTORY','HR','PAYROLL'])[1 + g % 6]::erp_module,
+       (ARRAY['PROD','TEST'])[1 + g % 2]::environment_type,
+       'BU-' || (g % 50),
+       (ARRAY['P1','P2','P3'])[1 + g % 3]::incident_severity,
+       'UNKNOWN'::incident_category,
+       'The ' || w[1 + floor(random() * 26)::int] || ' job could not complete.',
+       'Check the ' || w[1 + floor(random() * 26)::int] || ' configuration.',
+       (ARRAY['OPEN','IN_PROGRESS','RESOLVED','CLOSED'])[1 + g % 4]::incident_status,
+       now() - interval '1 minute' * g,
+       now() - interval '1 minute' * g
+FROM generate_series(1, :rows) AS g, words
+"""
+
+QUERIES = [
+    ("single term", {"q": "payroll"}),
+    ("two terms", {"q": "payroll posting"}),
+    ("phrase", {"q": '"journal import"'}),
+    ("rare term", {"q": "reconciliation rounding accrual"}),
+    ("with filters", {"q": "vendor", "severity": "P1", "status": "OPEN"}),
+    ("module filter", {"q": "invoice timeout", "erp_module": "AP"}),
+]
+
+
+def seed(engine, rows: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.incidents "
+                "(LIKE public.incidents INCLUDING ALL)"
+            )
+        )
+        conn.execute(text(SEED_SQL.format(schema=SCHEMA)), {"rows": rows})
+        conn.execute(text(f"ANALYZE {SCHEMA}.incidents"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="keep scratch schema")
+    args = parser.parse_args()
+
+    engine = create_engine(args.dsn)
+    if not args.skip_seed:
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+    try:
+        with Session(engine) as db:
+            db.execute(text(f"SET search_path TO {SCHEMA}, public"))
+            repo = IncidentRepository(db)
+            print(f"{'query':<14} {'hits':>5} {'p50 ms':>8} {'p95 ms':>8}")
+            for name, params in QUERIES:
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    hits = repo.search(limit=args.limit, **params)
+                    timings.append((time.perf_counter() - start) * 1000.0)
+                timings.sort()
+                p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                print(
+                    f"{name:<14} {len(hits):>5} "
+                    f"{statistics.median(timings):>8.1f} {p95:>8.1f}"
+                )
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
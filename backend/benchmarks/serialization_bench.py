@@ -0,0 +1,117 @@
+"""Compare the default FastAPI response path with the fast record serializer.
+
+Builds N synthetic incidents in memory (no database needed), renders them
+through FastAPI's `response_model` validation + JSONResponse and through
+`incident_record_list_adapter`, checks the bytes are identical, and reports
+CPU time for each path.
+
+Usage (from `backend/`):
+    python -m benchmarks.serialization_bench --rows 10000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.incident import IncidentModel
+from app.schemas.incident import (
+    INCIDENT_RECORD_FIELDS,
+    Category,
+    Environment,
+    ERPModule,
+    IncidentResponse,
+    IncidentStatus,
+    Severity,
+    incident_record_list_adapter,
+)
+
+
+def build_incidents(rows: int, seed: int = 7) -> list[IncidentModel]:
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    incidents = []
+    for i in range(rows):
+        created = base + timedelta(seconds=rng.randint(0, 365 * 86400))
+        incidents.append(
+            IncidentModel(
+                id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                title=f"Posting failure #{i} – naïve batch",
+                description="Journal import failed with ERROR 42\n" * rng.randint(1, 5),
+                erp_module=rng.choice(list(ERPModule)).value,
+                environment=rng.choice(list(Environment)).value,
+                business_unit=rng.choice(["Finance", "Ops", "HR Shared Svc"]),
+                severity=rng.choice(list(Severity)).value,
+                category=rng.choice(list(Category)).value,
+                auto_summary=rng.choice([None, "Import job failed on step 3."]),
+                suggested_action=rng.choice([None, "Re-run the import."]),
+                status=rng.choice(list(IncidentStatus)).value,
+                created_at=created,
+                updated_at=created + timedelta(minutes=rng.randint(0, 600)),
+            )
+        )
+    return incidents
+
+
+def default_path(field, incidents: list[IncidentModel]) -> bytes:
+    content = asyncio.run(
+        serialize_response(field=field, response_content=incidents)
+    )
+    return JSONResponse(content).body
+
+
+def fast_path(incidents: list[IncidentModel]) -> tuple[bytes, float]:
+    # Mirrors IncidentRepository.list_records, which yields tuples in this order.
+    rows = [
+        tuple(getattr(incident, name) for name in INCIDENT_RECORD_FIELDS)
+        for incident in incidents
+    ]
+    start = time.process_time()
+    records = [dict(zip(INCIDENT_RECORD_FIELDS, row)) for row in rows]
+    body = incident_record_list_adapter.dump_json(records)
+    return body, time.process_time() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    incidents = build_incidents(args.rows)
+    field = create_model_field(
+        name="Response_list_incidents",
+        type_=List[IncidentResponse],
+        mode="serialization",
+    )
+
+    default_times, fast_times = [], []
+    for _ in range(args.repeat):
+        start = time.process_time()
+        expected = default_path(field, incidents)
+        default_times.append(time.process_time() - start)
+
+        actual, elapsed = fast_path(incidents)
+        fast_times.append(elapsed)
+
+        if actual != expected:
+            raise SystemExit("fast path output differs from the default response")
+
+    best_default, best_fast = min(default_times), min(fast_times)
+    print(f"rows={args.rows} bytes={len(expected)} (outputs identical)")
+    print(f"default response_model path: {best_default * 1000:8.1f} ms CPU")
+    print(f"record serializer path:      {best_fast * 1000:8.1f} ms CPU")
+    print(f"speedup: {best_default / best_fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
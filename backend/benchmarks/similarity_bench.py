@@ -0,0 +1,78 @@
+"""Measure related-incident embedding throughput and top-k query latency.
+
+Embeds N synthetic incidents (see `benchmarks.datagen`; no database needed)
+into a `SimilarityIndex`, saves it, reloads it memory-mapped, and times top-k
+queries against both the in-memory and the memory-mapped copy.
+
+Usage (from `backend/`):
+    python -m benchmarks.similarity_bench --rows 300000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.services.similarity_index import SimilarityIndex
+from benchmarks.datagen import generate_payloads
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, round(pct / 100 * len(ordered)) - 1)]
+
+
+def _time_queries(index: SimilarityIndex, probes: list, k: int) -> list[float]:
+    timings = []
+    for incident_id, module, title, description in probes:
+        start = time.perf_counter()
+        index.related(incident_id, module, title, description, k)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=settings.SIMILARITY_DIM)
+    args = parser.parse_args()
+
+    index = SimilarityIndex(dim=args.dim, path=None, refresh_interval_s=0, lookback_s=0)
+    now = datetime.now(timezone.utc)
+    rng = random.Random(11)
+    probes = []
+    start = time.perf_counter()
+    for i, payload in enumerate(generate_payloads(args.rows)):
+        incident_id = f"{i:036d}"
+        module = payload.erp_module.value
+        index.add(incident_id, module, payload.title, payload.description, now)
+        if len(probes) < args.queries and rng.random() < 0.01:
+            probes.append((incident_id, module, payload.title, payload.description))
+    embed_s = time.perf_counter() - start
+    print(
+        f"embedded {args.rows} incidents (dim={args.dim}) in {embed_s:.1f}s "
+        f"({args.rows / embed_s:,.0f}/s)"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(tmp)
+        mapped = SimilarityIndex(dim=args.dim, path=tmp, refresh_interval_s=0, lookback_s=0)
+        mapped.load()
+
+        for label, target in (("in-memory", index), ("memory-mapped", mapped)):
+            _time_queries(target, probes[:10], args.k)  # warm caches
+            timings = _time_queries(target, probes, args.k)
+            print(
+                f"{label:>14} top-{args.k}: p50 {_percentile(timings, 50):6.2f} ms  "
+                f"p95 {_percentile(timings, 95):6.2f} ms  over {len(timings)} queries"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Insert-throughput benchmark: random (v4) vs time-ordered (v7) primary keys.
+
+For each ID kind, creates a scratch table shaped like `incidents`' key
+(`id UUID PRIMARY KEY, created_at, payload`), preloads it with `--rows` rows,
+then times `--batches` committed batches of `--batch` inserts with IDs
+generated in Python the same way `IncidentService` does. Reports rows/s, WAL
+written, primary-key index size, and index blocks read from disk.
+
+Needs a PostgreSQL database with `uuid_generate_v7()` installed (see
+db/migrations/02_uuidv7_incident_ids.sql). Uses DATABASE_URL by default.
+
+Usage (from `backend/`):
+    python -m benchmarks.uuid_insert_bench --rows 3000000 --batches 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from psycopg2.extras import execute_values
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.ids import uuid7
+
+PRELOAD_SQL = {
+    "v4": "gen_random_uuid()",
+    # Spread preloaded IDs over the past, one per millisecond, so new v7 IDs
+    # land after them exactly as they would on a live table.
+    "v7": "uuid_generate_v7(now() - interval '1 ms' * (%(rows)s - g))",
+}
+
+GENERATORS = {"v4": uuid.uuid4, "v7": uuid7}
+
+
+def _scalar(cur, sql: str, params=None):
+    cur.execute(sql, params)
+    return cur.fetchone()[0]
+
+
+def run_kind(conn, kind: str, args) -> dict:
+    table = f"bench_incident_ids_{kind}"
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+        cur.execute(
+            f"""
+            CREATE TABLE {table} (
+              id UUID PRIMARY KEY,
+              created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+              payload TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            f"""
+            INSERT INTO {table} (id, payload)
+            SELECT {PRELOAD_SQL[kind]}, repeat('x', 200)
+            FROM generate_series(1, %(rows)s) AS g
+            """,
+            {"rows": args.rows},
+        )
+        cur.execute(f"ANALYZE {table}")
+        conn.commit()
+        cur.execute("SELECT pg_stat_clear_snapshot()")
+        index = f"{table}_pkey"
+        blks_before = _scalar(
+            cur,
+            "SELECT coalesce(idx_blks_read, 0) FROM pg_statio_user_indexes "
+            "WHERE indexrelname = %s",
+            (index,),
+        )
+        lsn_before = _scalar(cur, "SELECT pg_current_wal_lsn()")
+        conn.commit()
+
+        make_id = GENERATORS[kind]
+        payload = "x" * 200
+        start = time.perf_counter()
+        for _ in range(args.batches):
+            execute_values(
+                cur,
+                f"INSERT INTO {table} (id, payload) VALUES %s",
+                [(str(make_id()), payload) for _ in range(args.batch)],
+                page_size=args.batch,
+            )
+            conn.commit()
+        elapsed = time.perf_counter() - start
+
+        # Statistics are flushed asynchronously; give the collector a moment.
+        time.sleep(1.0)
+        cur.execute("SELECT pg_stat_clear_snapshot()")
+        wal_bytes = _scalar(
+            cur, "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", (lsn_before,)
+        )
+        blks_after = _scalar(
+            cur,
+            "SELECT coalesce(idx_blks_read, 0) FROM pg_statio_user_indexes "
+            "WHERE indexrelname = %s",
+            (index,),
+        )
+        index_bytes = _scalar(cur, "SELECT pg_relation_size(%s)", (index,))
+        if not args.keep:
+            cur.execute(f"DROP TABLE {table}")
+        conn.commit()
+
+    inserted = args.batch * args.batches
+    return {
+        "kind": kind,
+        "rows_per_s": inserted / elapsed,
+        "wal_mb": float(wal_bytes) / 1024 / 1024,
+        "index_mb": index_bytes / 1024 / 1024,
+        "index_blks_read": blks_after - blks_before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=3_000_000, help="preloaded rows")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="keep scratch tables")
+    args = parser.parse_args()
+
+    engine = create_engine(args.dsn)
+    conn = engine.raw_connection()
+    try:
+        results = [run_kind(conn, kind, args) for kind in ("v4", "v7")]
+    finally:
+        conn.close()
+
+    print(
+        f"preloaded={args.rows} inserted={args.batch * args.batches} "
+        f"(batches of {args.batch})"
+    )
+    print(f"{'ids':<4} {'rows/s':>10} {'WAL MB':>9} {'pkey MB':>9} {'pkey blks read':>15}")
+    for r in results:
+        print(
+            f"{r['kind']:<4} {r['rows_per_s']:>10.0f} {r['wal_mb']:>9.1f} "
+            f"{r['index_mb']:>9.1f} {r['index_blks_read']:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
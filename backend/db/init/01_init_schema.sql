@@ -1,5 +1,6 @@
 -- Enable extensions
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "btree_gin";
 
 -- =====================
 -- ENUMS
@@ -29,6 +30,37 @@ CREATE TYPE incident_status AS ENUM (
   'CLOSED'
 );
 
+-- =====================
+-- FUNCTIONS
+-- =====================
+-- Time-ordered UUIDv7 (RFC 9562): 48-bit Unix ms timestamp + random bits.
+-- Keeps primary-key inserts append-only instead of scattered across the index.
+CREATE OR REPLACE FUNCTION uuid_generate_v7(ts TIMESTAMPTZ DEFAULT clock_timestamp())
+RETURNS UUID AS $$
+DECLARE
+  unix_ms BIGINT := floor(extract(epoch FROM ts) * 1000);
+  bytes BYTEA := gen_random_bytes(16);
+BEGIN
+  bytes := overlay(bytes PLACING substring(int8send(unix_ms) FROM 3) FROM 1 FOR 6);
+  bytes := set_byte(bytes, 6, (get_byte(bytes, 6) & 15) | 112);  -- version 7
+  bytes := set_byte(bytes, 8, (get_byte(bytes, 8) & 63) | 128);  -- variant
+  RETURN encode(bytes, 'hex')::uuid;
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- Hashes of the adjacent lexeme pairs in a tsvector. A document can only match
+-- a phrase query if it holds every pair of the phrase, so indexing these
+-- narrows phrase searches that the GIN index on the tsvector can't (it doesn't
+-- store word positions). Hash collisions only add candidates; the phrase
+-- itself is still checked against the tsvector.
+CREATE OR REPLACE FUNCTION incident_word_pairs(doc TSVECTOR)
+RETURNS INT[] AS $$
+  SELECT coalesce(array_agg(DISTINCT hashtext(first.lexeme || ' ' || second.lexeme)), '{}')
+  FROM (SELECT lexeme, unnest(positions) AS position FROM unnest(doc)) AS first
+  JOIN (SELECT lexeme, unnest(positions) AS position FROM unnest(doc)) AS second
+    ON second.position = first.position + 1
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
 -- =====================
 -- USERS
 -- =====================
@@ -45,8 +77,10 @@ CREATE TABLE users (
 -- =====================
 -- INCIDENTS
 -- =====================
+-- Range-partitioned by month on created_at (see ensure_incident_partitions
+-- below). The partition key must be part of the primary key.
 CREATE TABLE incidents (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  id UUID NOT NULL DEFAULT uuid_generate_v7(),
 
   title TEXT NOT NULL,
   description TEXT NOT NULL,
@@ -61,11 +95,172 @@ CREATE TABLE incidents (
 
   status incident_status NOT NULL DEFAULT 'OPEN',
 
+  -- SLA deadline for leaving OPEN (from severity and environment), and when
+  -- the SLA scheduler escalated the incident for missing it.
+  sla_due_at TIMESTAMPTZ,
+  escalated_at TIMESTAMPTZ,
+
   created_by_id UUID REFERENCES users(id),
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  -- Full-text search document; weights: title A, AI summary B, description C.
+  search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(auto_summary, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+  ) STORED,
+  -- Adjacent word pairs of the same document, for phrase searches.
+  search_pairs INT[] GENERATED ALWAYS AS (
+    incident_word_pairs(
+      to_tsvector('english', coalesce(title, '')) ||
+      to_tsvector('english', coalesce(auto_summary, '')) ||
+      to_tsvector('english', coalesce(description, ''))
+    )
+  ) STORED,
+
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catches rows outside every monthly partition so inserts never fail.
+CREATE TABLE incidents_default PARTITION OF incidents DEFAULT;
+
+-- Newest-first listing; id (UUIDv7) breaks created_at ties.
+CREATE INDEX idx_incidents_created_at_id ON incidents (created_at, id);
+CREATE INDEX idx_incidents_search_vector ON incidents USING GIN (search_vector);
+-- Module-filtered search: one GIN scan instead of filtering every text match.
+CREATE INDEX idx_incidents_module_search ON incidents USING GIN (erp_module, search_vector);
+CREATE INDEX idx_incidents_search_pairs ON incidents USING GIN (search_pairs);
+-- SLA due-queue: only OPEN, not yet escalated incidents are indexed.
+CREATE INDEX idx_incidents_sla_due ON incidents (sla_due_at)
+  WHERE status = 'OPEN' AND escalated_at IS NULL AND sla_due_at IS NOT NULL;
+
+-- Creates monthly partitions (incidents_yYYYYmMM) from `from_month` through
+-- `months_ahead` months later, and for any month whose rows landed in
+-- incidents_default, moving those rows into the new partition. Idempotent;
+-- run at API startup and by app.jobs.ensure_partitions / archive_incidents.
+CREATE OR REPLACE FUNCTION ensure_incident_partitions(
+  from_month DATE DEFAULT date_trunc('month', now())::date,
+  months_ahead INT DEFAULT 3
+)
+RETURNS INT AS $$
+DECLARE
+  month_start DATE;
+  partition_name TEXT;
+  range_start TIMESTAMPTZ;
+  range_end TIMESTAMPTZ;
+  column_list TEXT;
+  moved BIGINT;
+  created INT := 0;
+BEGIN
+  -- API workers at startup and the cron jobs may all call this at once.
+  PERFORM pg_advisory_xact_lock(hashtext('ensure_incident_partitions'));
+
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+    INTO column_list
+    FROM pg_attribute
+    WHERE attrelid = 'incidents'::regclass
+      AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+
+  -- The requested months, plus any month whose rows already fell into the
+  -- default partition (e.g. the jobs did not run for a while).
+  FOR month_start IN
+    SELECT generate_series(
+             date_trunc('month', from_month),
+             date_trunc('month', now()) + make_interval(months => months_ahead),
+             interval '1 month'
+           )::date
+    UNION
+    SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+    FROM incidents_default
+    ORDER BY 1
+  LOOP
+    partition_name := format('incidents_y%sm%s',
+                             to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+    range_start := month_start::timestamp AT TIME ZONE 'UTC';
+    range_end := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+    IF to_regclass(partition_name) IS NULL THEN
+      IF EXISTS (SELECT 1 FROM incidents_default
+                 WHERE created_at >= range_start AND created_at < range_end) THEN
+        -- CREATE ... PARTITION OF fails while the default partition holds rows
+        -- in the range, so build the partition on its own, move the rows
+        -- across, then attach it.
+        EXECUTE format(
+          'CREATE TABLE %I (LIKE incidents INCLUDING DEFAULTS INCLUDING GENERATED)',
+          partition_name
+        );
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM incidents_default'
+          ' WHERE created_at >= %L AND created_at < %L RETURNING %s)'
+          ' INSERT INTO %I (%s) SELECT %s FROM moved',
+          range_start, range_end, column_list, partition_name, column_list, column_list
+        );
+        GET DIAGNOSTICS moved = ROW_COUNT;
+        EXECUTE format(
+          'ALTER TABLE incidents ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+          partition_name, range_start, range_end
+        );
+        RAISE WARNING 'moved % rows from incidents_default into %', moved, partition_name;
+      ELSE
+        EXECUTE format(
+          'CREATE TABLE %I PARTITION OF incidents FOR VALUES FROM (%L) TO (%L)',
+          partition_name, range_start, range_end
+        );
+      END IF;
+      created := created + 1;
+    END IF;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_incident_partitions();
+
+-- Cold storage for CLOSED incidents past the retention window; written only by
+-- app.jobs.archive_incidents and read-only for the API.
+CREATE TABLE incidents_archive (
+  LIKE incidents INCLUDING DEFAULTS INCLUDING GENERATED,
+  archived_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id)
+);
+
+CREATE INDEX idx_incidents_archive_created_at_id ON incidents_archive (created_at, id);
+CREATE INDEX idx_incidents_archive_search_vector ON incidents_archive USING GIN (search_vector);
+
+-- =====================
+-- INCIDENT STATS ROLLUP
+-- =====================
+-- Maintained incrementally by the API (same transaction as each insert and
+-- status change); see db/migrations/03_incident_stats_rollup.sql.
+CREATE TABLE incident_stats_daily (
+  day DATE NOT NULL,
+  severity incident_severity NOT NULL,
+  erp_module erp_module NOT NULL,
+  status incident_status NOT NULL,
+  incident_count BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, severity, erp_module, status)
+);
+
+-- =====================
+-- IDEMPOTENCY KEYS
+-- =====================
+-- Responses of POST /incidents by Idempotency-Key. A row with NULL
+-- status_code is an in-flight claim (until locked_until), owned by whoever
+-- holds its claim_id; completed rows are replayed until expires_at and purged
+-- by app.jobs.purge_idempotency_keys.
+CREATE TABLE idempotency_keys (
+  key TEXT PRIMARY KEY,
+  request_hash TEXT NOT NULL,
+  claim_id TEXT,
+  status_code INT,
+  response_body BYTEA,
+  locked_until TIMESTAMPTZ NOT NULL,
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+CREATE INDEX idx_idempotency_keys_expires_at ON idempotency_keys (expires_at);
+
 -- =====================
 -- TRIGGERS
 -- =====================
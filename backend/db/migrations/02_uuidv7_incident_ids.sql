@@ -0,0 +1,40 @@
+-- Migration: time-ordered (UUIDv7) incident IDs.
+--
+-- The API now generates UUIDv7 IDs itself; this brings existing databases in
+-- line with db/init/01_init_schema.sql so rows inserted directly in SQL get
+-- the same kind of ID. Existing UUIDv4 rows stay valid and keep their IDs.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/02_uuidv7_incident_ids.sql
+
+CREATE OR REPLACE FUNCTION uuid_generate_v7(ts TIMESTAMPTZ DEFAULT clock_timestamp())
+RETURNS UUID AS $$
+DECLARE
+  unix_ms BIGINT := floor(extract(epoch FROM ts) * 1000);
+  bytes BYTEA := gen_random_bytes(16);
+BEGIN
+  bytes := overlay(bytes PLACING substring(int8send(unix_ms) FROM 3) FROM 1 FOR 6);
+  bytes := set_byte(bytes, 6, (get_byte(bytes, 6) & 15) | 112);  -- version 7
+  bytes := set_byte(bytes, 8, (get_byte(bytes, 8) & 63) | 128);  -- variant
+  RETURN encode(bytes, 'hex')::uuid;
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+ALTER TABLE incidents ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_incidents_created_at_id
+  ON incidents (created_at, id);
+
+-- ---------------------------------------------------------------------------
+-- Optional: rewrite existing IDs so the whole primary key is time-ordered.
+--
+-- Only do this if no external system stores incident IDs (bookmarked detail
+-- URLs, tickets, integrations) - the old IDs stop resolving. Nothing in this
+-- schema references incidents.id, so no foreign keys need updating. Run in a
+-- maintenance window; the UPDATE rewrites every row.
+--
+-- BEGIN;
+-- UPDATE incidents SET id = uuid_generate_v7(created_at);
+-- COMMIT;
+-- REINDEX TABLE incidents;
+-- VACUUM (ANALYZE) incidents;
+-- ---------------------------------------------------------------------------
@@ -0,0 +1,30 @@
+-- Migration: incident stats rollup backing GET /api/v1/incidents/stats.
+--
+-- Creates the rollup table and backfills it from the existing incidents in
+-- one transaction. After this, the API keeps it up to date on every insert
+-- and status change; `python -m app.jobs.reconcile_stats` checks for drift.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/03_incident_stats_rollup.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS incident_stats_daily (
+  day DATE NOT NULL,
+  severity incident_severity NOT NULL,
+  erp_module erp_module NOT NULL,
+  status incident_status NOT NULL,
+  incident_count BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, severity, erp_module, status)
+);
+
+-- Block concurrent inserts/updates while backfilling so nothing is missed.
+LOCK TABLE incidents IN SHARE MODE;
+
+DELETE FROM incident_stats_daily;
+
+INSERT INTO incident_stats_daily (day, severity, erp_module, status, incident_count)
+SELECT (created_at AT TIME ZONE 'UTC')::date, severity, erp_module, status, count(*)
+FROM incidents
+GROUP BY 1, 2, 3, 4;
+
+COMMIT;
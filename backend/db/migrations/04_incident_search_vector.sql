@@ -0,0 +1,17 @@
+-- Migration: full-text search over incident title, AI summary and description.
+--
+-- Adds the generated `search_vector` column used by GET /api/v1/incidents/search
+-- and its GIN index. Adding a STORED generated column rewrites the table under
+-- an ACCESS EXCLUSIVE lock, so run it in a maintenance window on large tables.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/04_incident_search_vector.sql
+
+ALTER TABLE incidents
+  ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(auto_summary, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+  ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_incidents_search_vector
+  ON incidents USING GIN (search_vector);
@@ -0,0 +1,125 @@
+-- Migration: monthly range partitioning of incidents, plus an archive table.
+--
+-- Rebuilds `incidents` as a table partitioned by month on created_at (primary
+-- key becomes (id, created_at)), copies the existing rows across, and creates
+-- `incidents_archive` for CLOSED incidents moved out by
+-- app.jobs.archive_incidents. The old table is kept as `incidents_unpartitioned`
+-- so the copy can be checked before it is dropped by hand:
+--
+--   SELECT (SELECT count(*) FROM incidents) = (SELECT count(*) FROM incidents_unpartitioned);
+--   DROP TABLE incidents_unpartitioned;
+--
+-- Writes to incidents are blocked for the duration (the copy runs inside one
+-- transaction), so run it in a maintenance window on large tables.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/05_partition_incidents.sql
+
+BEGIN;
+
+LOCK TABLE incidents IN EXCLUSIVE MODE;
+
+ALTER TABLE incidents RENAME TO incidents_unpartitioned;
+ALTER TABLE incidents_unpartitioned RENAME CONSTRAINT incidents_pkey TO incidents_unpartitioned_pkey;
+ALTER INDEX IF EXISTS idx_incidents_created_at_id RENAME TO idx_incidents_unpartitioned_created_at_id;
+ALTER INDEX IF EXISTS idx_incidents_search_vector RENAME TO idx_incidents_unpartitioned_search_vector;
+DROP TRIGGER IF EXISTS trg_incidents_updated_at ON incidents_unpartitioned;
+
+CREATE TABLE incidents (
+  id UUID NOT NULL DEFAULT uuid_generate_v7(),
+
+  title TEXT NOT NULL,
+  description TEXT NOT NULL,
+  erp_module erp_module NOT NULL,
+  environment environment_type NOT NULL,
+  business_unit TEXT NOT NULL,
+
+  severity incident_severity NOT NULL,
+  category incident_category NOT NULL,
+  auto_summary TEXT,
+  suggested_action TEXT,
+
+  status incident_status NOT NULL DEFAULT 'OPEN',
+
+  created_by_id UUID REFERENCES users(id),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(auto_summary, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+  ) STORED,
+
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE incidents_default PARTITION OF incidents DEFAULT;
+
+CREATE INDEX idx_incidents_created_at_id ON incidents (created_at, id);
+CREATE INDEX idx_incidents_search_vector ON incidents USING GIN (search_vector);
+
+CREATE OR REPLACE FUNCTION ensure_incident_partitions(
+  from_month DATE DEFAULT date_trunc('month', now())::date,
+  months_ahead INT DEFAULT 3
+)
+RETURNS INT AS $$
+DECLARE
+  month_start DATE := date_trunc('month', from_month)::date;
+  last_month DATE := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+  partition_name TEXT;
+  created INT := 0;
+BEGIN
+  WHILE month_start <= last_month LOOP
+    partition_name := format('incidents_y%sm%s',
+                             to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+    IF to_regclass(partition_name) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF incidents FOR VALUES FROM (%L) TO (%L)',
+        partition_name,
+        month_start::timestamp AT TIME ZONE 'UTC',
+        (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+      );
+      created := created + 1;
+    END IF;
+    month_start := (month_start + interval '1 month')::date;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month from the oldest incident onwards.
+SELECT ensure_incident_partitions(
+  coalesce(
+    (SELECT min(created_at AT TIME ZONE 'UTC')::date FROM incidents_unpartitioned),
+    now()::date
+  )
+);
+
+INSERT INTO incidents
+  (id, title, description, erp_module, environment, business_unit, severity,
+   category, auto_summary, suggested_action, status, created_by_id,
+   created_at, updated_at)
+SELECT id, title, description, erp_module, environment, business_unit, severity,
+       category, auto_summary, suggested_action, status, created_by_id,
+       created_at, updated_at
+FROM incidents_unpartitioned;
+
+CREATE TRIGGER trg_incidents_updated_at
+BEFORE UPDATE ON incidents
+FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+CREATE TABLE IF NOT EXISTS incidents_archive (
+  LIKE incidents INCLUDING DEFAULTS INCLUDING GENERATED,
+  archived_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_incidents_archive_created_at_id
+  ON incidents_archive (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_incidents_archive_search_vector
+  ON incidents_archive USING GIN (search_vector);
+
+ANALYZE incidents;
+
+COMMIT;
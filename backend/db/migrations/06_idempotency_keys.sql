@@ -0,0 +1,16 @@
+-- Migration: Idempotency-Key support for POST /api/v1/incidents.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/06_idempotency_keys.sql
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  key TEXT PRIMARY KEY,
+  request_hash TEXT NOT NULL,
+  status_code INT,
+  response_body BYTEA,
+  locked_until TIMESTAMPTZ NOT NULL,
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at
+  ON idempotency_keys (expires_at);
@@ -0,0 +1,26 @@
+-- Migration: SLA deadlines and escalation tracking for incidents.
+--
+-- Adds `sla_due_at` / `escalated_at`, backfills deadlines for OPEN incidents
+-- using the default SLA targets (P1 60 min, P2 240 min, P3 1440 min; TEST x4 —
+-- adjust if SLA_* settings differ), and builds the partial index the SLA
+-- scheduler reads its due-queue from. OPEN incidents already past their
+-- deadline are escalated on the scheduler's first pass.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/07_incident_sla_due.sql
+
+ALTER TABLE incidents
+  ADD COLUMN IF NOT EXISTS sla_due_at TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS escalated_at TIMESTAMPTZ;
+
+ALTER TABLE incidents_archive
+  ADD COLUMN IF NOT EXISTS sla_due_at TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS escalated_at TIMESTAMPTZ;
+
+UPDATE incidents
+SET sla_due_at = created_at + make_interval(mins =>
+      CASE severity WHEN 'P1' THEN 60 WHEN 'P2' THEN 240 ELSE 1440 END
+      * CASE environment WHEN 'PROD' THEN 1 ELSE 4 END)
+WHERE status = 'OPEN' AND sla_due_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_incidents_sla_due ON incidents (sla_due_at)
+  WHERE status = 'OPEN' AND escalated_at IS NULL AND sla_due_at IS NOT NULL;
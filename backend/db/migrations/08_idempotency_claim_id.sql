@@ -0,0 +1,10 @@
+-- Migration: owner token for Idempotency-Key claims.
+--
+-- Each claim gets a random `claim_id`; storing the response and releasing a
+-- failed claim only touch the row while it still carries the caller's
+-- `claim_id`, so a request whose claim expired and was taken over by a retry
+-- cannot overwrite or delete the new owner's row. Existing rows keep NULL.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/08_idempotency_claim_id.sql
+
+ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS claim_id TEXT;
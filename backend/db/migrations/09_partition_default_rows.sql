@@ -0,0 +1,91 @@
+-- Migration: let ensure_incident_partitions() recover rows from the default
+-- partition.
+--
+-- When partitions were not created in time, new incidents landed in
+-- incidents_default, and from then on CREATE TABLE ... PARTITION OF for their
+-- month failed ("updated partition constraint for default partition would be
+-- violated"), taking app.jobs.archive_incidents down with it. The function now
+-- also visits every month present in the default partition and, for a month
+-- with rows there, builds the partition standalone, moves the rows into it and
+-- attaches it. Calls are serialised with an advisory lock, since API workers
+-- now run it at startup too.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/09_partition_default_rows.sql
+
+CREATE OR REPLACE FUNCTION ensure_incident_partitions(
+  from_month DATE DEFAULT date_trunc('month', now())::date,
+  months_ahead INT DEFAULT 3
+)
+RETURNS INT AS $$
+DECLARE
+  month_start DATE;
+  partition_name TEXT;
+  range_start TIMESTAMPTZ;
+  range_end TIMESTAMPTZ;
+  column_list TEXT;
+  moved BIGINT;
+  created INT := 0;
+BEGIN
+  -- API workers at startup and the cron jobs may all call this at once.
+  PERFORM pg_advisory_xact_lock(hashtext('ensure_incident_partitions'));
+
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+    INTO column_list
+    FROM pg_attribute
+    WHERE attrelid = 'incidents'::regclass
+      AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+
+  -- The requested months, plus any month whose rows already fell into the
+  -- default partition (e.g. the jobs did not run for a while).
+  FOR month_start IN
+    SELECT generate_series(
+             date_trunc('month', from_month),
+             date_trunc('month', now()) + make_interval(months => months_ahead),
+             interval '1 month'
+           )::date
+    UNION
+    SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+    FROM incidents_default
+    ORDER BY 1
+  LOOP
+    partition_name := format('incidents_y%sm%s',
+                             to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+    range_start := month_start::timestamp AT TIME ZONE 'UTC';
+    range_end := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+    IF to_regclass(partition_name) IS NULL THEN
+      IF EXISTS (SELECT 1 FROM incidents_default
+                 WHERE created_at >= range_start AND created_at < range_end) THEN
+        -- CREATE ... PARTITION OF fails while the default partition holds rows
+        -- in the range, so build the partition on its own, move the rows
+        -- across, then attach it.
+        EXECUTE format(
+          'CREATE TABLE %I (LIKE incidents INCLUDING DEFAULTS INCLUDING GENERATED)',
+          partition_name
+        );
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM incidents_default'
+          ' WHERE created_at >= %L AND created_at < %L RETURNING %s)'
+          ' INSERT INTO %I (%s) SELECT %s FROM moved',
+          range_start, range_end, column_list, partition_name, column_list, column_list
+        );
+        GET DIAGNOSTICS moved = ROW_COUNT;
+        EXECUTE format(
+          'ALTER TABLE incidents ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+          partition_name, range_start, range_end
+        );
+        RAISE WARNING 'moved % rows from incidents_default into %', moved, partition_name;
+      ELSE
+        EXECUTE format(
+          'CREATE TABLE %I PARTITION OF incidents FOR VALUES FROM (%L) TO (%L)',
+          partition_name, range_start, range_end
+        );
+      END IF;
+      created := created + 1;
+    END IF;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move anything already stranded in the default partition.
+SELECT ensure_incident_partitions();
@@ -0,0 +1,51 @@
+-- Migration: indexes for phrase and module-filtered incident search.
+--
+-- The GIN index on `search_vector` doesn't store word positions, so a phrase
+-- search ("journal import") rechecks every row holding both words, and a
+-- module filter is applied only after every text match has been fetched. This
+-- adds:
+--   * `search_pairs`, hashes of the adjacent word pairs of the same document
+--     (see incident_word_pairs), with a GIN index used by phrase searches;
+--   * a btree_gin composite on (erp_module, search_vector) for the module
+--     filter.
+--
+-- Adding the STORED generated column rewrites the table (and the archive,
+-- kept in step since db/init creates it LIKE incidents) under an ACCESS
+-- EXCLUSIVE lock, and indexes on a partitioned table can't be built
+-- CONCURRENTLY, so run it in a maintenance window on large tables.
+--
+-- Run with: psql "$DATABASE_URL" -f db/migrations/10_incident_search_indexes.sql
+
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+CREATE OR REPLACE FUNCTION incident_word_pairs(doc TSVECTOR)
+RETURNS INT[] AS $$
+  SELECT coalesce(array_agg(DISTINCT hashtext(first.lexeme || ' ' || second.lexeme)), '{}')
+  FROM (SELECT lexeme, unnest(positions) AS position FROM unnest(doc)) AS first
+  JOIN (SELECT lexeme, unnest(positions) AS position FROM unnest(doc)) AS second
+    ON second.position = first.position + 1
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE incidents
+  ADD COLUMN IF NOT EXISTS search_pairs INT[] GENERATED ALWAYS AS (
+    incident_word_pairs(
+      to_tsvector('english', coalesce(title, '')) ||
+      to_tsvector('english', coalesce(auto_summary, '')) ||
+      to_tsvector('english', coalesce(description, ''))
+    )
+  ) STORED;
+
+ALTER TABLE incidents_archive
+  ADD COLUMN IF NOT EXISTS search_pairs INT[] GENERATED ALWAYS AS (
+    incident_word_pairs(
+      to_tsvector('english', coalesce(title, '')) ||
+      to_tsvector('english', coalesce(auto_summary, '')) ||
+      to_tsvector('english', coalesce(description, ''))
+    )
+  ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_incidents_search_pairs
+  ON incidents USING GIN (search_pairs);
+
+CREATE INDEX IF NOT EXISTS idx_incidents_module_search
+  ON incidents USING GIN (erp_module, search_vector);
@@ -0,0 +1,104 @@
+"""Admission control: request classification and slot handout under load."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.middleware.admission_control import AdmissionController, Priority, classify
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(
+        max_in_flight=2, low_priority_max_in_flight=1, max_queue=2, queue_timeout_ms=50
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+@pytest.mark.parametrize(
+    "method, path, body, priority",
+    [
+        ("POST", "/api/v1/incidents", json.dumps({"environment": "PROD"}).encode(), Priority.CRITICAL),
+        ("POST", "/api/v1/incidents/", json.dumps({"environment": "TEST"}).encode(), Priority.HIGH),
+        ("POST", "/api/v1/incidents", b"not json", Priority.HIGH),
+        ("POST", "/api/v1/incidents", None, Priority.HIGH),
+        ("GET", "/api/v1/incidents", None, Priority.LOW),
+        ("GET", "/api/v1/incidents/stats", None, Priority.LOW),
+        ("GET", "/api/v1/incidents/search", None, Priority.LOW),
+        ("GET", "/api/v1/incidents/search/", None, Priority.LOW),
+        ("GET", "/api/v1/health", None, Priority.LOW),
+        ("GET", "/api/v1/incidents/0190a1b2-0000-7000-8000-000000000000", None, Priority.NORMAL),
+        ("PATCH", "/api/v1/incidents/0190a1b2-0000-7000-8000-000000000000", None, Priority.NORMAL),
+        ("POST", "/api/v1/incidents/bulk/status", None, Priority.NORMAL),
+    ],
+)
+def test_classify(method, path, body, priority):
+    assert classify(method, path, body) is priority
+
+
+def test_low_priority_is_shed_past_its_share():
+    async def scenario():
+        controller = _controller()
+        assert await controller.acquire(Priority.LOW)
+        # One slot is still free, but LOW may only use one.
+        assert not await controller.acquire(Priority.LOW)
+        assert await controller.acquire(Priority.NORMAL)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.stats.admitted["LOW"] == 1
+    assert controller.stats.shed["LOW"] == 1
+    assert controller.in_flight == 2
+
+
+def test_freed_slots_go_to_the_most_important_waiter():
+    async def scenario():
+        controller = _controller(queue_timeout_ms=1000)
+        for _ in range(2):
+            assert await controller.acquire(Priority.NORMAL)
+        order = []
+
+        async def wait(priority):
+            assert await controller.acquire(priority)
+            order.append(priority)
+
+        waiters = [
+            asyncio.create_task(wait(Priority.HIGH)),
+            asyncio.create_task(wait(Priority.CRITICAL)),
+        ]
+        await asyncio.sleep(0)
+        assert controller.queued == 2
+        # LOW never queues behind others.
+        assert not await controller.acquire(Priority.LOW)
+
+        controller.release()
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.gather(*waiters)
+        return controller, order
+
+    controller, order = asyncio.run(scenario())
+    assert order == [Priority.CRITICAL, Priority.HIGH]
+    assert controller.in_flight == 2
+    assert controller.stats.queued_total == 2
+
+
+def test_full_queue_and_queue_timeout_shed():
+    async def scenario():
+        controller = _controller(max_queue=1)
+        for _ in range(2):
+            assert await controller.acquire(Priority.NORMAL)
+        queued = asyncio.create_task(controller.acquire(Priority.HIGH))
+        await asyncio.sleep(0)
+        # The queue is full: turned away at once.
+        assert not await controller.acquire(Priority.CRITICAL)
+        # The queued request times out without a slot being freed.
+        assert not await queued
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.stats.shed == {"CRITICAL": 1, "HIGH": 1, "NORMAL": 0, "LOW": 0}
+    assert controller.stats.queue_timeouts["HIGH"] == 1
+    assert controller.queued == 0
+    assert controller.in_flight == 2
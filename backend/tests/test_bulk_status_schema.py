@@ -0,0 +1,39 @@
+"""Bulk status requests must select incidents explicitly."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.incident import IncidentBulkStatusUpdateRequest
+
+
+@pytest.mark.parametrize(
+    "selector",
+    [
+        {"filter": {}},
+        {"filter": {"erp_module": None}},
+        {"filter": {"erp_module": None, "severity": None, "status": None}},
+        {},
+        {"ids": []},
+    ],
+)
+def test_rejects_requests_that_select_nothing_or_everything(selector):
+    with pytest.raises(ValidationError):
+        IncidentBulkStatusUpdateRequest(status="CLOSED", **selector)
+
+
+def test_rejects_both_ids_and_filter():
+    with pytest.raises(ValidationError):
+        IncidentBulkStatusUpdateRequest(
+            status="CLOSED",
+            ids=["01a15204-3200-73ab-ab6f-6c828a40e17a"],
+            filter={"erp_module": "AP"},
+        )
+
+
+def test_accepts_a_filter_with_one_field():
+    request = IncidentBulkStatusUpdateRequest(
+        status="CLOSED", filter={"erp_module": "AP", "severity": None}
+    )
+
+    assert request.filter.erp_module.value == "AP"
+    assert request.filter.severity is None
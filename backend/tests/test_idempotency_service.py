@@ -0,0 +1,83 @@
+"""Idempotency-Key ownership: claim tokens and the per-process waiter cap."""
+
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import idempotency_service
+from app.services.idempotency_service import (
+    IdempotencyClaimLost,
+    IdempotencyKeyInProgress,
+    IdempotencyService,
+)
+
+
+class FakeRepository:
+    """An in-flight key owned by someone else; `complete` fails for stale claims."""
+
+    owner = "owner-claim"
+
+    def __init__(self, db):
+        pass
+
+    def claim(self, key, request_hash, lock_s, ttl_s):
+        return None
+
+    def get(self, key):
+        return SimpleNamespace(request_hash="h", status_code=None, response_body=None)
+
+    def complete(self, key, claim_id, status_code, body):
+        return claim_id == self.owner
+
+
+@contextmanager
+def fake_get_db():
+    yield SimpleNamespace(rollback=lambda: None)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(idempotency_service, "IdempotencyRepository", FakeRepository)
+    monkeypatch.setattr(idempotency_service, "get_db", fake_get_db)
+    monkeypatch.setattr(idempotency_service.settings, "IDEMPOTENCY_MAX_WAITERS", 2)
+    monkeypatch.setattr(idempotency_service.settings, "IDEMPOTENCY_WAIT_TIMEOUT_S", 1.0)
+    return IdempotencyService()
+
+
+def test_complete_with_a_stale_claim_raises(service):
+    service.complete(SimpleNamespace(), "k", FakeRepository.owner, 201, b"{}")
+
+    with pytest.raises(IdempotencyClaimLost):
+        service.complete(SimpleNamespace(), "k", "expired-claim", 201, b"{}")
+
+
+def test_waiters_beyond_the_cap_are_turned_away(service):
+    started = threading.Barrier(3)
+    outcomes = []
+
+    def wait():
+        started.wait()
+        try:
+            service.begin("k", "h")
+        except IdempotencyKeyInProgress:
+            outcomes.append("in-progress")
+
+    waiters = [threading.Thread(target=wait) for _ in range(2)]
+    for thread in waiters:
+        thread.start()
+    started.wait()
+    # Both slots are taken (or about to be) by threads that wait out the timeout.
+    for _ in range(100):
+        if service._waiters._value == 0:
+            break
+        threading.Event().wait(0.01)
+
+    with pytest.raises(IdempotencyKeyInProgress):
+        service.begin("k", "h")
+
+    for thread in waiters:
+        thread.join()
+    assert outcomes == ["in-progress", "in-progress"]
+    assert service._waiters._value == 2
@@ -0,0 +1,53 @@
+"""Importing the API entrypoint stays cheap: heavy SDKs load only on first use."""
+
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.import_time import BACKEND_DIR
+
+# Looser than the CI gate (`python -m benchmarks.import_time --max-ms 800`)
+# so slow shared runners don't flake; an eager OpenAI SDK alone costs more.
+MAX_IMPORT_MS = float(os.environ.get("IMPORT_TIME_MAX_MS", "1500"))
+RUNS = 3
+
+LAZY_MODULES = ("openai", "numpy", "psycopg2", "boto3", "watchtower")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed_ms, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _import_app_main() -> dict:
+    """Import `app.main` in a fresh interpreter with optional features off."""
+    env = {
+        **os.environ,
+        "CLOUDWATCH_ENABLED": "false",
+        "SIMILARITY_INDEX_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE % (LAZY_MODULES,)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def test_import_stays_within_budget_and_lazy():
+    runs = [_import_app_main() for _ in range(RUNS)]
+
+    assert runs[0]["loaded"] == []
+    best_ms = min(run["ms"] for run in runs)
+    assert best_ms <= MAX_IMPORT_MS, (
+        f"import app.main took {best_ms:.0f} ms (best of {RUNS}), "
+        f"over the {MAX_IMPORT_MS:.0f} ms budget"
+    )
@@ -0,0 +1,51 @@
+"""Stack sampler: shared stacks in the ring and idle-thread detection."""
+
+import sys
+
+from app.core import profiling
+from app.core.profiling import StackSampler, _is_idle
+
+
+def _frame_at_depth(depth):
+    if depth:
+        return _frame_at_depth(depth - 1)
+    return sys._getframe()
+
+
+def test_repeated_stacks_share_one_tuple():
+    sampler = StackSampler(interval_s=0.01, max_samples=100)
+    frame = _frame_at_depth(20)
+
+    sampler._record([(1.0, frame), (2.0, frame)])
+    sampler._record([(3.0, frame)])
+
+    first, second, third = sampler.samples()
+    assert first is second is third
+    assert first[-1][2] == "_frame_at_depth"
+
+
+def test_interned_stacks_are_pruned_to_the_ring(monkeypatch):
+    monkeypatch.setattr(profiling, "_MIN_INTERNED_STACKS", 4)
+    sampler = StackSampler(interval_s=0.01, max_samples=3)
+    frames = [_frame_at_depth(depth) for depth in range(10)]
+
+    for ts, frame in enumerate(frames):
+        sampler._record([(float(ts), frame)])
+
+    live = set(sampler.samples())
+    assert len(live) == 3
+    # Pruned back to the ring whenever it outgrew the limit, never unbounded.
+    assert live <= set(sampler._stacks)
+    assert len(sampler._stacks) <= 2 * len(live)
+
+
+def test_idle_leaves():
+    parked = (("app.py", 1, "handler"), ("/usr/lib/python3.11/threading.py", 320, "wait"))
+    event_loop = (("main.py", 1, "main"), ("/py/asyncio/base_events.py", 600, "run_forever"))
+    uvloop = (("main.py", 1, "main"), ("/site-packages/uvloop/__init__.py", 80, "run"))
+    busy = (("app.py", 1, "handler"), ("/app/services/enrichment.py", 40, "enrich"))
+
+    assert _is_idle(parked)
+    assert _is_idle(event_loop)
+    assert _is_idle(uvloop)
+    assert not _is_idle(busy)
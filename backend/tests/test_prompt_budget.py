@@ -0,0 +1,108 @@
+"""Enrichment input: repeated-line dedup and fitting text into a token budget."""
+
+import random
+
+import pytest
+
+from app.services.prompt_budget import (
+    _CLIP_MARKER,
+    count_tokens,
+    dedupe_lines,
+    fit_lines,
+    prepare_text,
+)
+
+JOB_LOG = (
+    ["Payroll run 42 started for company 1000"]
+    + [f"processed employee batch {i} of 200" for i in range(1, 30)]
+    + ["ERROR: ledger period 2024-06 is locked for posting"]
+    + [f"processed employee batch {i} of 200" for i in range(30, 60)]
+    + ["Payroll run 42 finished with 1 error"]
+)
+
+
+def test_dedupe_collapses_runs_and_drops_recurrences():
+    text = "\n".join(
+        [
+            "2024-06-01T10:00:01Z job 17 started",
+            "2024-06-01T10:00:02Z retry 1 for id 5",
+            "2024-06-01T10:00:03Z retry 2 for id 5",
+            "2024-06-01T10:00:04Z retry 3 for id 5",
+            "   ",
+            "2024-06-01T10:05:00Z job 17 started",
+            "done   ",
+        ]
+    )
+
+    lines, repeated = dedupe_lines(text)
+
+    assert lines == [
+        "2024-06-01T10:00:01Z job 17 started",
+        "2024-06-01T10:00:02Z retry 1 for id 5",
+        "  [previous line repeated 2 more times]",
+        "",
+        "done",
+    ]
+    assert repeated == 3
+
+
+def test_text_within_budget_is_unchanged():
+    lines = ["Payment run failed", "Bank rejected the file"]
+
+    assert fit_lines(lines, 100) == (lines, 0, 0)
+
+
+def test_fit_keeps_head_tail_and_middle_errors():
+    out, omitted, clipped = fit_lines(JOB_LOG, 80)
+
+    assert out[0] == JOB_LOG[0]
+    assert out[-1] == JOB_LOG[-1]
+    assert "ERROR: ledger period 2024-06 is locked for posting" in out
+    assert sum("lines omitted" in line for line in out) == 2
+    assert omitted == len(JOB_LOG) - (len(out) - 2)
+    assert clipped == 0
+    assert count_tokens("\n".join(out)) <= 80
+
+
+def test_over_long_single_line_is_clipped():
+    line = "Posting failed for document " + " ".join(str(n) for n in range(500))
+
+    out, omitted, clipped = fit_lines([line], 30)
+
+    assert len(out) == 1 and out[0].endswith(_CLIP_MARKER)
+    assert line.startswith(out[0][: -len(_CLIP_MARKER)])
+    assert (omitted, clipped) == (0, 1)
+    assert count_tokens(out[0]) <= 30
+
+
+def test_over_long_first_line_keeps_its_start():
+    headline = "Journal import failed: " + "x " * 200
+    out, _, clipped = fit_lines([headline] + JOB_LOG[1:], 60)
+
+    assert out[0].startswith("Journal import failed") and out[0].endswith(_CLIP_MARKER)
+    assert clipped == 1
+
+
+@pytest.mark.parametrize("budget", [0, 1, 5, 11, 12, 20, 50, 200])
+def test_result_never_exceeds_budget(budget):
+    rng = random.Random(budget)
+    words = "payment run failed error timeout ledger posting ORA-00060 batch 2024".split()
+    for _ in range(200):
+        lines = [
+            " ".join(rng.choice(words) for _ in range(rng.randint(1, 15)))
+            for _ in range(rng.randint(1, 30))
+        ]
+        out, _, _ = fit_lines(lines, budget)
+        assert count_tokens("\n".join(out)) <= budget
+
+
+def test_prepare_text_reports_counters():
+    checks = [f"checked cost centre {a}{b}" for a in "ABC" for b in "ABCDEFGHIJ"]
+    text = "\n".join(checks + ["retry 1 failed", "retry 2 failed", "retry 3 failed"])
+
+    prepared = prepare_text(text, 80)
+
+    assert prepared.repeated_lines == 2
+    assert prepared.truncated
+    assert prepared.tokens == count_tokens(prepared.text) <= 80
+    assert prepared.original_tokens > prepared.tokens
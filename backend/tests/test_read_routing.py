@@ -0,0 +1,72 @@
+"""Replica reads: a replica that fails mid-read is skipped and the primary retried."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.db import session
+from app.db.session import ReplicaRouter, run_read
+
+
+class FakeEngine:
+    def __init__(self, name):
+        self.url = SimpleNamespace(render_as_string=lambda hide_password: name)
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return SimpleNamespace(engine=self, close=lambda: None)
+
+
+PRIMARY = SimpleNamespace(name="primary", rollback=lambda: None)
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    engine = FakeEngine("replica")
+    router = ReplicaRouter([engine], retry_after_s=60)
+
+    @contextmanager
+    def fake_get_db():
+        yield PRIMARY
+
+    monkeypatch.setattr(session, "get_replica_router", lambda: router)
+    monkeypatch.setattr(session, "get_db", fake_get_db)
+    return engine
+
+
+def _fails_on_replica(error):
+    calls = []
+
+    def read(db):
+        calls.append(db)
+        if db is not PRIMARY:
+            raise error
+        return "from primary"
+
+    return read, calls
+
+
+def test_operational_error_falls_back_to_the_primary(replica):
+    error = OperationalError("SELECT 1", {}, Exception("server closed the connection"))
+    read, calls = _fails_on_replica(error)
+
+    assert run_read(read) == "from primary"
+    assert len(calls) == 2 and calls[1] is PRIMARY
+
+    # The replica is now marked down: the next read goes straight to the primary.
+    read, calls = _fails_on_replica(error)
+    assert run_read(read) == "from primary"
+    assert calls == [PRIMARY]
+    assert replica.connects == 1
+
+
+def test_other_errors_are_not_retried(replica):
+    error = ProgrammingError("SELECT nope", {}, Exception("syntax error"))
+    read, calls = _fails_on_replica(error)
+
+    with pytest.raises(ProgrammingError):
+        run_read(read)
+    assert len(calls) == 1
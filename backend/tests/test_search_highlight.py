@@ -0,0 +1,36 @@
+"""Search highlights must never pass user-supplied markup through."""
+
+from app.repositories.incident_repository import (
+    _HEADLINE_OPTIONS,
+    _MARK_START,
+    _MARK_STOP,
+    render_highlight,
+)
+
+
+def test_script_in_title_is_escaped():
+    # What ts_headline returns for a title containing markup, with the match
+    # wrapped in the sentinel delimiters.
+    headline = f"{_MARK_START}Payroll{_MARK_STOP} <script>alert(1)</script> failed"
+
+    rendered = render_highlight(headline)
+
+    assert rendered == (
+        "<mark>Payroll</mark> &lt;script&gt;alert(1)&lt;/script&gt; failed"
+    )
+    assert "<script>" not in rendered
+
+
+def test_attribute_injection_is_escaped():
+    headline = f'<img src=x onerror="alert(1)"> {_MARK_START}posting{_MARK_STOP}'
+
+    rendered = render_highlight(headline)
+
+    assert rendered == (
+        "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>posting</mark>"
+    )
+
+
+def test_headline_options_do_not_emit_html():
+    assert "<" not in _HEADLINE_OPTIONS
+    assert _MARK_START in _HEADLINE_OPTIONS and _MARK_STOP in _HEADLINE_OPTIONS
@@ -0,0 +1,38 @@
+"""Only phrases every match must contain may narrow a search by word pairs."""
+
+import pytest
+
+from app.repositories.incident_repository import _required_phrases
+
+
+@pytest.mark.parametrize(
+    "q, phrases",
+    [
+        ('"journal import"', ["journal import"]),
+        ('vendor "payment run" "tax period"', ["payment run", "tax period"]),
+        ('"journal import', []),
+        ("journal import", []),
+    ],
+)
+def test_required_phrases(q, phrases):
+    assert _required_phrases(q) == phrases
+
+
+@pytest.mark.parametrize(
+    "q",
+    [
+        '"journal import" or payroll',
+        'payroll OR "journal import"',
+    ],
+)
+def test_phrases_under_or_are_not_required(q):
+    assert _required_phrases(q) == []
+
+
+def test_negated_phrases_are_skipped():
+    assert _required_phrases('tax -"batch import"') == []
+    assert _required_phrases('tax - "batch import" "period close"') == ["period close"]
+
+
+def test_or_inside_a_phrase_is_just_a_word():
+    assert _required_phrases('"journal or import"') == ["journal or import"]
@@ -0,0 +1,173 @@
+"""Related-incident index: top-k ranking, on-disk versions and sync dedup."""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services import similarity_index
+from app.services.similarity_index import SimilarityIndex, _ModuleIndex
+
+DIM = 8
+NOW = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _unit(*values: float) -> np.ndarray:
+    vec = np.zeros(DIM, np.float32)
+    vec[: len(values)] = values
+    return vec / np.linalg.norm(vec)
+
+
+def _index(path=None, dim=DIM) -> SimilarityIndex:
+    return SimilarityIndex(dim=dim, path=path, refresh_interval_s=0, lookback_s=300)
+
+
+def test_top_k_ranks_across_base_and_tail():
+    base = np.stack([_unit(1, 0), _unit(0, 1)])
+    module = _ModuleIndex(DIM, base, np.array([b"base-x", b"base-y"], "S36"))
+    module.add("tail-xy", _unit(1, 1))
+    module.add("tail-x", _unit(0.9, 0.1))
+
+    hits = module.top_k(_unit(1, 0), 3)
+
+    assert [hit_id for hit_id, _ in hits] == ["base-x", "tail-x", "tail-xy"]
+    assert hits[0][1] == pytest.approx(1.0)
+    assert hits[1][1] > hits[2][1]
+
+
+def test_top_k_handles_small_and_empty_modules():
+    module = _ModuleIndex(DIM)
+    assert module.top_k(_unit(1), 5) == []
+
+    module.add("only", _unit(1))
+    assert [hit_id for hit_id, _ in module.top_k(_unit(1), 5)] == ["only"]
+
+
+def test_view_is_unaffected_by_later_adds():
+    module = _ModuleIndex(DIM)
+    module.add("first", _unit(1))
+    view = module.view()
+    # Enough adds to force the tail arrays to be reallocated.
+    for i in range(100):
+        module.add(f"later-{i}", _unit(1))
+
+    assert [hit_id for hit_id, _ in view.top_k(_unit(1), 10)] == ["first"]
+    assert len(module) == 101
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = _index()
+    index.add("a1", "AP", "Payment run failed", "Bank rejected the payment file", NOW)
+    index.add("a2", "AP", "Payment file rejected", "Bank rejected today's payment run", NOW)
+    index.add("g1", "GL", "Period close blocked", "Cannot close the posting period", NOW)
+    index.save(str(tmp_path))
+
+    loaded = _index(path=str(tmp_path))
+    assert loaded.load()
+
+    snapshot = loaded.snapshot()
+    assert snapshot["ready"]
+    assert snapshot["by_erp_module"] == {"AP": 2, "GL": 1}
+    assert snapshot["memory_mapped"] == 3
+    assert snapshot["watermark"] == NOW.isoformat()
+    args = ("a1", "AP", "Payment run failed", "Bank rejected the payment file", 5)
+    assert loaded.related(*args) == index.related(*args)
+    assert [hit_id for hit_id, _ in loaded.related(*args)] == ["a2"]
+
+
+def test_save_switches_versions_atomically(tmp_path, monkeypatch):
+    index = _index()
+    index.add("a1", "AP", "Payment run failed", "Bank rejected the payment file", NOW)
+    index.save(str(tmp_path))
+    index.add("g1", "GL", "Period close blocked", "Cannot close the posting period", NOW)
+
+    # A build that dies before switching CURRENT leaves the old index intact.
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(similarity_index.os, "replace", fail)
+    with pytest.raises(OSError):
+        index.save(str(tmp_path))
+    loaded = _index(path=str(tmp_path))
+    assert loaded.load()
+    assert loaded.snapshot()["by_erp_module"] == {"AP": 1}
+
+    monkeypatch.undo()
+    for _ in range(3):
+        index.save(str(tmp_path))
+    loaded = _index(path=str(tmp_path))
+    assert loaded.load()
+    assert loaded.snapshot()["by_erp_module"] == {"AP": 1, "GL": 1}
+    versions = [p for p in tmp_path.iterdir() if p.is_dir()]
+    assert len(versions) == similarity_index._KEEP_VERSIONS
+    assert (tmp_path / "CURRENT").read_text() in {p.name for p in versions}
+
+
+def test_related_skips_duplicate_ids():
+    index = _index()
+    for _ in range(3):
+        index.add("a2", "AP", "Payment file rejected", "Bank rejected the payment run", NOW)
+    index.add("a3", "AP", "Payment run slow", "Payment run took an hour", NOW)
+
+    hits = index.related("a1", "AP", "Payment run failed", "Bank rejected the payment", 2)
+
+    assert [hit_id for hit_id, _ in hits] == ["a2", "a3"]
+
+
+def test_load_rejects_missing_or_mismatched_index(tmp_path):
+    assert not _index(path=str(tmp_path)).load()
+
+    index = _index()
+    index.add("a1", "AP", "Payment run failed", "Bank rejected the file", NOW)
+    index.save(str(tmp_path))
+    other = _index(path=str(tmp_path), dim=DIM * 2)
+
+    assert not other.load()
+    assert not other.ready
+
+
+def test_sync_skips_ids_already_seen_in_the_lookback(monkeypatch):
+    batches = []
+
+    class FakeRepository:
+        def __init__(self, db):
+            pass
+
+        def iter_embedding_sources(self, since, include_archived, batch_size):
+            batches.append((since, include_archived))
+            return iter(rows)
+
+    @contextmanager
+    def fake_get_db():
+        yield None
+
+    monkeypatch.setattr(similarity_index, "IncidentRepository", FakeRepository)
+    monkeypatch.setattr(similarity_index, "get_db", fake_get_db)
+
+    index = _index()
+    later = NOW + timedelta(seconds=5)
+    rows = [
+        ("id-1", "AP", "Payment run failed", "Bank rejected the file", NOW),
+        ("id-2", "AP", "Vendor master locked", "Cannot edit vendor", later),
+    ]
+    assert index.sync() == 2
+    index.add(
+        "id-3", "GL", "Period close blocked", "Posting period closed",
+        NOW + timedelta(seconds=6),
+    )
+
+    # The next sync re-reads the lookback window: id-2 and id-3 come back,
+    # alongside one genuinely new row that was committed late.
+    rows = [
+        ("id-2", "AP", "Vendor master locked", "Cannot edit vendor", later),
+        ("id-4", "AP", "Invoice stuck", "Invoice stuck in workflow", NOW + timedelta(seconds=1)),
+        ("id-3", "GL", "Period close blocked", "Posting period closed", later),
+    ]
+    assert index.sync() == 1
+
+    assert index.size() == 4
+    assert batches == [
+        (None, True),
+        (NOW + timedelta(seconds=6) - timedelta(seconds=300), False),
+    ]
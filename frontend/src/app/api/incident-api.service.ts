@@ -3,9 +3,14 @@ import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
 
 import {
+  IncidentBulkStatusUpdateRequest,
+  IncidentBulkStatusUpdateResponse,
   IncidentCreateRequest,
   IncidentResponse,
+  IncidentSearchResponse,
+  IncidentStatsResponse,
   IncidentStatus,
+  RelatedIncident,
 } from './incident.models';
 import { environment } from '../../environments/environment';
 
@@ -18,17 +23,43 @@ export class IncidentApiService {
     severity?: string;
     erp_module?: string;
     status?: string;
+    include_archived?: boolean;
   }): Observable<IncidentResponse[]> {
     let params = new HttpParams();
     if (filters?.severity) params = params.set('severity', filters.severity);
     if (filters?.erp_module) params = params.set('erp_module', filters.erp_module);
     if (filters?.status) params = params.set('status', filters.status);
+    if (filters?.include_archived) params = params.set('include_archived', 'true');
 
     return this.http.get<IncidentResponse[]>(`${this.baseUrl}/incidents`, { params });
   }
 
-  createIncident(payload: IncidentCreateRequest): Observable<IncidentResponse> {
-    return this.http.post<IncidentResponse>(`${this.baseUrl}/incidents`, payload);
+  searchIncidents(
+    q: string,
+    filters?: { severity?: string; erp_module?: string; status?: string },
+    page?: { limit?: number; offset?: number }
+  ): Observable<IncidentSearchResponse> {
+    let params = new HttpParams().set('q', q);
+    if (filters?.severity) params = params.set('severity', filters.severity);
+    if (filters?.erp_module) params = params.set('erp_module', filters.erp_module);
+    if (filters?.status) params = params.set('status', filters.status);
+    if (page?.limit) params = params.set('limit', page.limit);
+    if (page?.offset) params = params.set('offset', page.offset);
+
+    return this.http.get<IncidentSearchResponse>(`${this.baseUrl}/incidents/search`, { params });
+  }
+
+  getIncidentStats(days = 30): Observable<IncidentStatsResponse> {
+    const params = new HttpParams().set('days', days);
+    return this.http.get<IncidentStatsResponse>(`${this.baseUrl}/incidents/stats`, { params });
+  }
+
+  createIncident(
+    payload: IncidentCreateRequest,
+    idempotencyKey?: string
+  ): Observable<IncidentResponse> {
+    const headers = idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined;
+    return this.http.post<IncidentResponse>(`${this.baseUrl}/incidents`, payload, { headers });
   }
 
   getIncident(incidentId: string): Observable<IncidentResponse> {
@@ -37,6 +68,14 @@ export class IncidentApiService {
     );
   }
 
+  getRelatedIncidents(incidentId: string, limit = 5): Observable<RelatedIncident[]> {
+    const params = new HttpParams().set('limit', limit);
+    return this.http.get<RelatedIncident[]>(
+      `${this.baseUrl}/incidents/${encodeURIComponent(incidentId)}/related`,
+      { params }
+    );
+  }
+
   updateIncidentStatus(
     incidentId: string,
     status: IncidentStatus
@@ -46,4 +85,13 @@ export class IncidentApiService {
       { status }
     );
   }
+
+  bulkUpdateIncidentStatus(
+    payload: IncidentBulkStatusUpdateRequest
+  ): Observable<IncidentBulkStatusUpdateResponse> {
+    return this.http.post<IncidentBulkStatusUpdateResponse>(
+      `${this.baseUrl}/incidents/bulk/status`,
+      payload
+    );
+  }
 }
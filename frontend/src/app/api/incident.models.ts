@@ -39,7 +39,71 @@ export interface IncidentResponse {
   auto_summary: string | null;
   suggested_action: string | null;
   status: IncidentStatus;
+  sla_due_at: string | null;
+  escalated_at: string | null;
   created_at: string;
   updated_at: string;
 }
 
+export interface RelatedIncident extends IncidentResponse {
+  /** Cosine similarity to the incident being viewed (higher is closer). */
+  score: number;
+}
+
+export interface IncidentBulkStatusUpdateRequest {
+  status: IncidentStatus;
+  /** Either `ids` or `filter`, not both. */
+  ids?: string[];
+  filter?: {
+    erp_module?: ERPModule;
+    severity?: Severity;
+    environment?: Environment;
+    status?: IncidentStatus;
+  };
+}
+
+export type BulkStatusOutcome = 'UPDATED' | 'UNCHANGED' | 'INVALID_TRANSITION' | 'NOT_FOUND';
+
+export interface IncidentBulkStatusResult {
+  id: string;
+  outcome: BulkStatusOutcome;
+  previous_status: IncidentStatus | null;
+}
+
+export interface IncidentBulkStatusUpdateResponse {
+  status: IncidentStatus;
+  updated: number;
+  results: IncidentBulkStatusResult[];
+  /** More incidents match the filter; repeat the request. */
+  has_more: boolean;
+}
+
+export interface IncidentSearchHit extends IncidentResponse {
+  rank: number;
+  /** HTML-escaped title with matched terms wrapped in <mark>. */
+  title_highlight: string;
+  /** HTML-escaped description/summary excerpt with matched terms wrapped in <mark>. */
+  snippet: string;
+}
+
+export interface IncidentSearchResponse {
+  items: IncidentSearchHit[];
+  limit: number;
+  offset: number;
+  has_more: boolean;
+  /** Older matches exist beyond the ranked window; refine the query to reach them. */
+  truncated: boolean;
+}
+
+export interface DailyIncidentCount {
+  day: string;
+  count: number;
+}
+
+export interface IncidentStatsResponse {
+  total: number;
+  by_severity: Record<Severity, number>;
+  by_erp_module: Record<ERPModule, number>;
+  by_status: Record<IncidentStatus, number>;
+  by_day: DailyIncidentCount[];
+}
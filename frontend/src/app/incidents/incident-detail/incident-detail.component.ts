@@ -8,7 +8,7 @@ import { MatCardModule } from '@angular/material/card';
 import { MatProgressBarModule } from '@angular/material/progress-bar';
 
 import { IncidentApiService } from '../../api/incident-api.service';
-import { IncidentResponse } from '../../api/incident.models';
+import { IncidentResponse, RelatedIncident } from '../../api/incident.models';
 
 @Component({
   selector: 'app-incident-detail-page',
@@ -23,6 +23,7 @@ export class IncidentDetailPageComponent implements OnInit {
   readonly loading = signal(false);
   readonly error = signal<string | null>(null);
   readonly incident = signal<IncidentResponse | null>(null);
+  readonly related = signal<RelatedIncident[]>([]);
 
   async ngOnInit(): Promise<void> {
     const incidentId = this.route.snapshot.paramMap.get('incidentId');
@@ -37,6 +38,7 @@ export class IncidentDetailPageComponent implements OnInit {
     this.loading.set(true);
     this.error.set(null);
     this.incident.set(null);
+    this.related.set([]);
     try {
       const incident = await firstValueFrom(this.api.getIncident(incidentId));
       this.incident.set(incident);
@@ -45,6 +47,18 @@ export class IncidentDetailPageComponent implements OnInit {
     } finally {
       this.loading.set(false);
     }
+    if (this.incident()) {
+      await this.loadRelated(incidentId);
+    }
+  }
+
+  async loadRelated(incidentId: string): Promise<void> {
+    try {
+      this.related.set(await firstValueFrom(this.api.getRelatedIncidents(incidentId)));
+    } catch {
+      // Related incidents are optional; the details stay usable without them.
+      this.related.set([]);
+    }
   }
 }
 
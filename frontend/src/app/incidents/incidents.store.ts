@@ -1,4 +1,5 @@
 import { inject, Injectable, signal } from '@angular/core';
+import { HttpErrorResponse } from '@angular/common/http';
 import { firstValueFrom } from 'rxjs';
 
 import { IncidentApiService } from '../api/incident-api.service';
@@ -48,7 +49,11 @@ export class IncidentsStore {
         rows.map((r) => (r.id === incidentId ? updated : r))
       );
     } catch (e) {
-      this.error.set('Failed to update incident status.');
+      this.error.set(
+        e instanceof HttpErrorResponse && e.status === 409
+          ? 'That status change is not allowed for this incident.'
+          : 'Failed to update incident status.'
+      );
       throw e;
     }
   }